@@ -0,0 +1,108 @@
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.sqlite_fixtures import temporary_database
+from infra.constants import REPOSITORY_EXECUTOR_WORKERS
+from infra.sqlite.statistics import StatisticsDatabase
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+from infra.threaded.statistics import ThreadedStatistics
+from infra.threaded.transactions import ThreadedTransactions
+from infra.threaded.users import ThreadedUsers
+from infra.threaded.wallets import ThreadedWallets
+from runner.setup import init_app
+
+REQUESTS = 5_000
+IN_FLIGHT = 1_000
+TRANSFER_BTC = 0.00000001
+
+
+async def send_requests(app: FastAPI) -> tuple[float, float, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        response = await client.post("/users", json={"email": "bench@gmail.com"})
+        headers = {"api_key": response.json()["user"]["api_key"]}
+        addresses = [
+            (await client.post("/wallets", headers=headers)).json()["wallet"]["address"]
+            for _ in range(2)
+        ]
+        in_flight = asyncio.Semaphore(IN_FLIGHT)
+        latencies: list[float] = []
+
+        async def send(i: int) -> None:
+            async with in_flight:
+                start = time.perf_counter()
+                if i % 10 == 0:
+                    response = await client.post(
+                        "/transactions",
+                        headers=headers,
+                        json={
+                            "from_address": addresses[i % 20 // 10],
+                            "to_address": addresses[1 - i % 20 // 10],
+                            "transaction_amount": TRANSFER_BTC,
+                        },
+                    )
+                elif i % 2:
+                    response = await client.get(
+                        f"/wallets/{addresses[0]}", headers=headers
+                    )
+                else:
+                    response = await client.get(
+                        f"/wallets/{addresses[0]}/transactions",
+                        headers=headers,
+                        params={"limit": 10},
+                    )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send(i) for i in range(REQUESTS)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (
+        REQUESTS / elapsed,
+        latencies[len(latencies) // 2],
+        latencies[int(len(latencies) * 0.99)],
+    )
+
+
+def report(kind: str, app: FastAPI) -> None:
+    requests_per_second, p50, p99 = asyncio.run(send_requests(app))
+    print(
+        f"{kind:>7}: {requests_per_second:8.0f} req/s, "
+        f"p50 {p50 * 1000:7.1f} ms, p99 {p99 * 1000:7.1f} ms"
+    )
+
+
+def main(kinds: list[str]) -> None:
+    for kind in kinds:
+        app = init_app()
+        if kind == "memory":
+            report(kind, app)
+            continue
+
+        with temporary_database() as db, ThreadPoolExecutor(
+            REPOSITORY_EXECUTOR_WORKERS
+        ) as executor:
+            wallets = WalletsDatabase(db)
+            transactions = TransactionsDataBase(db, wallets)
+            app.state.users = ThreadedUsers(UsersDatabase(db), executor)
+            app.state.wallets = ThreadedWallets(wallets, executor)
+            app.state.transactions = ThreadedTransactions(transactions, executor)
+            app.state.statistics = ThreadedStatistics(
+                StatisticsDatabase(db, transactions), executor
+            )
+            report(kind, app)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["memory", "sqlite"])
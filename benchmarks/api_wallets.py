@@ -0,0 +1,43 @@
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from infra.constants import WALLETS_LIMIT
+from runner.setup import init_app
+
+DEFAULT_CALLS = 2_000
+
+
+def main(calls: int) -> None:
+    client = TestClient(init_app())
+    response = client.post("/users", json={"email": "bench@gmail.com"})
+    headers = {"api_key": response.json()["user"]["api_key"]}
+    addresses = [
+        client.post("/wallets", headers=headers).json()["wallet"]["address"]
+        for _ in range(WALLETS_LIMIT)
+    ]
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        for address in addresses:
+            client.get(f"/wallets/{address}", headers=headers)
+    one_by_one = (time.perf_counter() - start) / calls
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        client.get("/wallets", headers=headers, params={"address": addresses})
+    multi_get = (time.perf_counter() - start) / calls
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        client.get("/wallets", headers=headers)
+    list_all = (time.perf_counter() - start) / calls
+
+    print(f"{WALLETS_LIMIT} x GET /wallets/{{address}}: {one_by_one * 1e6:8.0f} us")
+    print(f"GET /wallets?address=...:      {multi_get * 1e6:8.0f} us")
+    print(f"GET /wallets:                  {list_all * 1e6:8.0f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CALLS)
@@ -0,0 +1,181 @@
+import random
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from faker import Faker
+
+from benchmarks.sqlite_fixtures import temporary_database
+from benchmarks.timing import call_latencies, percentile
+from core.statistic import StatisticRepository
+from core.transaction import TransactionRepository
+from core.user import User, UserRepository
+from core.wallet import Wallet, WalletRepository
+from infra.constants import ADMIN_API_KEY, TRANSACTIONS_PAGE_SIZE
+from infra.in_memory.statistics import StatisticsInMemory
+from infra.in_memory.transactions import TransactionsInMemory
+from infra.in_memory.users import UsersInMemory
+from infra.in_memory.wallets import WalletsInMemory
+from infra.sqlite.database_connect import SqliteProfile
+from infra.sqlite.statistics import StatisticsDatabase
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+TRANSFER_AMOUNT = 1
+
+
+@dataclass
+class Backend:
+    users: UserRepository
+    wallets: WalletRepository
+    transactions: TransactionRepository
+    statistics: StatisticRepository
+    bulk: Callable[[], AbstractContextManager[object]] = nullcontext
+
+
+@dataclass
+class OperationResult:
+    backend: str
+    scale: int
+    operation: str
+    ops_per_second: float
+    p50_us: float
+    p99_us: float
+
+
+@contextmanager
+def in_memory_backend(_: SqliteProfile) -> Iterator[Backend]:
+    wallets = WalletsInMemory()
+    transactions = TransactionsInMemory(wallets)
+    yield Backend(
+        UsersInMemory(), wallets, transactions, StatisticsInMemory(transactions)
+    )
+
+
+@contextmanager
+def sqlite_backend(profile: SqliteProfile) -> Iterator[Backend]:
+    with temporary_database(profile) as db:
+        wallets = WalletsDatabase(db)
+        transactions = TransactionsDataBase(db, wallets)
+        yield Backend(
+            UsersDatabase(db),
+            wallets,
+            transactions,
+            StatisticsDatabase(db, transactions),
+            db.transaction,
+        )
+
+
+BACKENDS = {"memory": in_memory_backend, "sqlite": sqlite_backend}
+
+
+def fake_email(fake: Faker, i: int) -> str:
+    return f"{fake.user_name()}.{i}@{fake.free_email_domain()}"
+
+
+def seed(
+    backend: Backend, scale: int, fake: Faker, rng: random.Random
+) -> list[tuple[User, Wallet]]:
+    with backend.bulk():
+        owners = []
+        for i in range(scale):
+            user = backend.users.create(fake_email(fake, i))
+            owners.append((user, backend.wallets.create(user)))
+        for _ in range(scale):
+            (sender, from_wallet), (_, to_wallet) = rng.sample(owners, 2)
+            backend.transactions.make_transaction(
+                sender, from_wallet.address, to_wallet.address, TRANSFER_AMOUNT
+            )
+    return owners
+
+
+def benchmark_backend(
+    name: str,
+    backend: Backend,
+    scale: int,
+    operations: int,
+    fake: Faker,
+    rng: random.Random,
+) -> list[OperationResult]:
+    owners = seed(backend, scale, fake, rng)
+    emails = [fake_email(fake, scale + i) for i in range(operations)]
+    new_users: list[User] = []
+    pairs = [rng.sample(owners, 2) for _ in range(operations)]
+
+    def create_user(i: int) -> None:
+        new_users.append(backend.users.create(emails[i]))
+
+    def create_wallet(i: int) -> None:
+        backend.wallets.create(new_users[i])
+
+    def read_wallet(i: int) -> None:
+        user, wallet = pairs[i][0]
+        backend.wallets.read(wallet.address, user)
+
+    def transfer(i: int) -> None:
+        (sender, from_wallet), (_, to_wallet) = pairs[i]
+        backend.transactions.make_transaction(
+            sender, from_wallet.address, to_wallet.address, TRANSFER_AMOUNT
+        )
+
+    def history(i: int) -> None:
+        user, wallet = pairs[i][0]
+        backend.transactions.get_wallet_transactions(
+            user, wallet.address, 0, TRANSACTIONS_PAGE_SIZE
+        )
+
+    def statistics(_: int) -> None:
+        backend.statistics.get_statistic(ADMIN_API_KEY)
+
+    results = []
+    for operation, call in [
+        ("create user", create_user),
+        ("create wallet", create_wallet),
+        ("read wallet", read_wallet),
+        ("transfer", transfer),
+        ("history", history),
+        ("statistics", statistics),
+    ]:
+        latencies = call_latencies(call, operations)
+        results.append(
+            OperationResult(
+                name,
+                scale,
+                operation,
+                len(latencies) * 1e9 / sum(latencies),
+                percentile(latencies, 50) / 1000,
+                percentile(latencies, 99) / 1000,
+            )
+        )
+    return results
+
+
+def run_benchmarks(
+    scales: list[int],
+    backends: list[str],
+    operations: int,
+    profile: SqliteProfile,
+    seed_value: int = 0,
+) -> list[OperationResult]:
+    results = []
+    for scale in scales:
+        for name in backends:
+            fake = Faker()
+            fake.seed_instance(seed_value)
+            rng = random.Random(seed_value)
+            with BACKENDS[name](profile) as backend:
+                for result in benchmark_backend(
+                    name, backend, scale, operations, fake, rng
+                ):
+                    print(format_result(result), flush=True)
+                    results.append(result)
+    return results
+
+
+def format_result(result: OperationResult) -> str:
+    return (
+        f"{result.backend:>7} {result.scale:>9} {result.operation:>14}: "
+        f"{result.ops_per_second:10.0f} ops/s, "
+        f"p50 {result.p50_us:9.1f} us, p99 {result.p99_us:9.1f} us"
+    )
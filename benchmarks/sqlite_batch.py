@@ -0,0 +1,45 @@
+import sys
+import time
+
+from benchmarks.sqlite_fixtures import temporary_database
+from core.transaction import Transfer
+from infra.constants import TRANSACTIONS_BATCH_LIMIT
+from infra.sqlite.database_connect import SQLITE_PROFILES
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+TRANSFERS = 2_000
+
+
+def benchmark_transfers(profile_name: str, transfers: int, batch_size: int) -> float:
+    with temporary_database(SQLITE_PROFILES[profile_name]) as db:
+        users = UsersDatabase(db)
+        wallets = WalletsDatabase(db)
+        transactions = TransactionsDataBase(db, wallets)
+        sender = users.create("sender@gmail.com")
+        receiver = users.create("receiver@gmail.com")
+        from_wallet = wallets.create(sender)
+        to_wallet = wallets.create(receiver)
+        batch = [Transfer(from_wallet.address, to_wallet.address, 1)] * batch_size
+
+        start = time.perf_counter()
+        for _ in range(transfers // batch_size):
+            transactions.make_transactions(sender, batch)
+        return transfers / (time.perf_counter() - start)
+
+
+def main(profile_names: list[str]) -> None:
+    for profile_name in profile_names:
+        for batch_size in [1, 10, TRANSACTIONS_BATCH_LIMIT]:
+            transfers_per_second = benchmark_transfers(
+                profile_name, TRANSFERS, batch_size
+            )
+            print(
+                f"{profile_name:>12} batch={batch_size:<4}: "
+                f"{transfers_per_second:10.0f} transfers/s"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(SQLITE_PROFILES))
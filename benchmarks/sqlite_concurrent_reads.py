@@ -0,0 +1,51 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.sqlite_fixtures import temporary_database
+from core.user import User
+from core.wallet import Wallet
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+DEFAULT_THREADS = [1, 2, 4, 8]
+READS = 20_000
+USERS = 200
+
+
+def read_wallets(
+    users: UsersDatabase,
+    wallets: WalletsDatabase,
+    owners: list[tuple[User, Wallet]],
+    reads: int,
+) -> None:
+    for i in range(reads):
+        user, wallet = owners[i % len(owners)]
+        wallets.read(wallet.address, users.try_authorization(user.api_key))
+
+
+def main(thread_counts: list[int]) -> None:
+    with temporary_database() as db:
+        users = UsersDatabase(db)
+        wallets = WalletsDatabase(db)
+        owners = []
+        for i in range(USERS):
+            user = users.create(f"user{i}@gmail.com")
+            owners.append((user, wallets.create(user)))
+
+        for threads in thread_counts:
+            reads = READS // threads
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                futures = [
+                    executor.submit(read_wallets, users, wallets, owners, reads)
+                    for _ in range(threads)
+                ]
+                for future in futures:
+                    future.result()
+            elapsed = time.perf_counter() - start
+            print(f"{threads:>3} threads: {reads * threads / elapsed:10.0f} reads/s")
+
+
+if __name__ == "__main__":
+    main([int(threads) for threads in sys.argv[1:]] or DEFAULT_THREADS)
@@ -0,0 +1,22 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterator
+
+from infra.sqlite.database_connect import Database, SqliteProfile
+
+SQL_FILE_PATH = str(Path(__file__).parent.parent / "infra" / "sqlite" / "start_up.sql")
+
+
+@contextmanager
+def temporary_database(
+    profile: SqliteProfile = SqliteProfile(),
+) -> Iterator[Database]:
+    with TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "benchmark.db"), SQL_FILE_PATH, profile)
+        db.initial()
+        try:
+            yield db
+        finally:
+            db.close_database()
@@ -0,0 +1,63 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.sqlite_fixtures import temporary_database
+from core.transaction import TransactionRepository
+from infra.sqlite.database_connect import SQLITE_PROFILES
+from infra.sqlite.group_commit import GroupCommitTransactions
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+THREADS = 32
+TRANSFERS = 4_000
+
+
+def benchmark_transfers(profile_name: str, group_commit: bool) -> tuple[float, int]:
+    with temporary_database(SQLITE_PROFILES[profile_name]) as db:
+        users = UsersDatabase(db)
+        wallets = WalletsDatabase(db)
+        sender = users.create("sender@gmail.com")
+        receiver = users.create("receiver@gmail.com")
+        from_wallet = wallets.create(sender)
+        to_wallet = wallets.create(receiver)
+
+        direct = TransactionsDataBase(db, wallets)
+        transactions: TransactionRepository = direct
+        if group_commit:
+            transactions = GroupCommitTransactions(direct)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(THREADS) as executor:
+            for _ in executor.map(
+                lambda _: transactions.make_transaction(
+                    sender, from_wallet.address, to_wallet.address, 1
+                ),
+                range(TRANSFERS),
+            ):
+                pass
+        elapsed = time.perf_counter() - start
+
+        commits = TRANSFERS
+        if isinstance(transactions, GroupCommitTransactions):
+            transactions.close()
+            commits = transactions.commits
+        return TRANSFERS / elapsed, commits
+
+
+def main(profile_names: list[str]) -> None:
+    for profile_name in profile_names:
+        for group_commit in [False, True]:
+            transfers_per_second, commits = benchmark_transfers(
+                profile_name, group_commit
+            )
+            mode = "group" if group_commit else "direct"
+            print(
+                f"{profile_name:>12} {mode:>6}: {transfers_per_second:10.0f} "
+                f"transfers/s, {commits} commits"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(SQLITE_PROFILES))
@@ -0,0 +1,38 @@
+import sys
+import time
+
+from benchmarks.sqlite_fixtures import temporary_database
+from infra.sqlite.database_connect import SQLITE_PROFILES
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+TRANSFERS = 2_000
+
+
+def benchmark_transfers(profile_name: str, transfers: int) -> float:
+    with temporary_database(SQLITE_PROFILES[profile_name]) as db:
+        users = UsersDatabase(db)
+        wallets = WalletsDatabase(db)
+        transactions = TransactionsDataBase(db, wallets)
+        sender = users.create("sender@gmail.com")
+        receiver = users.create("receiver@gmail.com")
+        from_wallet = wallets.create(sender)
+        to_wallet = wallets.create(receiver)
+
+        start = time.perf_counter()
+        for _ in range(transfers):
+            transactions.make_transaction(
+                sender, from_wallet.address, to_wallet.address, 1
+            )
+        return transfers / (time.perf_counter() - start)
+
+
+def main(profile_names: list[str]) -> None:
+    for profile_name in profile_names:
+        transfers_per_second = benchmark_transfers(profile_name, TRANSFERS)
+        print(f"{profile_name:>12}: {transfers_per_second:10.0f} transfers/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(SQLITE_PROFILES))
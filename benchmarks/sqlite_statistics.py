@@ -0,0 +1,62 @@
+import sys
+
+from benchmarks.sqlite_fixtures import temporary_database
+from benchmarks.timing import nanoseconds_per_call
+from core.statistic import Granularity
+from infra.constants import ADMIN_API_KEY
+from infra.sqlite.database_connect import SQLITE_PROFILES
+from infra.sqlite.statistics import StatisticsDatabase
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+CALLS = 20
+YEAR_SECONDS = 365 * 24 * 3600
+
+
+def benchmark_statistics(size: int) -> tuple[float, float, float]:
+    with temporary_database(SQLITE_PROFILES["performance"]) as db:
+        users = UsersDatabase(db)
+        wallets = WalletsDatabase(db)
+        transactions = TransactionsDataBase(db, wallets)
+        statistics = StatisticsDatabase(db, transactions)
+        from_wallet = wallets.create(users.create("sender@gmail.com"))
+        to_wallet = wallets.create(users.create("receiver@gmail.com"))
+
+        addresses = (str(from_wallet.address), str(to_wallet.address))
+        with db.transaction() as cur:
+            cur.executemany(
+                "INSERT INTO TRANSACTIONS (FROM_ADDRESS, TO_ADDRESS, AMOUNT, FEE, "
+                "CREATED_AT) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (*addresses, 100_000, 1_500, i * YEAR_SECONDS // size)
+                    for i in range(size)
+                ),
+            )
+
+        running = nanoseconds_per_call(
+            lambda: statistics.get_statistic(ADMIN_API_KEY), CALLS
+        )
+        daily = nanoseconds_per_call(
+            lambda: statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.DAY),
+            CALLS,
+        )
+        recomputed = nanoseconds_per_call(
+            lambda: statistics.recompute_statistic(ADMIN_API_KEY), CALLS
+        )
+        return running, daily, recomputed
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        running, daily, recomputed = benchmark_statistics(size)
+        print(
+            f"{size:>10} transactions: {running / 1000:10.1f} us/get_statistic"
+            f" {daily / 1000:10.1f} us/365 daily buckets"
+            f" {recomputed / 1000:10.1f} us/recompute_statistic"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
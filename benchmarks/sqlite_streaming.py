@@ -0,0 +1,61 @@
+import sys
+import tracemalloc
+from typing import Callable
+
+from benchmarks.sqlite_fixtures import temporary_database
+from core.user import User
+from infra.sqlite.database_connect import SQLITE_PROFILES
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def peak_bytes(call: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def consume(transactions: TransactionsDataBase, user: User) -> None:
+    for _ in transactions.iter_all(user):
+        pass
+
+
+def benchmark_history(size: int) -> tuple[int, int]:
+    with temporary_database(SQLITE_PROFILES["performance"]) as db:
+        users = UsersDatabase(db)
+        wallets = WalletsDatabase(db)
+        transactions = TransactionsDataBase(db, wallets)
+        user = users.create("merchant@gmail.com")
+        from_wallet = wallets.create(user)
+        to_wallet = wallets.create(user)
+
+        row = (str(from_wallet.address), str(to_wallet.address), 1, 0, 0)
+        with db.transaction() as cur:
+            cur.executemany(
+                "INSERT INTO TRANSACTIONS (FROM_ADDRESS, TO_ADDRESS, AMOUNT, FEE, "
+                "CREATED_AT) VALUES (?, ?, ?, ?, ?)",
+                (row for _ in range(size)),
+            )
+
+        listed = peak_bytes(lambda: transactions.read_all(user))
+        streamed = peak_bytes(lambda: consume(transactions, user))
+        return listed, streamed
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        listed, streamed = benchmark_history(size)
+        print(
+            f"{size:>10} transactions: {listed / 2**20:10.1f} MiB read_all"
+            f" {streamed / 2**20:10.2f} MiB iter_all"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
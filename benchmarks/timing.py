@@ -0,0 +1,23 @@
+import time
+from typing import Callable
+
+
+def nanoseconds_per_call(call: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def call_latencies(call: Callable[[int], object], calls: int) -> list[int]:
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        call(i)
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def percentile(latencies: list[int], percent: float) -> int:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
@@ -0,0 +1,52 @@
+import random
+import sys
+
+from benchmarks.timing import nanoseconds_per_call
+from infra.in_memory.transactions import TransactionsInMemory
+from infra.in_memory.users import UsersInMemory
+from infra.in_memory.wallets import WalletsInMemory
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+USERS = 1_000
+PROBE_TRANSACTIONS = 10
+CALLS = 1_000
+AMOUNT = 1
+
+
+def benchmark_history(size: int) -> tuple[float, float]:
+    users = UsersInMemory()
+    wallets = WalletsInMemory()
+    transactions = TransactionsInMemory(wallets)
+    owners = []
+    for i in range(USERS):
+        user = users.create(f"user{i}@gmail.com")
+        owners.append((user, wallets.create(user)))
+
+    probe_user, probe_wallet = owners[0]
+    for i in range(size):
+        (sender, from_wallet), (_, to_wallet) = random.sample(owners[1:], 2)
+        if i % (size // PROBE_TRANSACTIONS) == 0:
+            sender, from_wallet = probe_user, probe_wallet
+        transactions.make_transaction(
+            sender, from_wallet.address, to_wallet.address, AMOUNT
+        )
+
+    read_all = nanoseconds_per_call(lambda: transactions.read_all(probe_user), CALLS)
+    wallet_history = nanoseconds_per_call(
+        lambda: transactions.get_wallet_transactions(probe_user, probe_wallet.address),
+        CALLS,
+    )
+    return read_all, wallet_history
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        read_all, wallet_history = benchmark_history(size)
+        print(
+            f"{size:>10} transactions: read_all {read_all / 1000:8.2f} us, "
+            f"wallet history {wallet_history / 1000:8.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,77 @@
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.errors import NotEnoughBitcoinError
+from core.user import User
+from core.wallet import Wallet
+from infra.constants import STARTING_SATOSHI_AMOUNT, WALLET_LOCK_STRIPES
+from infra.in_memory.locks import StripedLocks
+from infra.in_memory.transactions import TransactionsInMemory
+from infra.in_memory.users import UsersInMemory
+from infra.in_memory.wallets import WalletsInMemory
+
+DEFAULT_THREADS = [1, 2, 4, 8]
+TRANSFERS = 100_000
+USERS = 256
+
+
+def run_transfers(
+    transactions: TransactionsInMemory,
+    owners: list[tuple[User, Wallet]],
+    transfers: int,
+) -> None:
+    for _ in range(transfers):
+        (sender, from_wallet), (_, to_wallet) = random.sample(owners, 2)
+        try:
+            transactions.make_transaction(
+                sender,
+                from_wallet.address,
+                to_wallet.address,
+                random.randint(1, STARTING_SATOSHI_AMOUNT // 10),
+            )
+        except NotEnoughBitcoinError:
+            pass
+
+
+def benchmark_stress(threads: int, stripes: int, disjoint: bool) -> float:
+    users = UsersInMemory()
+    wallets = WalletsInMemory()
+    transactions = TransactionsInMemory(wallets, locks=StripedLocks(stripes))
+    owners = []
+    for i in range(USERS):
+        user = users.create(f"user{i}@gmail.com")
+        owners.append((user, wallets.create(user)))
+
+    groups = [owners[i::threads] if disjoint else owners for i in range(threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        futures = [
+            executor.submit(run_transfers, transactions, group, TRANSFERS // threads)
+            for group in groups
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    total = sum(wallet.balance for wallet in wallets.wallets.values())
+    assert total + transactions.profit == USERS * STARTING_SATOSHI_AMOUNT
+    assert transactions.total_transactions == len(transactions.transactions)
+    return TRANSFERS / elapsed
+
+
+def main(thread_counts: list[int]) -> None:
+    for threads in thread_counts:
+        for stripes in [1, WALLET_LOCK_STRIPES]:
+            for disjoint in [True, False]:
+                transfers_per_second = benchmark_stress(threads, stripes, disjoint)
+                wallets = "disjoint" if disjoint else "shared"
+                print(
+                    f"{threads:>3} threads {stripes:>3} stripes {wallets:>8}: "
+                    f"{transfers_per_second:10.0f} transfers/s, BTC conserved"
+                )
+
+
+if __name__ == "__main__":
+    main([int(threads) for threads in sys.argv[1:]] or DEFAULT_THREADS)
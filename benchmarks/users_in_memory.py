@@ -0,0 +1,24 @@
+import sys
+
+from benchmarks.timing import nanoseconds_per_call
+from infra.in_memory.users import UsersInMemory
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+CALLS = 10_000
+
+
+def benchmark_authorization(size: int) -> float:
+    users = UsersInMemory()
+    api_keys = [users.create(f"user{i}@gmail.com").api_key for i in range(size)]
+    last_api_key = api_keys[-1]
+
+    return nanoseconds_per_call(lambda: users.try_authorization(last_api_key), CALLS)
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        print(f"{size:>10} users: {benchmark_authorization(size):10.1f} ns/auth")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
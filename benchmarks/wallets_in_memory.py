@@ -0,0 +1,44 @@
+import sys
+
+from benchmarks.timing import nanoseconds_per_call
+from core.user import User
+from infra.in_memory.users import UsersInMemory
+from infra.in_memory.wallets import WalletsInMemory
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+CALLS = 100
+WALLETS_PER_USER = 2
+
+
+def seed(size: int) -> WalletsInMemory:
+    users = UsersInMemory()
+    wallets = WalletsInMemory()
+    for i in range(size // WALLETS_PER_USER):
+        user = users.create(f"user{i}@gmail.com")
+        for _ in range(WALLETS_PER_USER):
+            wallets.create(user)
+    return wallets
+
+
+def benchmark_wallets(size: int) -> tuple[float, float]:
+    wallets = seed(size)
+    creators = iter([User(f"creator{i}@gmail.com") for i in range(CALLS)])
+    create = nanoseconds_per_call(lambda: wallets.create(next(creators)), CALLS)
+
+    owner = next(iter(wallets.wallets.values())).user_id
+    user = User("owner@gmail.com", owner)
+    read_all = nanoseconds_per_call(lambda: wallets.read_all(user), CALLS)
+    return create, read_all
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        create, read_all = benchmark_wallets(size)
+        print(
+            f"{size:>10} wallets: {create / 1000:10.2f} us/create"
+            f" {read_all / 1000:10.2f} us/read_all"
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
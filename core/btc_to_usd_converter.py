@@ -1,9 +1,27 @@
-from dataclasses import dataclass
-from typing import Protocol
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock, Thread
+from typing import Any, Callable, Protocol, runtime_checkable
 
 import httpx
 
-from infra.constants import FAKE_RATE
+from core.errors import ExchangeRateUnavailableError
+from infra.constants import (
+    COINCONVERT_URL,
+    EXCHANGE_RATE_CONNECT_TIMEOUT_SECONDS,
+    EXCHANGE_RATE_FAILURE_THRESHOLD,
+    EXCHANGE_RATE_HEDGE_DELAY_SECONDS,
+    EXCHANGE_RATE_HEDGE_PERCENTILE,
+    EXCHANGE_RATE_LATENCY_SAMPLES,
+    EXCHANGE_RATE_MAX_CONNECTIONS,
+    EXCHANGE_RATE_READ_TIMEOUT_SECONDS,
+    EXCHANGE_RATE_RESET_TIMEOUT_SECONDS,
+    EXCHANGE_RATE_TTL_SECONDS,
+    FAKE_RATE,
+)
 
 
 class CryptoExchangeRate(Protocol):
@@ -11,13 +29,23 @@ class CryptoExchangeRate(Protocol):
         pass
 
 
+class AsyncCryptoExchangeRate(Protocol):
+    async def get_rate(self) -> float:
+        pass
+
+
+@runtime_checkable
+class CachingCryptoExchangeRate(CryptoExchangeRate, Protocol):
+    def cached_rate(self) -> float | None:
+        pass
+
+
 @dataclass
 class APICryptoExchangeRate:
+    url: str = COINCONVERT_URL
+
     def get_rate(self) -> float:
-        response = httpx.get(
-            "https://api.coinconvert.net/convert/btc/usd",
-            params={"amount": 1},
-        )
+        response = httpx.get(self.url, params={"amount": 1})
 
         return float(response.json()["USD"])
 
@@ -28,3 +56,285 @@ class FakeCryptoExchangeRate:
 
     def get_rate(self) -> float:
         return self.rate
+
+    def cached_rate(self) -> float | None:
+        return self.rate
+
+
+@dataclass
+class CachedCryptoExchangeRate:
+    converter: CryptoExchangeRate
+    ttl_seconds: float = EXCHANGE_RATE_TTL_SECONDS
+    clock: Callable[[], float] = time.monotonic
+    rate: float | None = None
+    expires_at: float = 0.0
+    refreshing: bool = False
+    refresh_failures: int = 0
+    last_refresh_error: Exception | None = None
+    lock: Lock = field(default_factory=Lock, repr=False)
+    fetch_lock: Lock = field(default_factory=Lock, repr=False)
+
+    def get_rate(self) -> float:
+        with self.lock:
+            if self.rate is not None:
+                if self.clock() >= self.expires_at and not self.refreshing:
+                    self.refreshing = True
+                    Thread(target=self._refresh_in_background, daemon=True).start()
+                return self.rate
+
+        with self.fetch_lock:
+            if self.rate is not None:
+                return self.rate
+            return self._fetch()
+
+    def cached_rate(self) -> float | None:
+        with self.lock:
+            if self.rate is not None and self.clock() < self.expires_at:
+                return self.rate
+        return None
+
+    def _fetch(self) -> float:
+        rate = self.converter.get_rate()
+        with self.lock:
+            self.rate = rate
+            self.expires_at = self.clock() + self.ttl_seconds
+        return rate
+
+    def _refresh_in_background(self) -> None:
+        try:
+            with self.fetch_lock:
+                self._fetch()
+        except Exception as e:
+            with self.lock:
+                self.refresh_failures += 1
+                self.last_refresh_error = e
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+
+@dataclass
+class ThreadedCryptoExchangeRate:
+    converter: CryptoExchangeRate
+
+    async def get_rate(self) -> float:
+        if isinstance(self.converter, CachingCryptoExchangeRate):
+            rate = self.converter.cached_rate()
+            if rate is not None:
+                return rate
+        return await asyncio.to_thread(self.converter.get_rate)
+
+
+@dataclass
+class CircuitBreaker:
+    failure_threshold: int = EXCHANGE_RATE_FAILURE_THRESHOLD
+    reset_timeout_seconds: float = EXCHANGE_RATE_RESET_TIMEOUT_SECONDS
+    clock: Callable[[], float] = time.monotonic
+    failures: int = 0
+    opened_at: float | None = None
+    probing: bool = False
+
+    def allows_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.probing or self.clock() - self.opened_at < self.reset_timeout_seconds:
+            return False
+        self.probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+
+def create_exchange_rate_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            EXCHANGE_RATE_READ_TIMEOUT_SECONDS,
+            connect=EXCHANGE_RATE_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=EXCHANGE_RATE_MAX_CONNECTIONS,
+            max_keepalive_connections=EXCHANGE_RATE_MAX_CONNECTIONS,
+        ),
+    )
+
+
+@dataclass
+class AsyncAPICryptoExchangeRate:
+    url: str = COINCONVERT_URL
+    client: httpx.AsyncClient = field(default_factory=create_exchange_rate_client)
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    rate: float | None = None
+    ttl_seconds: float = EXCHANGE_RATE_TTL_SECONDS
+    clock: Callable[[], float] = time.monotonic
+    expires_at: float = 0.0
+    refresh: asyncio.Future[float] | None = field(default=None, repr=False)
+
+    async def get_rate(self) -> float:
+        if self.rate is not None and self.clock() < self.expires_at:
+            return self.rate
+        if self.refresh is None or self.refresh.done():
+            self.refresh = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self.refresh)
+
+    async def _refresh(self) -> float:
+        if not self.breaker.allows_request():
+            return self._last_rate()
+
+        try:
+            response = await self.client.get(self.url, params={"amount": 1})
+            response.raise_for_status()
+            rate = float(response.json()["USD"])
+        except asyncio.CancelledError:
+            self.breaker.record_failure()
+            raise
+        except (httpx.HTTPError, KeyError, ValueError):
+            self.breaker.record_failure()
+            return self._last_rate()
+
+        self.breaker.record_success()
+        self.rate = rate
+        self.expires_at = self.clock() + self.ttl_seconds
+        return rate
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def _last_rate(self) -> float:
+        if self.rate is None:
+            raise ExchangeRateUnavailableError()
+        return self.rate
+
+
+@dataclass
+class ProviderLatency:
+    samples: deque[float] = field(
+        default_factory=lambda: deque(maxlen=EXCHANGE_RATE_LATENCY_SAMPLES)
+    )
+    requests: int = 0
+    failures: int = 0
+
+    def record(self, seconds: float) -> None:
+        self.requests += 1
+        self.samples.append(seconds)
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.failures += 1
+
+    def percentile(self, percent: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = math.ceil(percent / 100 * len(ordered))
+        return ordered[max(rank, 1) - 1]
+
+
+@dataclass
+class ExchangeRateProvider:
+    url: str
+    json_path: str = "USD"
+    latency: ProviderLatency = field(default_factory=ProviderLatency)
+
+    def parse_rate(self, payload: Any) -> float:
+        for key in self.json_path.split("."):
+            payload = payload[key]
+        rate = float(payload)
+        if not math.isfinite(rate) or rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}")
+        return rate
+
+
+@dataclass
+class ProviderStatistic:
+    url: str
+    requests: int
+    failures: int
+    p50_seconds: float | None
+    p99_seconds: float | None
+
+
+@dataclass
+class HedgedCryptoExchangeRate:
+    providers: list[ExchangeRateProvider]
+    client: httpx.AsyncClient = field(default_factory=create_exchange_rate_client)
+    hedge_percentile: float = EXCHANGE_RATE_HEDGE_PERCENTILE
+    default_hedge_delay_seconds: float = EXCHANGE_RATE_HEDGE_DELAY_SECONDS
+
+    async def get_rate(self) -> float:
+        pending: set[asyncio.Task[float]] = set()
+        try:
+            for provider in self.providers:
+                pending.add(asyncio.create_task(self._fetch(provider)))
+                rate = await self._first_rate(pending, self._hedge_delay(provider))
+                if rate is not None:
+                    return rate
+
+            rate = await self._first_rate(pending, None)
+            if rate is None:
+                raise ExchangeRateUnavailableError()
+            return rate
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def provider_statistics(self) -> list[ProviderStatistic]:
+        return [
+            ProviderStatistic(
+                provider.url,
+                provider.latency.requests,
+                provider.latency.failures,
+                provider.latency.percentile(50),
+                provider.latency.percentile(99),
+            )
+            for provider in self.providers
+        ]
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def _hedge_delay(self, provider: ExchangeRateProvider) -> float:
+        delay = provider.latency.percentile(self.hedge_percentile)
+        return self.default_hedge_delay_seconds if delay is None else delay
+
+    async def _fetch(self, provider: ExchangeRateProvider) -> float:
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(provider.url)
+            response.raise_for_status()
+            rate = provider.parse_rate(response.json())
+        except asyncio.CancelledError:
+            provider.latency.record(time.perf_counter() - start)
+            raise
+        except (httpx.HTTPError, KeyError, TypeError, ValueError):
+            provider.latency.record_failure()
+            raise
+        provider.latency.record(time.perf_counter() - start)
+        return rate
+
+    @staticmethod
+    async def _first_rate(
+        pending: set[asyncio.Task[float]], timeout: float | None
+    ) -> float | None:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                return None
+            pending.difference_update(done)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            if timeout is not None:
+                return None
+        return None
@@ -1,4 +1,6 @@
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import ClassVar
 from uuid import UUID
 
 from fastapi.responses import JSONResponse
@@ -15,97 +17,108 @@ class ErrorMessageEnvelope(BaseModel):
     error: ErrorMessageResponse
 
 
-@dataclass
-class WalletDoesNotExistError(Exception):
-    wallet_address: UUID
+class ApiError(Exception, ABC):
+    status_code: ClassVar[int]
 
-    def get_error_json_response(self, code: int = 404) -> JSONResponse:
+    @property
+    @abstractmethod
+    def message(self) -> str:
+        pass
+
+    def get_error_json_response(self, code: int | None = None) -> JSONResponse:
         return JSONResponse(
-            status_code=code,
-            content={
-                "error": {
-                    "message": f"Wallet with address<{self.wallet_address}>"
-                    f" does not exist."
-                }
-            },
+            status_code=self.status_code if code is None else code,
+            content={"error": {"message": self.message}},
         )
 
 
 @dataclass
-class InvalidApiKeyError(Exception):
+class WalletDoesNotExistError(ApiError):
+    wallet_address: UUID
+    status_code: ClassVar[int] = 404
+
+    @property
+    def message(self) -> str:
+        return f"Wallet with address<{self.wallet_address}> does not exist."
+
+
+@dataclass
+class InvalidApiKeyError(ApiError):
     api_key: str
+    status_code: ClassVar[int] = 401
 
-    def get_error_json_response(self, code: int = 401) -> JSONResponse:
-        return JSONResponse(
-            status_code=code,
-            content={"error": {"message": f"Invalid API key: {self.api_key}"}},
-        )
+    @property
+    def message(self) -> str:
+        return f"Invalid API key: {self.api_key}"
 
 
 @dataclass
-class WalletsLimitError(Exception):
+class WalletsLimitError(ApiError):
     api_key: str
+    status_code: ClassVar[int] = 409
 
-    def get_error_json_response(self, code: int = 409) -> JSONResponse:
-        return JSONResponse(
-            status_code=code,
-            content={
-                "error": {
-                    "message": f"User<{self.api_key}> "
-                    f"reached wallets limit({WALLETS_LIMIT})."
-                }
-            },
-        )
+    @property
+    def message(self) -> str:
+        return f"User<{self.api_key}> reached wallets limit({WALLETS_LIMIT})."
 
 
 @dataclass
-class WalletPermissionError(Exception):
+class WalletPermissionError(ApiError):
     wallet_address: UUID
+    status_code: ClassVar[int] = 403
 
-    def get_error_json_response(self, code: int = 403) -> JSONResponse:
-        return JSONResponse(
-            status_code=code,
-            content={
-                "error": {
-                    "message": f"User does not have wallet<{self.wallet_address}>."
-                }
-            },
-        )
+    @property
+    def message(self) -> str:
+        return f"User does not have wallet<{self.wallet_address}>."
 
 
 @dataclass
-class NotEnoughBitcoinError(Exception):
+class NotEnoughBitcoinError(ApiError):
     wallet_address: UUID
+    status_code: ClassVar[int] = 409
 
-    def get_error_json_response(self, code: int = 409) -> JSONResponse:
-        return JSONResponse(
-            status_code=code,
-            content={
-                "error": {
-                    "message": f"Not enough bitcoin on the wallet with address"
-                    f"<{self.wallet_address}>."
-                }
-            },
+    @property
+    def message(self) -> str:
+        return (
+            "Not enough bitcoin on the wallet with address" f"<{self.wallet_address}>."
         )
 
 
 @dataclass
-class TransactionBetweenSameWalletError(Exception):
-    def get_error_json_response(self, code: int = 405) -> JSONResponse:
-        return JSONResponse(
-            status_code=code,
-            content={
-                "error": {"message": "Transaction between one wallet is restricted."}
-            },
-        )
+class TransactionBetweenSameWalletError(ApiError):
+    status_code: ClassVar[int] = 405
+
+    @property
+    def message(self) -> str:
+        return "Transaction between one wallet is restricted."
 
 
 @dataclass
-class EmailAlreadyExistError(Exception):
+class EmailAlreadyExistError(ApiError):
     email: str
+    status_code: ClassVar[int] = 409
 
-    def get_error_json_response(self, code: int = 409) -> JSONResponse:
-        return JSONResponse(
-            status_code=code,
-            content={"error": {"message": f"The email: {self.email} already exists."}},
+    @property
+    def message(self) -> str:
+        return f"The email: {self.email} already exists."
+
+
+@dataclass
+class ExchangeRateUnavailableError(ApiError):
+    status_code: ClassVar[int] = 503
+
+    @property
+    def message(self) -> str:
+        return "BTC to USD exchange rate is unavailable."
+
+
+@dataclass
+class BatchRolledBackError(ApiError):
+    status_code: ClassVar[int] = 424
+
+    @property
+    def message(self) -> str:
+        return (
+            "Transaction was rolled back because another "
+            "transaction in the batch failed."
         )
@@ -1,13 +1,110 @@
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
 from typing import Protocol
 
 
+class Granularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+
+def as_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def bucket_start(moment: datetime, granularity: Granularity) -> datetime:
+    start = as_utc(moment).replace(minute=0, second=0, microsecond=0)
+    if granularity != Granularity.HOUR:
+        start = start.replace(hour=0)
+    if granularity == Granularity.MONTH:
+        start = start.replace(day=1)
+    return start
+
+
+def next_bucket_start(moment: datetime, granularity: Granularity) -> datetime:
+    start = bucket_start(moment, granularity)
+    if granularity == Granularity.HOUR:
+        return start + timedelta(hours=1)
+    if granularity == Granularity.DAY:
+        return start + timedelta(days=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+@dataclass
+class BucketRange:
+    start: datetime | None
+    end: datetime | None
+    rolled_up: bool
+
+
+def split_bucket_range(
+    granularity: Granularity,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> list[BucketRange]:
+    lower = None if start is None else as_utc(start)
+    upper = None if end is None else as_utc(end)
+    first = lower
+    if lower is not None and lower != bucket_start(lower, granularity):
+        first = next_bucket_start(lower, granularity)
+    last = None if upper is None else bucket_start(upper, granularity)
+    if first is not None and last is not None and first > last:
+        return [BucketRange(lower, upper, False)]
+
+    ranges = [
+        BucketRange(lower, first, False),
+        BucketRange(first, last, True),
+        BucketRange(last, upper, False),
+    ]
+    return [part for part in ranges if part.rolled_up or part.start != part.end]
+
+
 @dataclass
 class Statistic:
     total_transactions: int
-    profit: float
+    profit: int
+
+
+@dataclass
+class StatisticBucket:
+    start: datetime
+    total_transactions: int
+    profit: int
 
 
 class StatisticRepository(Protocol):
     def get_statistic(self, admin_api_key: str) -> Statistic:
         pass
+
+    def get_statistic_buckets(
+        self,
+        admin_api_key: str,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatisticBucket]:
+        pass
+
+    def recompute_statistic(self, admin_api_key: str) -> Statistic:
+        pass
+
+
+class AsyncStatisticRepository(Protocol):
+    async def get_statistic(self, admin_api_key: str) -> Statistic:
+        pass
+
+    async def get_statistic_buckets(
+        self,
+        admin_api_key: str,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatisticBucket]:
+        pass
+
+    async def recompute_statistic(self, admin_api_key: str) -> Statistic:
+        pass
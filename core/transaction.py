@@ -1,47 +1,83 @@
-import math
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator, Protocol, Union
 from uuid import UUID
 
-from core.errors import NotEnoughBitcoinError, TransactionBetweenSameWalletError
-from core.wallet import WalletRepository
-from infra.constants import MINIMUM_AMOUNT_OF_BITCOIN
+from core.errors import (
+    BatchRolledBackError,
+    NotEnoughBitcoinError,
+    TransactionBetweenSameWalletError,
+    WalletDoesNotExistError,
+    WalletPermissionError,
+)
+from core.user import User
+from core.wallet import WalletOverlay, WalletRepository
+from infra.constants import TRANSACTION_FEE_PER_MILLE
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def get_transaction_fee(transaction_amount: int) -> int:
+    return -(-transaction_amount * TRANSACTION_FEE_PER_MILLE // 1000)
 
 
 @dataclass
 class Transaction:
     from_address: UUID
     to_address: UUID
-    transaction_amount: float
-    transaction_fee: float
+    transaction_amount: int
+    transaction_fee: int
+    id: int = 0
+    created_at: datetime = field(default_factory=utc_now)
+
+
+@dataclass
+class Transfer:
+    from_address: UUID
+    to_address: UUID
+    transaction_amount: int
+
+
+TransferError = Union[
+    NotEnoughBitcoinError,
+    TransactionBetweenSameWalletError,
+    WalletDoesNotExistError,
+    WalletPermissionError,
+    BatchRolledBackError,
+]
+TRANSFER_ERRORS = (
+    NotEnoughBitcoinError,
+    TransactionBetweenSameWalletError,
+    WalletDoesNotExistError,
+    WalletPermissionError,
+)
 
 
 class TransactionRepository(ABC):
     def _prepare_transaction(
         self,
-        from_api_key: str,
+        user: User,
         from_address: UUID,
         to_address: UUID,
-        transaction_amount: float,
+        transaction_amount: int,
         wallets: WalletRepository,
     ) -> Transaction:
         if from_address == to_address:
             raise TransactionBetweenSameWalletError()
 
-        from_wallet = wallets.read(from_address, from_api_key)
-        to_wallet = wallets.read(to_address, from_api_key, False)
+        from_wallet = wallets.read(from_address, user)
+        to_wallet = wallets.read(to_address, user, False)
 
-        transaction_amount = math.ceil(transaction_amount * 10**8) / 10**8
-
-        if from_wallet.get_balance() < transaction_amount:
+        if from_wallet.balance < transaction_amount:
             raise NotEnoughBitcoinError(from_wallet.address)
-        from_new_balance = from_wallet.get_balance() - transaction_amount
-        to_new_balance = to_wallet.get_balance() + transaction_amount
-        fee = 0.0
+        from_new_balance = from_wallet.balance - transaction_amount
+        to_new_balance = to_wallet.balance + transaction_amount
+        fee = 0
         if from_wallet.user_id != to_wallet.user_id:
-            fee = transaction_amount * 1.5 / 100
-        if fee < MINIMUM_AMOUNT_OF_BITCOIN and fee != 0:
-            fee = MINIMUM_AMOUNT_OF_BITCOIN
+            fee = get_transaction_fee(transaction_amount)
         to_new_balance -= fee
 
         wallets.update_balance(from_wallet.address, from_new_balance)
@@ -51,20 +87,104 @@ class TransactionRepository(ABC):
 
         return transaction
 
+    def _prepare_transactions(
+        self,
+        user: User,
+        transfers: list[Transfer],
+        atomic: bool,
+        wallets: WalletRepository,
+    ) -> tuple[list[Transaction | TransferError], WalletOverlay]:
+        overlay = WalletOverlay(wallets)
+        results: list[Transaction | TransferError] = []
+        for transfer in transfers:
+            try:
+                transaction = self._prepare_transaction(
+                    user,
+                    transfer.from_address,
+                    transfer.to_address,
+                    transfer.transaction_amount,
+                    overlay,
+                )
+                results.append(transaction)
+            except TRANSFER_ERRORS as e:
+                results.append(e)
+
+        if atomic and not all(isinstance(r, Transaction) for r in results):
+            overlay.balances.clear()
+            results = [
+                BatchRolledBackError() if isinstance(result, Transaction) else result
+                for result in results
+            ]
+        return results, overlay
+
     @abstractmethod
     def make_transaction(
         self,
-        from_api_key: str,
+        user: User,
         from_address: UUID,
         to_address: UUID,
-        transaction_amount: float,
+        transaction_amount: int,
     ) -> Transaction:
         pass
 
     @abstractmethod
-    def read_all(self, api_key: str) -> list[Transaction]:
+    def make_transactions(
+        self, user: User, transfers: list[Transfer], atomic: bool = True
+    ) -> list[Transaction | TransferError]:
+        pass
+
+    @abstractmethod
+    def read_all(
+        self, user: User, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        pass
+
+    @abstractmethod
+    def get_wallet_transactions(
+        self, user: User, address: UUID, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        pass
+
+    @abstractmethod
+    def iter_all(self, user: User) -> Iterator[Transaction]:
         pass
 
     @abstractmethod
-    def get_wallet_transactions(self, api_key: str, address: UUID) -> list[Transaction]:
+    def iter_wallet_transactions(
+        self, user: User, address: UUID
+    ) -> Iterator[Transaction]:
+        pass
+
+
+class AsyncTransactionRepository(Protocol):
+    async def make_transaction(
+        self,
+        user: User,
+        from_address: UUID,
+        to_address: UUID,
+        transaction_amount: int,
+    ) -> Transaction:
+        pass
+
+    async def make_transactions(
+        self, user: User, transfers: list[Transfer], atomic: bool = True
+    ) -> list[Transaction | TransferError]:
+        pass
+
+    async def read_all(
+        self, user: User, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        pass
+
+    async def get_wallet_transactions(
+        self, user: User, address: UUID, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        pass
+
+    async def iter_all(self, user: User) -> AsyncIterator[Transaction]:
+        pass
+
+    async def iter_wallet_transactions(
+        self, user: User, address: UUID
+    ) -> AsyncIterator[Transaction]:
         pass
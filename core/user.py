@@ -23,3 +23,11 @@ class UserRepository(Protocol):
 
     def try_authorization(self, api_key: str) -> User:
         pass
+
+
+class AsyncUserRepository(Protocol):
+    async def create(self, email: str) -> User:
+        pass
+
+    async def try_authorization(self, api_key: str) -> User:
+        pass
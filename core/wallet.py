@@ -1,31 +1,102 @@
+import math
 from dataclasses import dataclass, field
+from decimal import Decimal
 from typing import Protocol
 from uuid import UUID, uuid4
 
-from infra.constants import STARTING_BITCOIN_AMOUNT
+from core.errors import WalletPermissionError
+from core.user import User
+from infra.constants import (
+    MAX_BITCOIN_SUPPLY,
+    SATOSHIS_PER_BITCOIN,
+    STARTING_SATOSHI_AMOUNT,
+)
+
+
+def to_satoshis(btc: float) -> int:
+    if not 0 < btc <= MAX_BITCOIN_SUPPLY:
+        raise ValueError(f"Invalid bitcoin amount: {btc}")
+    return math.ceil(Decimal(str(btc)) * SATOSHIS_PER_BITCOIN)
+
+
+def to_btc(satoshis: int) -> float:
+    return satoshis / SATOSHIS_PER_BITCOIN
 
 
 @dataclass
 class Wallet:
     user_id: UUID
     address: UUID = field(default_factory=uuid4)
-    balance: float = STARTING_BITCOIN_AMOUNT
-
-    def get_balance(self) -> float:
-        return float("{:.8f}".format(self.balance))
+    balance: int = STARTING_SATOSHI_AMOUNT
 
 
 class WalletRepository(Protocol):
-    def create(self, api_key: str) -> Wallet:
+    def create(self, user: User) -> Wallet:
+        pass
+
+    def read(self, address: UUID, user: User, check_permission: bool = True) -> Wallet:
+        pass
+
+    def read_many(self, addresses: list[UUID], user: User) -> list[Wallet]:
+        pass
+
+    def update_balance(self, address: UUID, new_balance: int) -> None:
+        pass
+
+    def read_all(self, user: User) -> list[Wallet]:
         pass
 
-    def read(
-        self, address: UUID, api_key: str, check_permission: bool = True
+
+class AsyncWalletRepository(Protocol):
+    async def create(self, user: User) -> Wallet:
+        pass
+
+    async def read(
+        self, address: UUID, user: User, check_permission: bool = True
     ) -> Wallet:
         pass
 
-    def update_balance(self, address: UUID, new_balance: float) -> None:
+    async def read_many(self, addresses: list[UUID], user: User) -> list[Wallet]:
         pass
 
-    def read_all(self, api_key: str) -> list[Wallet]:
+    async def update_balance(self, address: UUID, new_balance: int) -> None:
         pass
+
+    async def read_all(self, user: User) -> list[Wallet]:
+        pass
+
+
+@dataclass
+class WalletOverlay:
+    wallets: WalletRepository
+    cache: dict[UUID, Wallet] = field(default_factory=dict)
+    balances: dict[UUID, int] = field(default_factory=dict)
+
+    def create(self, user: User) -> Wallet:
+        return self.wallets.create(user)
+
+    def read(self, address: UUID, user: User, check_permission: bool = True) -> Wallet:
+        wallet = self.cache.get(address)
+        if wallet is None:
+            wallet = self.wallets.read(address, user, False)
+            self.cache[address] = wallet
+        if check_permission and wallet.user_id != user.id:
+            raise WalletPermissionError(address)
+        balance = self.balances.get(address, wallet.balance)
+        return Wallet(wallet.user_id, wallet.address, balance)
+
+    def read_many(self, addresses: list[UUID], user: User) -> list[Wallet]:
+        return [self.read(address, user) for address in dict.fromkeys(addresses)]
+
+    def update_balance(self, address: UUID, new_balance: int) -> None:
+        self.balances[address] = new_balance
+
+    def read_all(self, user: User) -> list[Wallet]:
+        return [
+            Wallet(
+                wallet.user_id,
+                wallet.address,
+                self.balances.get(wallet.address, wallet.balance),
+            )
+            for wallet in self.wallets.read_all(user)
+        ]
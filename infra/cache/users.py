@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable
+
+from core.user import User, UserRepository
+from infra.constants import USERS_CACHE_SIZE, USERS_CACHE_TTL_SECONDS
+
+
+@dataclass
+class CachedUsers:
+    users: UserRepository
+    max_size: int = USERS_CACHE_SIZE
+    ttl_seconds: float = USERS_CACHE_TTL_SECONDS
+    clock: Callable[[], float] = time.monotonic
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    entries: OrderedDict[str, tuple[float, User]] = field(
+        default_factory=OrderedDict, repr=False
+    )
+    lock: Lock = field(default_factory=Lock, repr=False)
+
+    def create(self, email: str) -> User:
+        user = self.users.create(email)
+        self._store(user)
+        return user
+
+    def try_authorization(self, api_key: str) -> User:
+        with self.lock:
+            entry = self.entries.get(api_key)
+            if entry is not None and entry[0] > self.clock():
+                self.entries.move_to_end(api_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            invalidations = self.invalidations
+
+        user = self.users.try_authorization(api_key)
+        self._store(user, invalidations)
+        return user
+
+    def invalidate(self, api_key: str) -> None:
+        with self.lock:
+            self.invalidations += 1
+            self.entries.pop(api_key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.invalidations += 1
+            self.entries.clear()
+
+    def _store(self, user: User, invalidations: int | None = None) -> None:
+        with self.lock:
+            if invalidations is not None and invalidations != self.invalidations:
+                return
+            self.entries[user.api_key] = (self.clock() + self.ttl_seconds, user)
+            self.entries.move_to_end(user.api_key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
@@ -4,10 +4,54 @@ SQL_FILE_TEST = "../infra/sqlite/start_up.sql"
 
 TOKEN_HEX_BYTES_NUM = 32
 
+SATOSHIS_PER_BITCOIN = 100_000_000
+MAX_BITCOIN_SUPPLY = 21_000_000
 STARTING_BITCOIN_AMOUNT = 1
+STARTING_SATOSHI_AMOUNT = STARTING_BITCOIN_AMOUNT * SATOSHIS_PER_BITCOIN
 WALLETS_LIMIT = 3
-MINIMUM_AMOUNT_OF_BITCOIN = 0.00000001
+TRANSACTION_FEE_PER_MILLE = 15
 
 FAKE_RATE = 100.0
 
 ADMIN_API_KEY = "b42b6a94c86a51f016e0ee11d140de6824b81d2cadcea443370d0c49ce251789"
+
+USERS_CACHE_SIZE = 4096
+USERS_CACHE_TTL_SECONDS = 60.0
+
+COINCONVERT_URL = "https://api.coinconvert.net/convert/btc/usd"
+EXCHANGE_RATE_TTL_SECONDS = 30.0
+EXCHANGE_RATE_CONNECT_TIMEOUT_SECONDS = 1.0
+EXCHANGE_RATE_READ_TIMEOUT_SECONDS = 2.0
+EXCHANGE_RATE_MAX_CONNECTIONS = 10
+EXCHANGE_RATE_FAILURE_THRESHOLD = 3
+EXCHANGE_RATE_RESET_TIMEOUT_SECONDS = 30.0
+EXCHANGE_RATE_HEDGE_PERCENTILE = 95.0
+EXCHANGE_RATE_HEDGE_DELAY_SECONDS = 0.2
+EXCHANGE_RATE_LATENCY_SAMPLES = 256
+EXCHANGE_RATE_PROVIDERS = [
+    {"url": "https://api.coinconvert.net/convert/btc/usd?amount=1", "json_path": "USD"},
+    {
+        "url": "https://api.coinbase.com/v2/prices/BTC-USD/spot",
+        "json_path": "data.amount",
+    },
+    {
+        "url": "https://api.coingecko.com/api/v3/simple/price"
+        "?ids=bitcoin&vs_currencies=usd",
+        "json_path": "bitcoin.usd",
+    },
+]
+
+TRANSACTIONS_PAGE_SIZE = 100
+TRANSACTIONS_PAGE_LIMIT = 1000
+TRANSACTIONS_STREAM_BATCH_SIZE = 500
+TRANSACTIONS_BATCH_LIMIT = 100
+
+GROUP_COMMIT_WINDOW_SECONDS = 0.002
+GROUP_COMMIT_MAX_BATCH = 100
+
+WALLET_LOCK_STRIPES = 64
+
+REPOSITORY_EXECUTOR_WORKERS = 64
+
+BENCHMARK_SCALES = [1_000]
+BENCHMARK_OPERATIONS = 1_000
@@ -2,50 +2,65 @@ from typing import Annotated
 
 from fastapi import Depends, Header
 from fastapi.requests import Request
+from fastapi.responses import JSONResponse
 
-from core.btc_to_usd_converter import CryptoExchangeRate
-from core.statistic import StatisticRepository
-from core.transaction import TransactionRepository
-from core.user import UserRepository
-from core.wallet import WalletRepository
+from core.btc_to_usd_converter import AsyncCryptoExchangeRate
+from core.errors import InvalidApiKeyError
+from core.statistic import AsyncStatisticRepository
+from core.transaction import AsyncTransactionRepository
+from core.user import AsyncUserRepository, User
+from core.wallet import AsyncWalletRepository
 
 
-def get_user_repository(request: Request) -> UserRepository:
+async def get_user_repository(request: Request) -> AsyncUserRepository:
     return request.app.state.users  # type: ignore
 
 
-UserRepositoryDependable = Annotated[UserRepository, Depends(get_user_repository)]
+UserRepositoryDependable = Annotated[AsyncUserRepository, Depends(get_user_repository)]
 
 ApiKey = Annotated[str, Header(convert_underscores=False)]
 
 
-def get_wallet_repository(request: Request) -> WalletRepository:
+async def get_user(api_key: ApiKey, users: UserRepositoryDependable) -> User:
+    return await users.try_authorization(api_key)
+
+
+UserDependable = Annotated[User, Depends(get_user)]
+
+
+async def handle_invalid_api_key(_: Request, error: InvalidApiKeyError) -> JSONResponse:
+    return error.get_error_json_response()
+
+
+async def get_wallet_repository(request: Request) -> AsyncWalletRepository:
     return request.app.state.wallets  # type: ignore
 
 
-WalletRepositoryDependable = Annotated[WalletRepository, Depends(get_wallet_repository)]
+WalletRepositoryDependable = Annotated[
+    AsyncWalletRepository, Depends(get_wallet_repository)
+]
 
 
-def get_transaction_repository(request: Request) -> TransactionRepository:
+async def get_transaction_repository(request: Request) -> AsyncTransactionRepository:
     return request.app.state.transactions  # type: ignore
 
 
 TransactionRepositoryDependable = Annotated[
-    TransactionRepository, Depends(get_transaction_repository)
+    AsyncTransactionRepository, Depends(get_transaction_repository)
 ]
 
 
-def get_statistic_repository(request: Request) -> StatisticRepository:
+async def get_statistic_repository(request: Request) -> AsyncStatisticRepository:
     return request.app.state.statistics  # type: ignore
 
 
 StatisticRepositoryDependable = Annotated[
-    StatisticRepository, Depends(get_statistic_repository)
+    AsyncStatisticRepository, Depends(get_statistic_repository)
 ]
 
 
-def get_converter(request: Request) -> CryptoExchangeRate:
+async def get_converter(request: Request) -> AsyncCryptoExchangeRate:
     return request.app.state.converter  # type: ignore
 
 
-ConverterDependable = Annotated[CryptoExchangeRate, Depends(get_converter)]
+ConverterDependable = Annotated[AsyncCryptoExchangeRate, Depends(get_converter)]
@@ -1,8 +1,23 @@
-from fastapi import APIRouter
+from datetime import datetime
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from core.errors import ErrorMessageEnvelope, InvalidApiKeyError
+from core.btc_to_usd_converter import AsyncCryptoExchangeRate
+from core.errors import (
+    ErrorMessageEnvelope,
+    ExchangeRateUnavailableError,
+    InvalidApiKeyError,
+)
+from core.statistic import (
+    AsyncStatisticRepository,
+    Granularity,
+    Statistic,
+    StatisticBucket,
+)
+from core.wallet import to_btc
 from infra.fastapi.dependables import (
     ApiKey,
     ConverterDependable,
@@ -18,31 +33,122 @@ class StatisticItem(BaseModel):
     profit_usd: float
 
 
+class StatisticBucketItem(BaseModel):
+    start: datetime
+    total_transactions: int
+    profit_btc: float
+    profit_usd: float
+
+
 class StatisticEnvelope(BaseModel):
     statistic: StatisticItem
+    buckets: list[StatisticBucketItem] | None = None
+
+
+RangeStart = Annotated[datetime | None, Query(alias="from")]
+RangeEnd = Annotated[datetime | None, Query(alias="to")]
+
+
+async def get_statistic_envelope(
+    statistic: Statistic,
+    converter: AsyncCryptoExchangeRate,
+    buckets: list[StatisticBucket] | None = None,
+) -> dict[str, Any]:
+    rate = await converter.get_rate()
+    profit_btc = to_btc(statistic.profit)
+    envelope: dict[str, Any] = {
+        "statistic": {
+            "total_transactions": statistic.total_transactions,
+            "profit_btc": profit_btc,
+            "profit_usd": profit_btc * rate,
+        }
+    }
+    if buckets is not None:
+        envelope["buckets"] = [
+            {
+                "start": bucket.start,
+                "total_transactions": bucket.total_transactions,
+                "profit_btc": to_btc(bucket.profit),
+                "profit_usd": to_btc(bucket.profit) * rate,
+            }
+            for bucket in buckets
+        ]
+    return envelope
+
+
+async def get_ranged_statistic(
+    statistics: AsyncStatisticRepository,
+    api_key: str,
+    granularity: Granularity,
+    start: datetime | None,
+    end: datetime | None,
+) -> tuple[Statistic, list[StatisticBucket]]:
+    buckets = await statistics.get_statistic_buckets(api_key, granularity, start, end)
+    statistic = Statistic(
+        sum(bucket.total_transactions for bucket in buckets),
+        sum(bucket.profit for bucket in buckets),
+    )
+    return statistic, buckets
 
 
 @statistics_api.get(
     "/statistics",
     status_code=200,
     response_model=StatisticEnvelope,
-    responses={401: {"model": ErrorMessageEnvelope}},
+    response_model_exclude_none=True,
+    responses={
+        401: {"model": ErrorMessageEnvelope},
+        503: {"model": ErrorMessageEnvelope},
+    },
 )
-def get_statistics(
+async def get_statistics(
     api_key: ApiKey,
     statistics: StatisticRepositoryDependable,
     converter: ConverterDependable,
-) -> JSONResponse | dict[str, dict[str, str | float]]:
+    start: RangeStart = None,
+    end: RangeEnd = None,
+    granularity: Granularity | None = None,
+) -> JSONResponse | dict[str, Any]:
     try:
-        statistic = statistics.get_statistic(api_key)
-        profit_btc = statistic.profit
-        profit_usd = profit_btc * converter.get_rate()
-        return {
-            "statistic": {
-                "total_transactions": statistic.total_transactions,
-                "profit_btc": profit_btc,
-                "profit_usd": profit_usd,
-            }
-        }
+        if start is None and end is None and granularity is None:
+            statistic = await statistics.get_statistic(api_key)
+            return await get_statistic_envelope(statistic, converter)
+
+        statistic, buckets = await get_ranged_statistic(
+            statistics,
+            api_key,
+            granularity or Granularity.HOUR,
+            start,
+            end,
+        )
+        if granularity is None:
+            return await get_statistic_envelope(statistic, converter)
+        return await get_statistic_envelope(statistic, converter, buckets)
+    except InvalidApiKeyError as e:
+        return e.get_error_json_response()
+    except ExchangeRateUnavailableError as e:
+        return e.get_error_json_response()
+
+
+@statistics_api.post(
+    "/statistics/recompute",
+    status_code=200,
+    response_model=StatisticEnvelope,
+    response_model_exclude_none=True,
+    responses={
+        401: {"model": ErrorMessageEnvelope},
+        503: {"model": ErrorMessageEnvelope},
+    },
+)
+async def recompute_statistics(
+    api_key: ApiKey,
+    statistics: StatisticRepositoryDependable,
+    converter: ConverterDependable,
+) -> JSONResponse | dict[str, Any]:
+    try:
+        statistic = await statistics.recompute_statistic(api_key)
+        return await get_statistic_envelope(statistic, converter)
     except InvalidApiKeyError as e:
         return e.get_error_json_response()
+    except ExchangeRateUnavailableError as e:
+        return e.get_error_json_response()
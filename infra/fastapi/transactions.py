@@ -1,42 +1,124 @@
+from datetime import datetime
+from typing import Annotated, Any, AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
 from core.errors import (
     ErrorMessageEnvelope,
-    InvalidApiKeyError,
+    ErrorMessageResponse,
     NotEnoughBitcoinError,
     TransactionBetweenSameWalletError,
     WalletDoesNotExistError,
     WalletPermissionError,
 )
-from core.transaction import Transaction
-from infra.fastapi.dependables import ApiKey, TransactionRepositoryDependable
+from core.transaction import Transaction, Transfer, TransferError
+from core.wallet import to_btc, to_satoshis
+from infra.constants import (
+    MAX_BITCOIN_SUPPLY,
+    TRANSACTIONS_BATCH_LIMIT,
+    TRANSACTIONS_PAGE_LIMIT,
+    TRANSACTIONS_PAGE_SIZE,
+)
+from infra.fastapi.dependables import TransactionRepositoryDependable, UserDependable
 
 transactions_api = APIRouter(tags=["Transactions"])
 
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+PageLimit = Annotated[int, Query(ge=1, le=TRANSACTIONS_PAGE_LIMIT)]
+PageCursor = Annotated[int, Query(ge=0)]
+
+
 class TransactionItem(BaseModel):
+    id: int
     from_address: UUID
     to_address: UUID
     transaction_amount: float
     transaction_fee: float
+    created_at: datetime
 
 
 class MakeTransactionItem(BaseModel):
     from_address: UUID
     to_address: UUID
-    transaction_amount: float
+    transaction_amount: float = Field(gt=0, le=MAX_BITCOIN_SUPPLY)
+
+
+class MakeTransactionsBatchItem(BaseModel):
+    transactions: list[MakeTransactionItem] = Field(
+        min_length=1, max_length=TRANSACTIONS_BATCH_LIMIT
+    )
+    atomic: bool = True
 
 
 class TransactionItemEnvelope(BaseModel):
     transaction: TransactionItem
 
 
+class TransactionResultItem(BaseModel):
+    status_code: int
+    transaction: TransactionItem | None = None
+    error: ErrorMessageResponse | None = None
+
+
+class TransactionsBatchEnvelope(BaseModel):
+    results: list[TransactionResultItem]
+
+
 class TransactionsListEnvelope(BaseModel):
     transactions: list[TransactionItem]
+    next_cursor: int | None = None
+
+
+def to_transaction_item(transaction: Transaction) -> TransactionItem:
+    return TransactionItem(
+        id=transaction.id,
+        from_address=transaction.from_address,
+        to_address=transaction.to_address,
+        transaction_amount=to_btc(transaction.transaction_amount),
+        transaction_fee=to_btc(transaction.transaction_fee),
+        created_at=transaction.created_at,
+    )
+
+
+def to_transaction_result_item(
+    result: Transaction | TransferError,
+) -> TransactionResultItem:
+    if isinstance(result, Transaction):
+        return TransactionResultItem(
+            status_code=201, transaction=to_transaction_item(result)
+        )
+    return TransactionResultItem(
+        status_code=result.status_code,
+        error=ErrorMessageResponse(message=result.message),
+    )
+
+
+def get_transactions_page(
+    transactions: list[Transaction], limit: int
+) -> dict[str, Any]:
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = transactions[-1].id
+    return {
+        "transactions": [to_transaction_item(item) for item in transactions],
+        "next_cursor": next_cursor,
+    }
+
+
+def stream_transactions(
+    transactions: AsyncIterator[Transaction],
+) -> StreamingResponse:
+    lines = (
+        to_transaction_item(transaction).model_dump_json() + "\n"
+        async for transaction in transactions
+    )
+    return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
 
 
 @transactions_api.post(
@@ -51,14 +133,19 @@ class TransactionsListEnvelope(BaseModel):
         409: {"model": ErrorMessageEnvelope},
     },
 )
-def make_transaction(
-    api_key: ApiKey,
+async def make_transaction(
+    user: UserDependable,
     request: MakeTransactionItem,
     transactions: TransactionRepositoryDependable,
-) -> dict[str, Transaction] | JSONResponse:
+) -> dict[str, TransactionItem] | JSONResponse:
     try:
-        transaction = transactions.make_transaction(api_key, **request.model_dump())
-        return {"transaction": transaction}
+        transaction = await transactions.make_transaction(
+            user,
+            request.from_address,
+            request.to_address,
+            to_satoshis(request.transaction_amount),
+        )
+        return {"transaction": to_transaction_item(transaction)}
     except NotEnoughBitcoinError as e:
         return e.get_error_json_response()
     except TransactionBetweenSameWalletError as e:
@@ -67,8 +154,39 @@ def make_transaction(
         return e.get_error_json_response()
     except WalletDoesNotExistError as e:
         return e.get_error_json_response()
-    except InvalidApiKeyError as e:
-        return e.get_error_json_response()
+
+
+@transactions_api.post(
+    "/transactions/batch",
+    status_code=201,
+    response_model=TransactionsBatchEnvelope,
+    response_model_exclude_none=True,
+    responses={
+        401: {"model": ErrorMessageEnvelope},
+        409: {"model": TransactionsBatchEnvelope},
+    },
+)
+async def make_transactions(
+    user: UserDependable,
+    request: MakeTransactionsBatchItem,
+    response: Response,
+    transactions: TransactionRepositoryDependable,
+) -> dict[str, list[TransactionResultItem]]:
+    results = await transactions.make_transactions(
+        user,
+        [
+            Transfer(
+                item.from_address,
+                item.to_address,
+                to_satoshis(item.transaction_amount),
+            )
+            for item in request.transactions
+        ],
+        request.atomic,
+    )
+    if request.atomic and not isinstance(results[0], Transaction):
+        response.status_code = 409
+    return {"results": [to_transaction_result_item(result) for result in results]}
 
 
 @transactions_api.get(
@@ -77,10 +195,26 @@ def make_transaction(
     response_model=TransactionsListEnvelope,
     responses={401: {"model": ErrorMessageEnvelope}},
 )
-def read_all_transactions(
-    api_key: ApiKey, transactions: TransactionRepositoryDependable
-) -> dict[str, list[Transaction]] | JSONResponse:
-    try:
-        return {"transactions": transactions.read_all(api_key)}
-    except InvalidApiKeyError as e:
-        return e.get_error_json_response()
+async def read_all_transactions(
+    user: UserDependable,
+    transactions: TransactionRepositoryDependable,
+    limit: PageLimit = TRANSACTIONS_PAGE_SIZE,
+    after: PageCursor = 0,
+) -> dict[str, Any]:
+    page = await transactions.read_all(user, after, limit + 1)
+    return get_transactions_page(page, limit)
+
+
+@transactions_api.get(
+    "/transactions/stream",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {NDJSON_MEDIA_TYPE: {}}},
+        401: {"model": ErrorMessageEnvelope},
+    },
+)
+async def stream_all_transactions(
+    user: UserDependable, transactions: TransactionRepositoryDependable
+) -> StreamingResponse:
+    return stream_transactions(await transactions.iter_all(user))
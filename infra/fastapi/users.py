@@ -31,11 +31,11 @@ class UserItemEnvelope(BaseModel):
     response_model=UserItemEnvelope,
     responses={409: {"model": ErrorMessageEnvelope}},
 )
-def register_user(
+async def register_user(
     request: UserRequest, users: UserRepositoryDependable
 ) -> dict[str, User] | JSONResponse:
     email = request.email
     try:
-        return {"user": users.create(email)}
+        return {"user": await users.create(email)}
     except EmailAlreadyExistError as e:
         return e.get_error_json_response()
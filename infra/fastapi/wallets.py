@@ -1,25 +1,33 @@
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from core.errors import (
     ErrorMessageEnvelope,
-    InvalidApiKeyError,
+    ExchangeRateUnavailableError,
     WalletDoesNotExistError,
     WalletPermissionError,
     WalletsLimitError,
 )
-from core.transaction import Transaction
-from core.wallet import Wallet
+from core.wallet import Wallet, to_btc
+from infra.constants import TRANSACTIONS_PAGE_SIZE, WALLETS_LIMIT
 from infra.fastapi.dependables import (
-    ApiKey,
     ConverterDependable,
     TransactionRepositoryDependable,
+    UserDependable,
     WalletRepositoryDependable,
 )
-from infra.fastapi.transactions import TransactionsListEnvelope
+from infra.fastapi.transactions import (
+    NDJSON_MEDIA_TYPE,
+    PageCursor,
+    PageLimit,
+    TransactionsListEnvelope,
+    get_transactions_page,
+    stream_transactions,
+)
 
 wallets_api = APIRouter(tags=["Wallets"])
 
@@ -38,6 +46,20 @@ class WalletListEnvelope(BaseModel):
     wallets: list[WalletItem]
 
 
+WalletAddresses = Annotated[
+    list[UUID] | None, Query(alias="address", max_length=WALLETS_LIMIT)
+]
+
+
+def to_wallet_item(wallet: Wallet, rate: float) -> dict[str, float | UUID]:
+    balance_btc = to_btc(wallet.balance)
+    return {
+        "address": wallet.address,
+        "balance_btc": balance_btc,
+        "balance_usd": balance_btc * rate,
+    }
+
+
 @wallets_api.post(
     "/wallets",
     status_code=201,
@@ -45,25 +67,53 @@ class WalletListEnvelope(BaseModel):
     responses={
         401: {"model": ErrorMessageEnvelope},
         409: {"model": ErrorMessageEnvelope},
+        503: {"model": ErrorMessageEnvelope},
     },
 )
-def create_wallet(
-    api_key: ApiKey, wallets: WalletRepositoryDependable, converter: ConverterDependable
+async def create_wallet(
+    user: UserDependable,
+    wallets: WalletRepositoryDependable,
+    converter: ConverterDependable,
 ) -> dict[str, dict[str, float | UUID]] | JSONResponse:
     try:
-        wallet: Wallet = wallets.create(api_key)
-        balance_usd = wallet.balance * converter.get_rate()
-        return {
-            "wallet": {
-                "address": wallet.address,
-                "balance_btc": wallet.balance,
-                "balance_usd": balance_usd,
-            }
-        }
-    except InvalidApiKeyError as e:
-        return e.get_error_json_response()
+        wallet = await wallets.create(user)
+        return {"wallet": to_wallet_item(wallet, await converter.get_rate())}
     except WalletsLimitError as e:
         return e.get_error_json_response()
+    except ExchangeRateUnavailableError as e:
+        return e.get_error_json_response()
+
+
+@wallets_api.get(
+    "/wallets",
+    status_code=200,
+    response_model=WalletListEnvelope,
+    responses={
+        401: {"model": ErrorMessageEnvelope},
+        403: {"model": ErrorMessageEnvelope},
+        404: {"model": ErrorMessageEnvelope},
+        503: {"model": ErrorMessageEnvelope},
+    },
+)
+async def read_wallets(
+    user: UserDependable,
+    wallets: WalletRepositoryDependable,
+    converter: ConverterDependable,
+    addresses: WalletAddresses = None,
+) -> dict[str, list[dict[str, float | UUID]]] | JSONResponse:
+    try:
+        if addresses is None:
+            user_wallets = await wallets.read_all(user)
+        else:
+            user_wallets = await wallets.read_many(addresses, user)
+        rate = await converter.get_rate()
+        return {"wallets": [to_wallet_item(wallet, rate) for wallet in user_wallets]}
+    except WalletDoesNotExistError as e:
+        return e.get_error_json_response()
+    except WalletPermissionError as e:
+        return e.get_error_json_response()
+    except ExchangeRateUnavailableError as e:
+        return e.get_error_json_response()
 
 
 @wallets_api.get(
@@ -74,30 +124,24 @@ def create_wallet(
         401: {"model": ErrorMessageEnvelope},
         403: {"model": ErrorMessageEnvelope},
         404: {"model": ErrorMessageEnvelope},
+        503: {"model": ErrorMessageEnvelope},
     },
 )
-def read_wallet(
+async def read_wallet(
     address: UUID,
-    api_key: ApiKey,
+    user: UserDependable,
     wallets: WalletRepositoryDependable,
     converter: ConverterDependable,
 ) -> dict[str, dict[str, float | UUID]] | JSONResponse:
     try:
-        wallet: Wallet = wallets.read(address, api_key)
-        balance_usd = wallet.balance * converter.get_rate()
-        return {
-            "wallet": {
-                "address": wallet.address,
-                "balance_btc": wallet.balance,
-                "balance_usd": balance_usd,
-            }
-        }
-    except InvalidApiKeyError as e:
-        return e.get_error_json_response()
+        wallet = await wallets.read(address, user)
+        return {"wallet": to_wallet_item(wallet, await converter.get_rate())}
     except WalletDoesNotExistError as e:
         return e.get_error_json_response()
     except WalletPermissionError as e:
         return e.get_error_json_response()
+    except ExchangeRateUnavailableError as e:
+        return e.get_error_json_response()
 
 
 @wallets_api.get(
@@ -110,14 +154,42 @@ def read_wallet(
         404: {"model": ErrorMessageEnvelope},
     },
 )
-def get_wallet_transactions(
-    address: UUID, api_key: ApiKey, transactions: TransactionRepositoryDependable
-) -> dict[str, list[Transaction]] | JSONResponse:
+async def get_wallet_transactions(
+    address: UUID,
+    user: UserDependable,
+    transactions: TransactionRepositoryDependable,
+    limit: PageLimit = TRANSACTIONS_PAGE_SIZE,
+    after: PageCursor = 0,
+) -> dict[str, Any] | JSONResponse:
     try:
-        wallet_transactions = transactions.get_wallet_transactions(api_key, address)
-        return {"transactions": wallet_transactions}
-    except InvalidApiKeyError as e:
+        wallet_transactions = await transactions.get_wallet_transactions(
+            user, address, after, limit + 1
+        )
+        return get_transactions_page(wallet_transactions, limit)
+    except WalletDoesNotExistError as e:
+        return e.get_error_json_response()
+    except WalletPermissionError as e:
         return e.get_error_json_response()
+
+
+@wallets_api.get(
+    "/wallets/{address}/transactions/stream",
+    status_code=200,
+    response_class=StreamingResponse,
+    response_model=None,
+    responses={
+        200: {"content": {NDJSON_MEDIA_TYPE: {}}},
+        401: {"model": ErrorMessageEnvelope},
+        403: {"model": ErrorMessageEnvelope},
+        404: {"model": ErrorMessageEnvelope},
+    },
+)
+async def stream_wallet_transactions(
+    address: UUID, user: UserDependable, transactions: TransactionRepositoryDependable
+) -> StreamingResponse | JSONResponse:
+    try:
+        wallet_transactions = await transactions.iter_wallet_transactions(user, address)
+        return stream_transactions(wallet_transactions)
     except WalletDoesNotExistError as e:
         return e.get_error_json_response()
     except WalletPermissionError as e:
@@ -0,0 +1,26 @@
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Iterator
+from uuid import UUID
+
+from infra.constants import WALLET_LOCK_STRIPES
+
+
+@dataclass
+class StripedLocks:
+    stripes: int = WALLET_LOCK_STRIPES
+    locks: list[Lock] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.locks = [Lock() for _ in range(self.stripes)]
+
+    def stripe(self, address: UUID) -> int:
+        return address.int % self.stripes
+
+    @contextmanager
+    def acquire(self, *addresses: UUID) -> Iterator[None]:
+        with ExitStack() as stack:
+            for stripe in sorted({self.stripe(address) for address in addresses}):
+                stack.enter_context(self.locks[stripe])
+            yield
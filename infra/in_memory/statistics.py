@@ -1,10 +1,26 @@
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import dataclass, replace
+from datetime import datetime
 
 from core.errors import InvalidApiKeyError
-from core.statistic import Statistic
+from core.statistic import (
+    BucketRange,
+    Granularity,
+    Statistic,
+    StatisticBucket,
+    bucket_start,
+    next_bucket_start,
+    split_bucket_range,
+)
+from core.transaction import Transaction
 from infra.constants import ADMIN_API_KEY
 from infra.in_memory.transactions import TransactionsInMemory
 
+FINER_GRANULARITY = {
+    Granularity.MONTH: Granularity.DAY,
+    Granularity.DAY: Granularity.HOUR,
+}
+
 
 @dataclass
 class StatisticsInMemory:
@@ -12,8 +28,111 @@ class StatisticsInMemory:
 
     def get_statistic(self, admin_api_key: str) -> Statistic:
         if admin_api_key == ADMIN_API_KEY:
-            profit = sum(tr.transaction_fee for tr in self.transactions.transactions)
-            statistics = Statistic(len(self.transactions.transactions), profit)
+            with self.transactions.ledger_lock:
+                statistics = Statistic(
+                    self.transactions.total_transactions, self.transactions.profit
+                )
             return statistics
         else:
             raise InvalidApiKeyError(admin_api_key)
+
+    def get_statistic_buckets(
+        self,
+        admin_api_key: str,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatisticBucket]:
+        if admin_api_key == ADMIN_API_KEY:
+            buckets: list[StatisticBucket] = []
+            with self.transactions.ledger_lock:
+                for part in split_bucket_range(granularity, start, end):
+                    if part.rolled_up:
+                        buckets.extend(self._read_rollups(granularity, part))
+                    elif part.start is not None and part.end is not None:
+                        bucket = self._sum_edge(granularity, part.start, part.end)
+                        if bucket.total_transactions > 0:
+                            buckets.append(bucket)
+            return buckets
+        else:
+            raise InvalidApiKeyError(admin_api_key)
+
+    def recompute_statistic(self, admin_api_key: str) -> Statistic:
+        if admin_api_key == ADMIN_API_KEY:
+            with self.transactions.ledger_lock:
+                transactions = self.transactions.transactions
+                self.transactions.total_transactions = len(transactions)
+                self.transactions.profit = sum(
+                    tr.transaction_fee for tr in transactions
+                )
+                self.transactions.rollups = {}
+                self.transactions.timeline = []
+                for transaction in transactions:
+                    self.transactions.roll_up(transaction)
+            return self.get_statistic(admin_api_key)
+        else:
+            raise InvalidApiKeyError(admin_api_key)
+
+    def _read_rollups(
+        self, granularity: Granularity, part: BucketRange
+    ) -> list[StatisticBucket]:
+        buckets = self.transactions.rollups.get(granularity, {})
+        return sorted(
+            (
+                replace(bucket)
+                for bucket in buckets.values()
+                if self._in_range(bucket.start, part)
+            ),
+            key=lambda bucket: bucket.start,
+        )
+
+    def _sum_edge(
+        self, granularity: Granularity, start: datetime, end: datetime
+    ) -> StatisticBucket:
+        edge_start = bucket_start(start, granularity)
+        finer = FINER_GRANULARITY.get(granularity)
+        if finer is None:
+            transactions = self._read_timeline(start, end)
+            return StatisticBucket(
+                edge_start,
+                len(transactions),
+                sum(transaction.transaction_fee for transaction in transactions),
+            )
+
+        buckets: list[StatisticBucket] = []
+        for part in split_bucket_range(finer, start, end):
+            if part.start is None or part.end is None:
+                continue
+            if part.rolled_up:
+                buckets.extend(self._read_rollup_steps(finer, part.start, part.end))
+            else:
+                buckets.append(self._sum_edge(finer, part.start, part.end))
+        return StatisticBucket(
+            edge_start,
+            sum(bucket.total_transactions for bucket in buckets),
+            sum(bucket.profit for bucket in buckets),
+        )
+
+    def _read_rollup_steps(
+        self, granularity: Granularity, start: datetime, end: datetime
+    ) -> list[StatisticBucket]:
+        buckets = self.transactions.rollups.get(granularity, {})
+        found = []
+        while start < end:
+            bucket = buckets.get(start)
+            if bucket is not None:
+                found.append(bucket)
+            start = next_bucket_start(start, granularity)
+        return found
+
+    def _read_timeline(self, start: datetime, end: datetime) -> list[Transaction]:
+        timeline = self.transactions.timeline
+        first = bisect_left(timeline, start, key=lambda t: t.created_at)
+        last = bisect_left(timeline, end, key=lambda t: t.created_at)
+        return timeline[first:last]
+
+    @staticmethod
+    def _in_range(moment: datetime, part: BucketRange) -> bool:
+        return (part.start is None or moment >= part.start) and (
+            part.end is None or moment < part.end
+        )
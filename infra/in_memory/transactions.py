@@ -1,49 +1,129 @@
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Lock
+from typing import Iterator
 from uuid import UUID
 
-from core.transaction import Transaction, TransactionRepository
-from infra.in_memory.users import UsersInMemory
+from core.statistic import Granularity, StatisticBucket, bucket_start
+from core.transaction import (
+    Transaction,
+    TransactionRepository,
+    Transfer,
+    TransferError,
+)
+from core.user import User
+from infra.in_memory.locks import StripedLocks
 from infra.in_memory.wallets import WalletsInMemory
 
 
 @dataclass
 class TransactionsInMemory(TransactionRepository):
-    users: UsersInMemory
     wallets: WalletsInMemory
     transactions: list[Transaction] = field(default_factory=list)
+    positions_by_address: dict[UUID, list[int]] = field(default_factory=dict)
+    positions_by_user: dict[UUID, list[int]] = field(default_factory=dict)
+    total_transactions: int = 0
+    profit: int = 0
+    rollups: dict[Granularity, dict[datetime, StatisticBucket]] = field(
+        default_factory=dict
+    )
+    timeline: list[Transaction] = field(default_factory=list)
+    locks: StripedLocks = field(default_factory=StripedLocks, repr=False)
+    ledger_lock: Lock = field(default_factory=Lock, repr=False)
 
     def make_transaction(
         self,
-        from_api_key: str,
+        user: User,
         from_address: UUID,
         to_address: UUID,
-        transaction_amount: float,
+        transaction_amount: int,
     ) -> Transaction:
-        transaction = self._prepare_transaction(
-            from_api_key, from_address, to_address, transaction_amount, self.wallets
-        )
-        self.transactions.append(transaction)
+        with self.locks.acquire(from_address, to_address):
+            transaction = self._prepare_transaction(
+                user, from_address, to_address, transaction_amount, self.wallets
+            )
+            self._record(transaction, user)
         return transaction
 
-    def read_all(self, api_key: str) -> list[Transaction]:
-        user = self.users.try_authorization(api_key)
+    def make_transactions(
+        self, user: User, transfers: list[Transfer], atomic: bool = True
+    ) -> list[Transaction | TransferError]:
+        addresses = [
+            address
+            for transfer in transfers
+            for address in (transfer.from_address, transfer.to_address)
+        ]
+        with self.locks.acquire(*addresses):
+            results, overlay = self._prepare_transactions(
+                user, transfers, atomic, self.wallets
+            )
+            for address, balance in overlay.balances.items():
+                self.wallets.update_balance(address, balance)
+            for result in results:
+                if isinstance(result, Transaction):
+                    self._record(result, user)
+        return results
 
-        transactions = []
-        for transaction in self.transactions:
-            from_wallet = self.wallets.read(transaction.from_address, api_key, False)
-            to_wallet = self.wallets.read(transaction.to_address, api_key, False)
-            if from_wallet.user_id == user.id or to_wallet.user_id == user.id:
-                transactions.append(transaction)
+    def _record(self, transaction: Transaction, user: User) -> None:
+        with self.ledger_lock:
+            position = len(self.transactions)
+            transaction.id = position + 1
+            self.transactions.append(transaction)
+            self._index(position, transaction, user)
+            self.total_transactions += 1
+            self.profit += transaction.transaction_fee
+            self.roll_up(transaction)
 
-        return transactions
+    def roll_up(self, transaction: Transaction) -> None:
+        insort(self.timeline, transaction, key=lambda t: t.created_at)
+        for granularity in Granularity:
+            start = bucket_start(transaction.created_at, granularity)
+            buckets = self.rollups.setdefault(granularity, {})
+            bucket = buckets.setdefault(start, StatisticBucket(start, 0, 0))
+            bucket.total_transactions += 1
+            bucket.profit += transaction.transaction_fee
 
-    def get_wallet_transactions(self, api_key: str, address: UUID) -> list[Transaction]:
-        self.users.try_authorization(api_key)
-        self.wallets.read(address, api_key, True)
+    def read_all(
+        self, user: User, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        positions = self.positions_by_user.get(user.id, [])
+        return self._read_positions(positions, after, limit)
 
-        transactions = []
-        for transaction in self.transactions:
-            if transaction.from_address == address or transaction.to_address == address:
-                transactions.append(transaction)
+    def get_wallet_transactions(
+        self, user: User, address: UUID, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        self.wallets.read(address, user, True)
 
-        return transactions
+        positions = self.positions_by_address.get(address, [])
+        return self._read_positions(positions, after, limit)
+
+    def iter_all(self, user: User) -> Iterator[Transaction]:
+        positions = self.positions_by_user.get(user.id, [])
+        return (self.transactions[position] for position in positions)
+
+    def iter_wallet_transactions(
+        self, user: User, address: UUID
+    ) -> Iterator[Transaction]:
+        self.wallets.read(address, user, True)
+
+        positions = self.positions_by_address.get(address, [])
+        return (self.transactions[position] for position in positions)
+
+    def _index(self, position: int, transaction: Transaction, user: User) -> None:
+        addresses = [transaction.from_address, transaction.to_address]
+        user_ids = {
+            self.wallets.read(address, user, False).user_id for address in addresses
+        }
+
+        for address in addresses:
+            self.positions_by_address.setdefault(address, []).append(position)
+        for user_id in user_ids:
+            self.positions_by_user.setdefault(user_id, []).append(position)
+
+    def _read_positions(
+        self, positions: list[int], after: int, limit: int | None
+    ) -> list[Transaction]:
+        start = bisect_left(positions, after)
+        end = None if limit is None else start + limit
+        return [self.transactions[position] for position in positions[start:end]]
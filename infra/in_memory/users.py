@@ -8,18 +8,21 @@ from core.user import User
 @dataclass
 class UsersInMemory:
     users: dict[UUID, User] = field(default_factory=dict)
+    users_by_api_key: dict[str, User] = field(default_factory=dict)
+    user_ids_by_email: dict[str, UUID] = field(default_factory=dict)
 
     def create(self, email: str) -> User:
-        for user_id, user in self.users.items():
-            if user.email == email:
-                raise EmailAlreadyExistError(email)
+        if email in self.user_ids_by_email:
+            raise EmailAlreadyExistError(email)
 
         user = User(email)
         self.users[user.id] = user
+        self.users_by_api_key[user.api_key] = user
+        self.user_ids_by_email[user.email] = user.id
         return user
 
     def try_authorization(self, api_key: str) -> User:
-        for user in self.users.values():
-            if user.api_key == api_key:
-                return user
-        raise InvalidApiKeyError(api_key)
+        try:
+            return self.users_by_api_key[api_key]
+        except KeyError:
+            raise InvalidApiKeyError(api_key)
@@ -6,37 +6,27 @@ from core.errors import (
     WalletPermissionError,
     WalletsLimitError,
 )
+from core.user import User
 from core.wallet import Wallet
 from infra.constants import WALLETS_LIMIT
-from infra.in_memory.users import UsersInMemory
 
 
 @dataclass
 class WalletsInMemory:
-    users: UsersInMemory
     wallets: dict[UUID, Wallet] = field(default_factory=dict)
+    addresses_by_user: dict[UUID, list[UUID]] = field(default_factory=dict)
 
-    def create(self, api_key: str) -> Wallet:
-        user = self.users.try_authorization(api_key)
+    def create(self, user: User) -> Wallet:
+        addresses = self.addresses_by_user.setdefault(user.id, [])
+        if len(addresses) >= WALLETS_LIMIT:
+            raise WalletsLimitError(user.api_key)
 
         wallet = Wallet(user.id)
-
-        users_wallets_num = 0
-        for curr_wallet in self.wallets.values():
-            if curr_wallet.user_id == user.id:
-                users_wallets_num += 1
-
-        if users_wallets_num < WALLETS_LIMIT:
-            self.wallets[wallet.address] = wallet
-        else:
-            raise WalletsLimitError(api_key)
-
+        self.wallets[wallet.address] = wallet
+        addresses.append(wallet.address)
         return wallet
 
-    def read(
-        self, address: UUID, api_key: str, check_permission: bool = True
-    ) -> Wallet:
-        user = self.users.try_authorization(api_key)
+    def read(self, address: UUID, user: User, check_permission: bool = True) -> Wallet:
         try:
             wallet = self.wallets[address]
             if check_permission and wallet.user_id != user.id:
@@ -45,15 +35,14 @@ class WalletsInMemory:
         except KeyError:
             raise WalletDoesNotExistError(address)
 
-    def update_balance(self, address: UUID, new_balance: float) -> None:
+    def read_many(self, addresses: list[UUID], user: User) -> list[Wallet]:
+        return [self.read(address, user) for address in dict.fromkeys(addresses)]
+
+    def update_balance(self, address: UUID, new_balance: int) -> None:
         wallet = self.wallets[address]
         wallet.balance = new_balance
         self.wallets[address] = wallet
 
-    def read_all(self, api_key: str) -> list[Wallet]:
-        user = self.users.try_authorization(api_key)
-        wallets = []
-        for wallet in self.wallets.values():
-            if wallet.user_id == user.id:
-                wallets.append(wallet)
-        return wallets
+    def read_all(self, user: User) -> list[Wallet]:
+        addresses = self.addresses_by_user.get(user.id, [])
+        return [self.wallets[address] for address in addresses]
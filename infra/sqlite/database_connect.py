@@ -1,31 +1,121 @@
 import sqlite3
-from dataclasses import dataclass
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from sqlite3 import Connection, Cursor
+from typing import Iterator
+from uuid import uuid4
 
 from infra.constants import SQL_FILE_TEST
 
 
+@dataclass(frozen=True)
+class SqliteProfile:
+    journal_mode: str = "DELETE"
+    synchronous: str = "FULL"
+    cache_size: int = -2000
+    mmap_size: int = 0
+    temp_store: str = "DEFAULT"
+    busy_timeout: int = 5000
+
+    def pragmas(self) -> list[str]:
+        return [f"PRAGMA {name} = {value}" for name, value in asdict(self).items()]
+
+
+SQLITE_PROFILES = {
+    "default": SqliteProfile(),
+    "wal": SqliteProfile(journal_mode="WAL"),
+    "performance": SqliteProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-64000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+    ),
+}
+
+
 @dataclass
 class Database:
     database_name: str
     sql_file: str = SQL_FILE_TEST
+    profile: SqliteProfile = field(default_factory=SqliteProfile)
 
     def __post_init__(self) -> None:
-        self.con = sqlite3.connect(self.database_name, check_same_thread=False)
-        self.con.execute("PRAGMA foreign_keys = 1")
-        self.cur = self.con.cursor()
+        self.uri = self.database_name == ":memory:"
+        if self.uri:
+            self.database_name = f"file:{uuid4().hex}?mode=memory&cache=shared"
+        self.local = threading.local()
+        self.connections: list[Connection] = []
+        self.connections_lock = threading.Lock()
+        self.get_connection()
 
     def initial(self) -> None:
         with open(self.sql_file, "r") as sql_file:
             sql = sql_file.read()
-        self.cur.executescript(sql)
-        self.con.commit()
+        self.get_cursor().executescript(sql)
 
     def close_database(self) -> None:
-        self.con.close()
+        with self.connections_lock:
+            for con in self.connections:
+                con.close()
+            self.connections.clear()
+        self.local = threading.local()
 
     def get_connection(self) -> Connection:
-        return self.con
+        con: Connection | None = getattr(self.local, "con", None)
+        if con is None:
+            con = self._connect()
+            self.local.con = con
+            self.local.cur = con.cursor()
+            self.local.depth = 0
+        return con
+
+    @contextmanager
+    def transaction(self) -> Iterator[Cursor]:
+        cur = self.get_cursor()
+        if self.local.depth > 0:
+            savepoint = f"LEVEL_{self.local.depth}"
+            cur.execute(f"SAVEPOINT {savepoint}")
+            self.local.depth += 1
+            try:
+                yield cur
+                cur.execute(f"RELEASE {savepoint}")
+            except BaseException:
+                cur.execute(f"ROLLBACK TO {savepoint}")
+                cur.execute(f"RELEASE {savepoint}")
+                raise
+            finally:
+                self.local.depth -= 1
+            return
+
+        cur.execute("BEGIN IMMEDIATE")
+        self.local.depth = 1
+        try:
+            yield cur
+            cur.execute("COMMIT")
+        except BaseException:
+            if self.get_connection().in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+        finally:
+            self.local.depth = 0
 
     def get_cursor(self) -> Cursor:
-        return self.cur
+        self.get_connection()
+        cur: Cursor = self.local.cur
+        return cur
+
+    def _connect(self) -> Connection:
+        con = sqlite3.connect(
+            self.database_name,
+            check_same_thread=False,
+            isolation_level=None,
+            uri=self.uri,
+        )
+        con.execute("PRAGMA foreign_keys = 1")
+        for pragma in self.profile.pragmas():
+            con.execute(pragma)
+        with self.connections_lock:
+            self.connections.append(con)
+        return con
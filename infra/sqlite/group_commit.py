@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from typing import Any, Callable, Iterator, TypeVar
+from uuid import UUID
+
+from core.transaction import (
+    Transaction,
+    TransactionRepository,
+    Transfer,
+    TransferError,
+)
+from core.user import User
+from infra.constants import GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_WINDOW_SECONDS
+from infra.sqlite.transactions import TransactionsDataBase
+
+T = TypeVar("T")
+
+
+@dataclass
+class PendingWrite:
+    write: Callable[[], Any]
+    future: Future[Any]
+
+
+@dataclass
+class GroupCommitTransactions(TransactionRepository):
+    transactions: TransactionsDataBase
+    window_seconds: float = GROUP_COMMIT_WINDOW_SECONDS
+    max_batch: int = GROUP_COMMIT_MAX_BATCH
+    commits: int = 0
+    queue: Queue[PendingWrite | None] = field(default_factory=Queue, repr=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        self.closed = False
+        self.writer = threading.Thread(target=self._run, daemon=True)
+        self.writer.start()
+
+    def make_transaction(
+        self,
+        user: User,
+        from_address: UUID,
+        to_address: UUID,
+        transaction_amount: int,
+    ) -> Transaction:
+        return self._submit(
+            lambda: self.transactions.make_transaction(
+                user, from_address, to_address, transaction_amount
+            )
+        )
+
+    def make_transactions(
+        self, user: User, transfers: list[Transfer], atomic: bool = True
+    ) -> list[Transaction | TransferError]:
+        return self._submit(
+            lambda: self.transactions.make_transactions(user, transfers, atomic)
+        )
+
+    def read_all(
+        self, user: User, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        return self.transactions.read_all(user, after, limit)
+
+    def get_wallet_transactions(
+        self, user: User, address: UUID, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        return self.transactions.get_wallet_transactions(user, address, after, limit)
+
+    def iter_all(self, user: User) -> Iterator[Transaction]:
+        return self.transactions.iter_all(user)
+
+    def iter_wallet_transactions(
+        self, user: User, address: UUID
+    ) -> Iterator[Transaction]:
+        return self.transactions.iter_wallet_transactions(user, address)
+
+    def close(self) -> None:
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.queue.put(None)
+        self.writer.join()
+
+    def _submit(self, write: Callable[[], T]) -> T:
+        future: Future[T] = Future()
+        with self.lock:
+            queued = not self.closed
+            if queued:
+                self.queue.put(PendingWrite(write, future))
+        return future.result() if queued else write()
+
+    def _run(self) -> None:
+        while (pending := self.queue.get()) is not None:
+            batch = [pending]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch:
+                try:
+                    pending = self.queue.get(
+                        timeout=max(deadline - time.monotonic(), 0)
+                    )
+                except Empty:
+                    break
+                if pending is None:
+                    self._commit(batch)
+                    return
+                batch.append(pending)
+            self._commit(batch)
+
+    def _commit(self, batch: list[PendingWrite]) -> None:
+        results: list[tuple[PendingWrite, Any, BaseException | None]] = []
+        try:
+            with self.transactions.db.transaction():
+                for pending in batch:
+                    try:
+                        results.append((pending, pending.write(), None))
+                    except Exception as e:
+                        results.append((pending, None, e))
+        except BaseException as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+
+        self.commits += 1
+        for pending, result, error in results:
+            if error is None:
+                pending.future.set_result(result)
+            else:
+                pending.future.set_exception(error)
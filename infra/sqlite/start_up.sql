@@ -1,6 +1,8 @@
 DROP TABLE IF EXISTS USERS;
 DROP TABLE IF EXISTS WALLETS;
 DROP TABLE IF EXISTS TRANSACTIONS;
+DROP TABLE IF EXISTS STATISTICS;
+DROP TABLE IF EXISTS STATISTICS_ROLLUPS;
 
 CREATE TABLE USERS
 (
@@ -13,7 +15,7 @@ CREATE TABLE WALLETS
 (
     ADDRESS UUID PRIMARY KEY  NOT NULL,
     USER_ID UUID              NOT NULL,
-    BALANCE FLOAT DEFAULT 1.0 NOT NULL,
+    BALANCE INTEGER DEFAULT 100000000 NOT NULL,
     FOREIGN KEY (USER_ID) REFERENCES USERS (ID) ON DELETE CASCADE
 );
 
@@ -22,9 +24,74 @@ CREATE TABLE TRANSACTIONS
     ID           INTEGER PRIMARY KEY AUTOINCREMENT,
     FROM_ADDRESS TEXT NOT NULL,
     TO_ADDRESS   TEXT NOT NULL,
-    AMOUNT       FLOAT       NOT NULL,
-    FEE          FLOAT       NOT NULL,
+    AMOUNT       INTEGER     NOT NULL,
+    FEE          INTEGER     NOT NULL,
+    CREATED_AT   INTEGER     NOT NULL,
     FOREIGN KEY (FROM_ADDRESS) REFERENCES WALLETS (ADDRESS) ON DELETE CASCADE,
     FOREIGN KEY (TO_ADDRESS) REFERENCES WALLETS (ADDRESS) ON DELETE CASCADE
 );
 
+CREATE INDEX IDX_WALLETS_USER_ID ON WALLETS (USER_ID);
+
+CREATE INDEX IDX_TRANSACTIONS_FROM_ADDRESS ON TRANSACTIONS (FROM_ADDRESS, ID);
+
+CREATE INDEX IDX_TRANSACTIONS_TO_ADDRESS ON TRANSACTIONS (TO_ADDRESS, ID);
+
+CREATE INDEX IDX_TRANSACTIONS_CREATED_AT ON TRANSACTIONS (CREATED_AT);
+
+
+CREATE TABLE STATISTICS
+(
+    ID                 INTEGER PRIMARY KEY CHECK (ID = 1),
+    TOTAL_TRANSACTIONS INTEGER DEFAULT 0 NOT NULL,
+    PROFIT             INTEGER DEFAULT 0 NOT NULL
+);
+
+INSERT INTO STATISTICS (ID) VALUES (1);
+
+CREATE TABLE STATISTICS_ROLLUPS
+(
+    GRANULARITY        TEXT    NOT NULL,
+    BUCKET             INTEGER NOT NULL,
+    TOTAL_TRANSACTIONS INTEGER NOT NULL,
+    PROFIT             INTEGER NOT NULL,
+    PRIMARY KEY (GRANULARITY, BUCKET)
+) WITHOUT ROWID;
+
+CREATE TRIGGER TRG_TRANSACTIONS_INSERT_STATISTICS
+    AFTER INSERT
+    ON TRANSACTIONS
+BEGIN
+    UPDATE STATISTICS
+    SET TOTAL_TRANSACTIONS = TOTAL_TRANSACTIONS + 1,
+        PROFIT             = PROFIT + NEW.FEE
+    WHERE ID = 1;
+
+    INSERT INTO STATISTICS_ROLLUPS (GRANULARITY, BUCKET, TOTAL_TRANSACTIONS, PROFIT)
+    VALUES ('hour', NEW.CREATED_AT - NEW.CREATED_AT % 3600, 1, NEW.FEE),
+           ('day', NEW.CREATED_AT - NEW.CREATED_AT % 86400, 1, NEW.FEE),
+           ('month',
+            CAST(STRFTIME('%s', NEW.CREATED_AT, 'unixepoch', 'start of month') AS INTEGER),
+            1, NEW.FEE)
+    ON CONFLICT (GRANULARITY, BUCKET) DO UPDATE
+        SET TOTAL_TRANSACTIONS = TOTAL_TRANSACTIONS + 1,
+            PROFIT             = PROFIT + EXCLUDED.PROFIT;
+END;
+
+CREATE TRIGGER TRG_TRANSACTIONS_DELETE_STATISTICS
+    AFTER DELETE
+    ON TRANSACTIONS
+BEGIN
+    UPDATE STATISTICS
+    SET TOTAL_TRANSACTIONS = TOTAL_TRANSACTIONS - 1,
+        PROFIT             = PROFIT - OLD.FEE
+    WHERE ID = 1;
+
+    UPDATE STATISTICS_ROLLUPS
+    SET TOTAL_TRANSACTIONS = TOTAL_TRANSACTIONS - 1,
+        PROFIT             = PROFIT - OLD.FEE
+    WHERE (GRANULARITY = 'hour' AND BUCKET = OLD.CREATED_AT - OLD.CREATED_AT % 3600)
+       OR (GRANULARITY = 'day' AND BUCKET = OLD.CREATED_AT - OLD.CREATED_AT % 86400)
+       OR (GRANULARITY = 'month' AND BUCKET =
+           CAST(STRFTIME('%s', OLD.CREATED_AT, 'unixepoch', 'start of month') AS INTEGER));
+END;
@@ -1,27 +1,142 @@
 from dataclasses import dataclass
-from sqlite3 import Connection, Cursor
+from datetime import datetime, timezone
 
 from core.errors import InvalidApiKeyError
-from core.statistic import Statistic
+from core.statistic import (
+    BucketRange,
+    Granularity,
+    Statistic,
+    StatisticBucket,
+    split_bucket_range,
+)
 from infra.constants import ADMIN_API_KEY
+from infra.sqlite.database_connect import Database
 from infra.sqlite.transactions import TransactionsDataBase
 
+BUCKET_SQL = {
+    Granularity.HOUR: "CREATED_AT - CREATED_AT % 3600",
+    Granularity.DAY: "CREATED_AT - CREATED_AT % 86400",
+    Granularity.MONTH: "CAST(STRFTIME('%s', CREATED_AT, 'unixepoch', 'start of month') "
+    "AS INTEGER)",
+}
+
 
 @dataclass
 class StatisticsDatabase:
-    con: Connection
-    cur: Cursor
+    db: Database
     transactions: TransactionsDataBase
 
     def get_statistic(self, admin_api_key: str) -> Statistic:
         if admin_api_key == ADMIN_API_KEY:
-            profit = self.cur.execute("SELECT SUM(FEE) FROM TRANSACTIONS").fetchone()[0]
-            if profit is None:
-                profit = 0.0
-            total_transactions = self.cur.execute(
-                "SELECT COUNT() FROM TRANSACTIONS"
-            ).fetchone()[0]
+            total_transactions, profit = (
+                self.db.get_cursor()
+                .execute(
+                    "SELECT TOTAL_TRANSACTIONS, PROFIT FROM STATISTICS WHERE ID = 1"
+                )
+                .fetchone()
+            )
             statistics = Statistic(total_transactions, profit)
             return statistics
         else:
             raise InvalidApiKeyError(admin_api_key)
+
+    def get_statistic_buckets(
+        self,
+        admin_api_key: str,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatisticBucket]:
+        if admin_api_key == ADMIN_API_KEY:
+            buckets: list[StatisticBucket] = []
+            for part in split_bucket_range(granularity, start, end):
+                if part.rolled_up:
+                    buckets.extend(self._read_rollups(granularity, part))
+                else:
+                    buckets.extend(self._aggregate_transactions(granularity, part))
+            return [bucket for bucket in buckets if bucket.total_transactions > 0]
+        else:
+            raise InvalidApiKeyError(admin_api_key)
+
+    def recompute_statistic(self, admin_api_key: str) -> Statistic:
+        if admin_api_key == ADMIN_API_KEY:
+            with self.db.transaction() as cur:
+                total_transactions, profit = cur.execute(
+                    "SELECT COUNT(), COALESCE(SUM(FEE), 0) FROM TRANSACTIONS"
+                ).fetchone()
+                cur.execute(
+                    "UPDATE STATISTICS SET TOTAL_TRANSACTIONS = ?, PROFIT = ? "
+                    "WHERE ID = 1",
+                    (total_transactions, profit),
+                )
+                cur.execute("DELETE FROM STATISTICS_ROLLUPS")
+                for granularity, bucket in BUCKET_SQL.items():
+                    cur.execute(
+                        f"""
+                        INSERT INTO STATISTICS_ROLLUPS
+                            (GRANULARITY, BUCKET, TOTAL_TRANSACTIONS, PROFIT)
+                        SELECT ?, {bucket} AS BUCKET, COUNT(), SUM(FEE)
+                        FROM TRANSACTIONS
+                        GROUP BY BUCKET
+                        """,
+                        (granularity.value,),
+                    )
+            statistics = Statistic(total_transactions, profit)
+            return statistics
+        else:
+            raise InvalidApiKeyError(admin_api_key)
+
+    def _read_rollups(
+        self, granularity: Granularity, part: BucketRange
+    ) -> list[StatisticBucket]:
+        conditions, parameters = self._range_conditions("BUCKET", part)
+        return self._read_buckets(
+            f"""
+            SELECT BUCKET, TOTAL_TRANSACTIONS, PROFIT FROM STATISTICS_ROLLUPS
+            WHERE {" AND ".join(["GRANULARITY = ?", *conditions])}
+            ORDER BY BUCKET
+            """,
+            [granularity.value, *parameters],
+        )
+
+    def _aggregate_transactions(
+        self, granularity: Granularity, part: BucketRange
+    ) -> list[StatisticBucket]:
+        conditions, parameters = self._range_conditions("CREATED_AT", part)
+        return self._read_buckets(
+            f"""
+            SELECT {BUCKET_SQL[granularity]} AS BUCKET, COUNT(), SUM(FEE)
+            FROM TRANSACTIONS
+            WHERE {" AND ".join(conditions)}
+            GROUP BY BUCKET
+            ORDER BY BUCKET
+            """,
+            parameters,
+        )
+
+    def _read_buckets(
+        self, sql: str, parameters: list[str | int]
+    ) -> list[StatisticBucket]:
+        result = self.db.get_cursor().execute(sql, parameters).fetchall()
+        return [
+            StatisticBucket(
+                datetime.fromtimestamp(bucket, timezone.utc),
+                total_transactions,
+                profit,
+            )
+            for bucket, total_transactions, profit in result
+        ]
+
+    @staticmethod
+    def _range_conditions(
+        column: str, part: BucketRange
+    ) -> tuple[list[str], list[str | int]]:
+        conditions: list[str] = []
+        parameters: list[str | int] = []
+        if part.start is not None:
+            conditions.append(f"{column} >= ?")
+            parameters.append(int(part.start.timestamp()))
+        if part.end is not None:
+            conditions.append(f"{column} < ?")
+            parameters.append(int(part.end.timestamp()))
+        return conditions, parameters
@@ -1,70 +1,170 @@
 from dataclasses import dataclass
-from sqlite3 import Connection, Cursor
+from datetime import datetime, timezone
+from typing import Any, Iterator
 from uuid import UUID
 
-from core.transaction import Transaction, TransactionRepository
-from infra.sqlite.users import UsersDatabase
+from core.errors import (
+    NotEnoughBitcoinError,
+    TransactionBetweenSameWalletError,
+    WalletDoesNotExistError,
+)
+from core.transaction import (
+    Transaction,
+    TransactionRepository,
+    Transfer,
+    TransferError,
+    get_transaction_fee,
+)
+from core.user import User
+from infra.constants import TRANSACTIONS_STREAM_BATCH_SIZE
+from infra.sqlite.database_connect import Database
 from infra.sqlite.wallets import WalletsDatabase
 
+READ_ALL_SQL = """
+    SELECT * FROM TRANSACTIONS
+    WHERE (
+        FROM_ADDRESS IN (SELECT CAST(ADDRESS AS TEXT) FROM WALLETS WHERE USER_ID = ?)
+        OR TO_ADDRESS IN (SELECT CAST(ADDRESS AS TEXT) FROM WALLETS WHERE USER_ID = ?)
+    )
+    AND ID > ?
+    ORDER BY ID
+    LIMIT ?
+"""
+READ_WALLET_SQL = """
+    SELECT * FROM TRANSACTIONS
+    WHERE (FROM_ADDRESS = ? OR TO_ADDRESS = ?) AND ID > ?
+    ORDER BY ID
+    LIMIT ?
+"""
+INSERT_SQL = """
+    INSERT INTO TRANSACTIONS (FROM_ADDRESS, TO_ADDRESS, AMOUNT, FEE, CREATED_AT)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
 
 @dataclass
 class TransactionsDataBase(TransactionRepository):
-    con: Connection
-    cur: Cursor
+    db: Database
     wallets: WalletsDatabase
-    users: UsersDatabase
 
     def make_transaction(
         self,
-        from_api_key: str,
+        user: User,
         from_address: UUID,
         to_address: UUID,
-        transaction_amount: float,
+        transaction_amount: int,
     ) -> Transaction:
-        transaction = self._prepare_transaction(
-            from_api_key, from_address, to_address, transaction_amount, self.wallets
+        if from_address == to_address:
+            raise TransactionBetweenSameWalletError()
+
+        with self.db.transaction() as cur:
+            if not self.wallets.withdraw(from_address, user, transaction_amount):
+                self.wallets.read(from_address, user)
+                self.wallets.read(to_address, user, False)
+                raise NotEnoughBitcoinError(from_address)
+
+            fee = self.wallets.deposit(
+                to_address,
+                user,
+                transaction_amount,
+                get_transaction_fee(transaction_amount),
+            )
+            if fee is None:
+                raise WalletDoesNotExistError(to_address)
+
+            transaction = Transaction(from_address, to_address, transaction_amount, fee)
+            cur.execute(INSERT_SQL + "RETURNING ID", self._to_row(transaction))
+            transaction.id = cur.fetchone()[0]
+
+        return transaction
+
+    def make_transactions(
+        self, user: User, transfers: list[Transfer], atomic: bool = True
+    ) -> list[Transaction | TransferError]:
+        with self.db.transaction() as cur:
+            results, overlay = self._prepare_transactions(
+                user, transfers, atomic, self.wallets
+            )
+            made = [result for result in results if isinstance(result, Transaction)]
+            if not made:
+                return results
+
+            cur.executemany(
+                "UPDATE WALLETS SET BALANCE = BALANCE + ? WHERE ADDRESS = ?",
+                [
+                    (balance - overlay.cache[address].balance, str(address))
+                    for address, balance in overlay.balances.items()
+                ],
+            )
+            cur.executemany(INSERT_SQL, [self._to_row(t) for t in made])
+            last_id = cur.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        for transaction_id, transaction in enumerate(made, last_id - len(made) + 1):
+            transaction.id = transaction_id
+        return results
+
+    def read_all(
+        self, user: User, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        return self._read_transactions(
+            READ_ALL_SQL,
+            [str(user.id), str(user.id), after, -1 if limit is None else limit],
         )
-        self.cur.execute(
-            """
-                    INSERT INTO TRANSACTIONS (FROM_ADDRESS, TO_ADDRESS, AMOUNT, FEE)
-                    VALUES (?, ?, ?, ?);
-                """,
-            (
-                str(from_address),
-                str(to_address),
-                transaction.transaction_amount,
-                transaction.transaction_fee,
-            ),
+
+    def get_wallet_transactions(
+        self, user: User, address: UUID, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        self.wallets.read(address, user, True)
+        return self._read_transactions(
+            READ_WALLET_SQL,
+            [str(address), str(address), after, -1 if limit is None else limit],
         )
-        self.con.commit()
-        return transaction
 
-    def read_all(self, api_key: str) -> list[Transaction]:
-        self.users.try_authorization(api_key)
-        wallets = self.wallets.read_all(api_key)
-        transactions = []
-        for wallet in wallets:
-            self.cur.execute(
-                "SELECT * FROM TRANSACTIONS WHERE (FROM_ADDRESS = ? OR TO_ADDRESS = ?)",
-                [str(wallet.address), str(wallet.address)],
+    def iter_all(self, user: User) -> Iterator[Transaction]:
+        return self._iter_transactions(READ_ALL_SQL, [str(user.id), str(user.id)])
+
+    def iter_wallet_transactions(
+        self, user: User, address: UUID
+    ) -> Iterator[Transaction]:
+        self.wallets.read(address, user, True)
+        return self._iter_transactions(READ_WALLET_SQL, [str(address), str(address)])
+
+    def _read_transactions(
+        self, sql: str, parameters: list[str | int]
+    ) -> list[Transaction]:
+        result = self.db.get_cursor().execute(sql, parameters).fetchall()
+        return [self._to_transaction(row) for row in result]
+
+    def _iter_transactions(
+        self, sql: str, parameters: list[str | int]
+    ) -> Iterator[Transaction]:
+        after = 0
+        while True:
+            chunk = self._read_transactions(
+                sql, [*parameters, after, TRANSACTIONS_STREAM_BATCH_SIZE]
             )
-            result = self.cur.fetchall()
-            for row in result:
-                transaction = Transaction(UUID(row[1]), UUID(row[2]), row[3], row[4])
-                transactions.append(transaction)
-        return transactions
-
-    def get_wallet_transactions(self, api_key: str, address: UUID) -> list[Transaction]:
-        self.users.try_authorization(api_key)
-        self.wallets.read(address, api_key, True)
-        self.cur.execute(
-            "SELECT * FROM TRANSACTIONS WHERE (FROM_ADDRESS = ? OR TO_ADDRESS = ?)",
-            [str(address), str(address)],
+            yield from chunk
+            if len(chunk) < TRANSACTIONS_STREAM_BATCH_SIZE:
+                return
+            after = chunk[-1].id
+
+    @staticmethod
+    def _to_row(transaction: Transaction) -> tuple[str, str, int, int, int]:
+        return (
+            str(transaction.from_address),
+            str(transaction.to_address),
+            transaction.transaction_amount,
+            transaction.transaction_fee,
+            int(transaction.created_at.timestamp()),
         )
-        result = self.cur.fetchall()
 
-        transactions = []
-        for row in result:
-            transaction = Transaction(UUID(row[1]), UUID(row[2]), row[3], row[4])
-            transactions.append(transaction)
-        return transactions
+    @staticmethod
+    def _to_transaction(row: tuple[Any, ...]) -> Transaction:
+        return Transaction(
+            UUID(row[1]),
+            UUID(row[2]),
+            row[3],
+            row[4],
+            row[0],
+            datetime.fromtimestamp(row[5], timezone.utc),
+        )
@@ -1,5 +1,4 @@
 from dataclasses import dataclass
-from sqlite3 import Connection, Cursor
 from uuid import UUID
 
 from core.errors import (
@@ -7,45 +6,38 @@ from core.errors import (
     WalletPermissionError,
     WalletsLimitError,
 )
+from core.user import User
 from core.wallet import Wallet
 from infra.constants import WALLETS_LIMIT
-from infra.sqlite.users import UsersDatabase
+from infra.sqlite.database_connect import Database
 
 
 @dataclass
 class WalletsDatabase:
-    con: Connection
-    cur: Cursor
-    users: UsersDatabase
-
-    def create(self, api_key: str) -> Wallet:
-        user = self.users.try_authorization(api_key)
+    db: Database
 
+    def create(self, user: User) -> Wallet:
         wallet = Wallet(user.id)
 
-        self.cur.execute(
-            "SELECT USER_ID FROM WALLETS WHERE USER_ID = ?", [str(user.id)]
-        )
-        result = self.cur.fetchall()
-        if len(result) >= WALLETS_LIMIT:
-            raise WalletsLimitError(api_key)
-        self.cur.execute(
-            "INSERT INTO WALLETS (ADDRESS, USER_ID, BALANCE) VALUES (?, ?, ?)",
-            [str(wallet.address), str(wallet.user_id), wallet.get_balance()],
-        )
+        with self.db.transaction() as cur:
+            cur.execute("SELECT USER_ID FROM WALLETS WHERE USER_ID = ?", [str(user.id)])
+            result = cur.fetchall()
+            if len(result) >= WALLETS_LIMIT:
+                raise WalletsLimitError(user.api_key)
+            cur.execute(
+                "INSERT INTO WALLETS (ADDRESS, USER_ID, BALANCE) VALUES (?, ?, ?)",
+                [str(wallet.address), str(wallet.user_id), wallet.balance],
+            )
 
-        self.con.commit()
         return wallet
 
-    def read(
-        self, address: UUID, api_key: str, check_permission: bool = True
-    ) -> Wallet:
-        user = self.users.try_authorization(api_key)
-        self.cur.execute(
+    def read(self, address: UUID, user: User, check_permission: bool = True) -> Wallet:
+        cur = self.db.get_cursor()
+        cur.execute(
             "SELECT USER_ID, ADDRESS, BALANCE FROM WALLETS WHERE ADDRESS = ?",
             [str(address)],
         )
-        result = self.cur.fetchone()
+        result = cur.fetchone()
         if result is None:
             raise WalletDoesNotExistError(address)
 
@@ -55,20 +47,67 @@ class WalletsDatabase:
 
         return wallet
 
-    def update_balance(self, address: UUID, new_balance: float) -> None:
-        self.cur.execute(
+    def read_many(self, addresses: list[UUID], user: User) -> list[Wallet]:
+        requested = list(dict.fromkeys(addresses))
+        cur = self.db.get_cursor()
+        cur.execute(
+            "SELECT USER_ID, ADDRESS, BALANCE FROM WALLETS WHERE ADDRESS IN "
+            f"({', '.join('?' for _ in requested)})",
+            [str(address) for address in requested],
+        )
+        found = {
+            UUID(row[1]): Wallet(UUID(row[0]), UUID(row[1]), row[2])
+            for row in cur.fetchall()
+        }
+
+        wallets = []
+        for address in requested:
+            wallet = found.get(address)
+            if wallet is None:
+                raise WalletDoesNotExistError(address)
+            if wallet.user_id != user.id:
+                raise WalletPermissionError(address)
+            wallets.append(wallet)
+        return wallets
+
+    def update_balance(self, address: UUID, new_balance: int) -> None:
+        self.db.get_cursor().execute(
             "UPDATE WALLETS SET BALANCE = ? WHERE ADDRESS = ?",
             [new_balance, str(address)],
         )
-        self.con.commit()
 
-    def read_all(self, api_key: str) -> list[Wallet]:
-        user = self.users.try_authorization(api_key)
-        self.cur.execute("SELECT * FROM WALLETS WHERE USER_ID = ?", [str(user.id)])
+    def withdraw(self, address: UUID, user: User, amount: int) -> bool:
+        cur = self.db.get_cursor()
+        cur.execute(
+            """
+                UPDATE WALLETS SET BALANCE = BALANCE - ?
+                WHERE ADDRESS = ? AND USER_ID = ? AND BALANCE >= ?
+            """,
+            [amount, str(address), str(user.id), amount],
+        )
+        return cur.rowcount == 1
+
+    def deposit(self, address: UUID, user: User, amount: int, fee: int) -> int | None:
+        cur = self.db.get_cursor()
+        cur.execute(
+            """
+                UPDATE WALLETS
+                SET BALANCE = BALANCE + ? - CASE WHEN USER_ID = ? THEN 0 ELSE ? END
+                WHERE ADDRESS = ?
+                RETURNING CASE WHEN USER_ID = ? THEN 0 ELSE ? END
+            """,
+            [amount, str(user.id), fee, str(address), str(user.id), fee],
+        )
+        result = cur.fetchone()
+        return None if result is None else int(result[0])
+
+    def read_all(self, user: User) -> list[Wallet]:
+        cur = self.db.get_cursor()
+        cur.execute("SELECT * FROM WALLETS WHERE USER_ID = ?", [str(user.id)])
         wallets = []
-        result = self.cur.fetchall()
+        result = cur.fetchall()
         for wallet in result:
             if str(wallet[1]) == str(user.id):
-                w = Wallet(UUID(wallet[1]), UUID(wallet[0]), float(wallet[2]))
+                w = Wallet(UUID(wallet[1]), UUID(wallet[0]), wallet[2])
                 wallets.append(w)
         return wallets
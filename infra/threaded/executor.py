@@ -0,0 +1,12 @@
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+async def run_in_executor(executor: Executor, call: Callable[..., T], *args: Any) -> T:
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, partial(call, *args)
+    )
@@ -0,0 +1,43 @@
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime
+
+from core.statistic import (
+    Granularity,
+    Statistic,
+    StatisticBucket,
+    StatisticRepository,
+)
+from infra.threaded.executor import run_in_executor
+
+
+@dataclass
+class ThreadedStatistics:
+    statistics: StatisticRepository
+    executor: Executor
+
+    async def get_statistic(self, admin_api_key: str) -> Statistic:
+        return await run_in_executor(
+            self.executor, self.statistics.get_statistic, admin_api_key
+        )
+
+    async def get_statistic_buckets(
+        self,
+        admin_api_key: str,
+        granularity: Granularity,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[StatisticBucket]:
+        return await run_in_executor(
+            self.executor,
+            self.statistics.get_statistic_buckets,
+            admin_api_key,
+            granularity,
+            start,
+            end,
+        )
+
+    async def recompute_statistic(self, admin_api_key: str) -> Statistic:
+        return await run_in_executor(
+            self.executor, self.statistics.recompute_statistic, admin_api_key
+        )
@@ -0,0 +1,90 @@
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from itertools import islice
+from typing import AsyncIterator, Iterator
+from uuid import UUID
+
+from core.transaction import (
+    Transaction,
+    TransactionRepository,
+    Transfer,
+    TransferError,
+)
+from core.user import User
+from infra.constants import TRANSACTIONS_STREAM_BATCH_SIZE
+from infra.threaded.executor import run_in_executor
+
+
+@dataclass
+class ThreadedTransactions:
+    transactions: TransactionRepository
+    executor: Executor
+
+    async def make_transaction(
+        self,
+        user: User,
+        from_address: UUID,
+        to_address: UUID,
+        transaction_amount: int,
+    ) -> Transaction:
+        return await run_in_executor(
+            self.executor,
+            self.transactions.make_transaction,
+            user,
+            from_address,
+            to_address,
+            transaction_amount,
+        )
+
+    async def make_transactions(
+        self, user: User, transfers: list[Transfer], atomic: bool = True
+    ) -> list[Transaction | TransferError]:
+        return await run_in_executor(
+            self.executor, self.transactions.make_transactions, user, transfers, atomic
+        )
+
+    async def read_all(
+        self, user: User, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        return await run_in_executor(
+            self.executor, self.transactions.read_all, user, after, limit
+        )
+
+    async def get_wallet_transactions(
+        self, user: User, address: UUID, after: int = 0, limit: int | None = None
+    ) -> list[Transaction]:
+        return await run_in_executor(
+            self.executor,
+            self.transactions.get_wallet_transactions,
+            user,
+            address,
+            after,
+            limit,
+        )
+
+    async def iter_all(self, user: User) -> AsyncIterator[Transaction]:
+        transactions = await run_in_executor(
+            self.executor, self.transactions.iter_all, user
+        )
+        return self._stream(transactions)
+
+    async def iter_wallet_transactions(
+        self, user: User, address: UUID
+    ) -> AsyncIterator[Transaction]:
+        transactions = await run_in_executor(
+            self.executor, self.transactions.iter_wallet_transactions, user, address
+        )
+        return self._stream(transactions)
+
+    async def _stream(
+        self, transactions: Iterator[Transaction]
+    ) -> AsyncIterator[Transaction]:
+        while batch := await run_in_executor(
+            self.executor, self._next_batch, transactions
+        ):
+            for transaction in batch:
+                yield transaction
+
+    @staticmethod
+    def _next_batch(transactions: Iterator[Transaction]) -> list[Transaction]:
+        return list(islice(transactions, TRANSACTIONS_STREAM_BATCH_SIZE))
@@ -0,0 +1,19 @@
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+from core.user import User, UserRepository
+from infra.threaded.executor import run_in_executor
+
+
+@dataclass
+class ThreadedUsers:
+    users: UserRepository
+    executor: Executor
+
+    async def create(self, email: str) -> User:
+        return await run_in_executor(self.executor, self.users.create, email)
+
+    async def try_authorization(self, api_key: str) -> User:
+        return await run_in_executor(
+            self.executor, self.users.try_authorization, api_key
+        )
@@ -0,0 +1,36 @@
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from uuid import UUID
+
+from core.user import User
+from core.wallet import Wallet, WalletRepository
+from infra.threaded.executor import run_in_executor
+
+
+@dataclass
+class ThreadedWallets:
+    wallets: WalletRepository
+    executor: Executor
+
+    async def create(self, user: User) -> Wallet:
+        return await run_in_executor(self.executor, self.wallets.create, user)
+
+    async def read(
+        self, address: UUID, user: User, check_permission: bool = True
+    ) -> Wallet:
+        return await run_in_executor(
+            self.executor, self.wallets.read, address, user, check_permission
+        )
+
+    async def read_many(self, addresses: list[UUID], user: User) -> list[Wallet]:
+        return await run_in_executor(
+            self.executor, self.wallets.read_many, addresses, user
+        )
+
+    async def update_balance(self, address: UUID, new_balance: int) -> None:
+        await run_in_executor(
+            self.executor, self.wallets.update_balance, address, new_balance
+        )
+
+    async def read_all(self, user: User) -> list[Wallet]:
+        return await run_in_executor(self.executor, self.wallets.read_all, user)
@@ -1,16 +1,53 @@
 from __future__ import annotations
 
+from enum import Enum
+
 import uvicorn
 from dotenv import load_dotenv
-from typer import Typer
+from typer import Option, Typer
 
+from infra.constants import BENCHMARK_OPERATIONS, BENCHMARK_SCALES
+from infra.sqlite.database_connect import SQLITE_PROFILES
 from runner.setup import init_app
 
 cli = Typer(no_args_is_help=True, add_completion=False)
 
 
+class BenchmarkBackend(str, Enum):
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+BenchmarkSqliteProfile = Enum(  # type: ignore[misc]
+    "BenchmarkSqliteProfile", {name: name for name in SQLITE_PROFILES}, type=str
+)
+
+
 @cli.command()
 def run(host: str = "127.0.0.1", port: int = 8000) -> None:
     load_dotenv()
 
     uvicorn.run(host=host, port=port, app=init_app())
+
+
+@cli.command()
+def benchmark(
+    scale: list[int] = Option(BENCHMARK_SCALES, help="Number of seeded users."),
+    backend: list[BenchmarkBackend] = Option(
+        list(BenchmarkBackend), help="Repository backends to benchmark."
+    ),
+    operations: int = Option(BENCHMARK_OPERATIONS, help="Calls per operation."),
+    sqlite_profile: BenchmarkSqliteProfile = Option(
+        BenchmarkSqliteProfile("default"), help="SQLite pragma profile."
+    ),
+    seed: int = Option(0, help="Faker and random seed."),
+) -> None:
+    from benchmarks.repositories import run_benchmarks
+
+    run_benchmarks(
+        scale,
+        [name.value for name in backend],
+        operations,
+        SQLITE_PROFILES[sqlite_profile.value],
+        seed,
+    )
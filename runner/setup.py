@@ -1,9 +1,36 @@
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import FastAPI
 
-from core.btc_to_usd_converter import APICryptoExchangeRate, FakeCryptoExchangeRate
-from infra.constants import DATABASE_NAME, SQL_FILE
+from core.btc_to_usd_converter import (
+    APICryptoExchangeRate,
+    AsyncAPICryptoExchangeRate,
+    CachedCryptoExchangeRate,
+    ExchangeRateProvider,
+    FakeCryptoExchangeRate,
+    HedgedCryptoExchangeRate,
+    ThreadedCryptoExchangeRate,
+)
+from core.errors import InvalidApiKeyError
+from core.statistic import StatisticRepository
+from core.transaction import TransactionRepository
+from core.user import UserRepository
+from core.wallet import WalletRepository
+from infra.cache.users import CachedUsers
+from infra.constants import (
+    DATABASE_NAME,
+    EXCHANGE_RATE_PROVIDERS,
+    EXCHANGE_RATE_TTL_SECONDS,
+    GROUP_COMMIT_MAX_BATCH,
+    GROUP_COMMIT_WINDOW_SECONDS,
+    REPOSITORY_EXECUTOR_WORKERS,
+    SQL_FILE,
+    USERS_CACHE_SIZE,
+    USERS_CACHE_TTL_SECONDS,
+)
+from infra.fastapi.dependables import handle_invalid_api_key
 from infra.fastapi.statistics import statistics_api
 from infra.fastapi.transactions import transactions_api
 from infra.fastapi.users import users_api
@@ -12,11 +39,16 @@ from infra.in_memory.statistics import StatisticsInMemory
 from infra.in_memory.transactions import TransactionsInMemory
 from infra.in_memory.users import UsersInMemory
 from infra.in_memory.wallets import WalletsInMemory
-from infra.sqlite.database_connect import Database
+from infra.sqlite.database_connect import SQLITE_PROFILES, Database
+from infra.sqlite.group_commit import GroupCommitTransactions
 from infra.sqlite.statistics import StatisticsDatabase
 from infra.sqlite.transactions import TransactionsDataBase
 from infra.sqlite.users import UsersDatabase
 from infra.sqlite.wallets import WalletsDatabase
+from infra.threaded.statistics import ThreadedStatistics
+from infra.threaded.transactions import ThreadedTransactions
+from infra.threaded.users import ThreadedUsers
+from infra.threaded.wallets import ThreadedWallets
 
 
 def init_app() -> FastAPI:
@@ -25,31 +57,87 @@ def init_app() -> FastAPI:
     app.include_router(wallets_api)
     app.include_router(transactions_api)
     app.include_router(statistics_api)
+    app.exception_handler(InvalidApiKeyError)(handle_invalid_api_key)
 
+    users: UserRepository
+    wallets: WalletRepository
+    transactions: TransactionRepository
+    statistics: StatisticRepository
     if os.getenv("WALLET_REPOSITORY_KIND", "memory") == "sqlite":
-        db = Database(DATABASE_NAME, os.path.abspath(SQL_FILE))
+        db = Database(
+            DATABASE_NAME,
+            os.path.abspath(SQL_FILE),
+            SQLITE_PROFILES[os.getenv("SQLITE_PROFILE", "default")],
+        )
         # db.initial()    # Uncomment this if you want to create initial db
-        app.state.users = UsersDatabase(db.get_connection(), db.get_cursor())
-        app.state.wallets = WalletsDatabase(
-            db.get_connection(), db.get_cursor(), app.state.users
+        users = CachedUsers(
+            UsersDatabase(db),
+            int(os.getenv("USERS_CACHE_SIZE", USERS_CACHE_SIZE)),
+            float(os.getenv("USERS_CACHE_TTL_SECONDS", USERS_CACHE_TTL_SECONDS)),
         )
-        app.state.transactions = TransactionsDataBase(
-            db.get_connection(), db.get_cursor(), app.state.wallets, app.state.users
+        wallets_database = WalletsDatabase(db)
+        transactions_database = TransactionsDataBase(db, wallets_database)
+        wallets = wallets_database
+        transactions = transactions_database
+        if os.getenv("SQLITE_GROUP_COMMIT", "off") == "on":
+            group_commit = GroupCommitTransactions(
+                transactions_database,
+                float(
+                    os.getenv(
+                        "GROUP_COMMIT_WINDOW_SECONDS", GROUP_COMMIT_WINDOW_SECONDS
+                    )
+                ),
+                int(os.getenv("GROUP_COMMIT_MAX_BATCH", GROUP_COMMIT_MAX_BATCH)),
+            )
+            app.router.on_shutdown.append(group_commit.close)
+            transactions = group_commit
+        statistics = StatisticsDatabase(db, transactions_database)
+    else:
+        wallets_in_memory = WalletsInMemory()
+        transactions_in_memory = TransactionsInMemory(wallets_in_memory)
+        users = UsersInMemory()
+        wallets = wallets_in_memory
+        transactions = transactions_in_memory
+        statistics = StatisticsInMemory(transactions_in_memory)
+
+    executor = ThreadPoolExecutor(
+        int(os.getenv("REPOSITORY_EXECUTOR_WORKERS", REPOSITORY_EXECUTOR_WORKERS))
+    )
+    app.router.on_shutdown.append(executor.shutdown)
+    app.state.users = ThreadedUsers(users, executor)
+    app.state.wallets = ThreadedWallets(wallets, executor)
+    app.state.transactions = ThreadedTransactions(transactions, executor)
+    app.state.statistics = ThreadedStatistics(statistics, executor)
+
+    converter_kind = os.getenv("CONVERTER_PUBLIC_API", "fake")
+    if converter_kind == "coinconvert":
+        app.state.converter = ThreadedCryptoExchangeRate(
+            CachedCryptoExchangeRate(
+                APICryptoExchangeRate(),
+                float(
+                    os.getenv("EXCHANGE_RATE_TTL_SECONDS", EXCHANGE_RATE_TTL_SECONDS)
+                ),
+            )
         )
-        app.state.statistics = StatisticsDatabase(
-            db.get_connection(), db.get_cursor(), app.state.transactions
+    elif converter_kind == "coinconvert-async":
+        app.state.converter = AsyncAPICryptoExchangeRate(
+            ttl_seconds=float(
+                os.getenv("EXCHANGE_RATE_TTL_SECONDS", EXCHANGE_RATE_TTL_SECONDS)
+            )
         )
-    else:
-        app.state.users = UsersInMemory()
-        app.state.wallets = WalletsInMemory(app.state.users)
-        app.state.transactions = TransactionsInMemory(
-            app.state.users, app.state.wallets
+        app.router.on_shutdown.append(app.state.converter.close)
+    elif converter_kind == "hedged":
+        providers = os.getenv("EXCHANGE_RATE_PROVIDERS")
+        app.state.converter = HedgedCryptoExchangeRate(
+            [
+                ExchangeRateProvider(**provider)
+                for provider in (
+                    json.loads(providers) if providers else EXCHANGE_RATE_PROVIDERS
+                )
+            ]
         )
-        app.state.statistics = StatisticsInMemory(app.state.transactions)
-
-    if os.getenv("CONVERTER_PUBLIC_API", "fake") == "coinconvert":
-        app.state.converter = APICryptoExchangeRate()
+        app.router.on_shutdown.append(app.state.converter.close)
     else:
-        app.state.converter = FakeCryptoExchangeRate()
+        app.state.converter = ThreadedCryptoExchangeRate(FakeCryptoExchangeRate())
 
     return app
@@ -1,3 +1,5 @@
+from unittest.mock import ANY
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -49,3 +51,116 @@ def test_should_not_get_statistics(client: TestClient) -> None:
 
     assert response.status_code == 401
     assert response.json() == {"error": {"message": f"Invalid API key: {api_key}"}}
+
+
+def test_should_recompute_statistics(client: TestClient) -> None:
+    api_key1 = create_user_and_get_key(client)
+    api_key2 = create_user_and_get_key(client, "test1@gmail.com")
+    wallet_address1 = create_wallet_and_get_address(client, api_key1)
+    wallet_address2 = create_wallet_and_get_address(client, api_key2)
+
+    client.post(
+        "/transactions",
+        headers={"api_key": api_key1},
+        json={
+            "from_address": wallet_address1,
+            "to_address": wallet_address2,
+            "transaction_amount": 0.5,
+        },
+    )
+
+    response = client.post("/statistics/recompute", headers={"api_key": ADMIN_API_KEY})
+
+    assert response.status_code == 200
+    assert (
+        response.json()
+        == client.get("/statistics", headers={"api_key": ADMIN_API_KEY}).json()
+    )
+
+
+def test_should_not_recompute_statistics(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    response = client.post("/statistics/recompute", headers={"api_key": api_key})
+
+    assert response.status_code == 401
+    assert response.json() == {"error": {"message": f"Invalid API key: {api_key}"}}
+
+
+def test_should_get_statistics_buckets(client: TestClient) -> None:
+    api_key1 = create_user_and_get_key(client)
+    api_key2 = create_user_and_get_key(client, "test1@gmail.com")
+    wallet_address1 = create_wallet_and_get_address(client, api_key1)
+    wallet_address2 = create_wallet_and_get_address(client, api_key2)
+
+    client.post(
+        "/transactions",
+        headers={"api_key": api_key1},
+        json={
+            "from_address": wallet_address1,
+            "to_address": wallet_address2,
+            "transaction_amount": 0.5,
+        },
+    )
+
+    response = client.get(
+        "/statistics",
+        headers={"api_key": ADMIN_API_KEY},
+        params={"granularity": "day"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "statistic": {
+            "total_transactions": 1,
+            "profit_btc": 0.0075,
+            "profit_usd": 0.0075 * FAKE_RATE,
+        },
+        "buckets": [
+            {
+                "start": ANY,
+                "total_transactions": 1,
+                "profit_btc": 0.0075,
+                "profit_usd": 0.0075 * FAKE_RATE,
+            }
+        ],
+    }
+
+
+def test_should_get_statistics_in_range(client: TestClient) -> None:
+    api_key1 = create_user_and_get_key(client)
+    api_key2 = create_user_and_get_key(client, "test1@gmail.com")
+    wallet_address1 = create_wallet_and_get_address(client, api_key1)
+    wallet_address2 = create_wallet_and_get_address(client, api_key2)
+
+    client.post(
+        "/transactions",
+        headers={"api_key": api_key1},
+        json={
+            "from_address": wallet_address1,
+            "to_address": wallet_address2,
+            "transaction_amount": 0.5,
+        },
+    )
+
+    response = client.get(
+        "/statistics",
+        headers={"api_key": ADMIN_API_KEY},
+        params={"from": "2000-01-01T00:00:00Z", "to": "2000-02-01T00:00:00Z"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "statistic": {"total_transactions": 0, "profit_btc": 0, "profit_usd": 0}
+    }
+
+
+def test_should_not_get_statistics_with_unknown_granularity(
+    client: TestClient,
+) -> None:
+    response = client.get(
+        "/statistics",
+        headers={"api_key": ADMIN_API_KEY},
+        params={"granularity": "week"},
+    )
+
+    assert response.status_code == 422
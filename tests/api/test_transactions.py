@@ -1,3 +1,5 @@
+import json
+from unittest.mock import ANY, patch
 from uuid import uuid4
 
 import pytest
@@ -34,10 +36,12 @@ def test_should_make_transaction(client: TestClient) -> None:
     assert response.status_code == 201
     assert response.json() == {
         "transaction": {
+            "id": 1,
             "from_address": wallet_address1,
             "to_address": wallet_address2,
             "transaction_amount": 0.5,
             "transaction_fee": 0,
+            "created_at": ANY,
         }
     }
 
@@ -170,12 +174,15 @@ def test_should_persist_transactions(client: TestClient) -> None:
     assert response.json() == {
         "transactions": [
             {
+                "id": 1,
                 "from_address": wallet_address1,
                 "to_address": wallet_address2,
                 "transaction_amount": 0.5,
                 "transaction_fee": 0.0,
+                "created_at": ANY,
             }
-        ]
+        ],
+        "next_cursor": None,
     }
 
 
@@ -188,3 +195,313 @@ def test_should_read_transactions_without_api_key(client: TestClient) -> None:
     assert response.json() == {
         "error": {"message": f"Invalid API key: {unknown_api_key}"}
     }
+
+
+def test_should_authorize_transaction_once(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    users = client.app.state.users  # type: ignore
+
+    with patch.object(
+        users, "try_authorization", wraps=users.try_authorization
+    ) as try_authorization:
+        client.post(
+            "/transactions",
+            headers={"api_key": api_key},
+            json={
+                "from_address": wallet_address1,
+                "to_address": wallet_address2,
+                "transaction_amount": 0.5,
+            },
+        )
+        client.get("/transactions", headers={"api_key": api_key})
+
+    assert try_authorization.call_count == 2
+
+
+def test_should_paginate_transactions(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    for _ in range(3):
+        client.post(
+            "/transactions",
+            headers={"api_key": api_key},
+            json={
+                "from_address": wallet_address1,
+                "to_address": wallet_address2,
+                "transaction_amount": 0.1,
+            },
+        )
+
+    first_page = client.get(
+        "/transactions", headers={"api_key": api_key}, params={"limit": 2}
+    )
+    next_cursor = first_page.json()["next_cursor"]
+    last_page = client.get(
+        "/transactions",
+        headers={"api_key": api_key},
+        params={"limit": 2, "after": next_cursor},
+    )
+
+    assert first_page.status_code == 200
+    assert [item["id"] for item in first_page.json()["transactions"]] == [1, 2]
+    assert next_cursor == 2
+    assert last_page.status_code == 200
+    assert [item["id"] for item in last_page.json()["transactions"]] == [3]
+    assert last_page.json()["next_cursor"] is None
+
+
+def test_should_not_read_transactions_with_invalid_limit(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+
+    response = client.get(
+        "/transactions", headers={"api_key": api_key}, params={"limit": 0}
+    )
+
+    assert response.status_code == 422
+
+
+def test_should_stream_transactions(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    client.post(
+        "/transactions",
+        headers={"api_key": api_key},
+        json={
+            "from_address": wallet_address1,
+            "to_address": wallet_address2,
+            "transaction_amount": 0.5,
+        },
+    )
+
+    response = client.get("/transactions/stream", headers={"api_key": api_key})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.iter_lines()] == [
+        {
+            "id": 1,
+            "from_address": wallet_address1,
+            "to_address": wallet_address2,
+            "transaction_amount": 0.5,
+            "transaction_fee": 0.0,
+            "created_at": ANY,
+        }
+    ]
+
+
+def test_should_not_stream_transactions_without_api_key(client: TestClient) -> None:
+    unknown_api_key = generate_api_key()
+
+    response = client.get("/transactions/stream", headers={"api_key": unknown_api_key})
+
+    assert response.status_code == 401
+    assert response.json() == {
+        "error": {"message": f"Invalid API key: {unknown_api_key}"}
+    }
+
+
+def test_should_round_transaction_amount_up_to_one_satoshi(
+    client: TestClient,
+) -> None:
+    api_key1 = create_user_and_get_key(client)
+    api_key2 = create_user_and_get_key(client, "test1@gmail.com")
+    wallet_address1 = create_wallet_and_get_address(client, api_key1)
+    wallet_address2 = create_wallet_and_get_address(client, api_key2)
+
+    response = client.post(
+        "/transactions",
+        headers={"api_key": api_key1},
+        json={
+            "from_address": wallet_address1,
+            "to_address": wallet_address2,
+            "transaction_amount": 0.000000005,
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json()["transaction"]["transaction_amount"] == 0.00000001
+    assert response.json()["transaction"]["transaction_fee"] == 0.00000001
+
+
+@pytest.mark.parametrize("amount", [0, -0.5, 1e12])
+def test_should_not_make_transaction_with_invalid_amount(
+    client: TestClient, amount: float
+) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    transaction = {
+        "from_address": wallet_address1,
+        "to_address": wallet_address2,
+        "transaction_amount": amount,
+    }
+
+    response = client.post(
+        "/transactions", headers={"api_key": api_key}, json=transaction
+    )
+    batch_response = client.post(
+        "/transactions/batch",
+        headers={"api_key": api_key},
+        json={"transactions": [transaction]},
+    )
+
+    assert response.status_code == 422
+    assert batch_response.status_code == 422
+
+
+def test_should_make_transactions_batch(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+
+    response = client.post(
+        "/transactions/batch",
+        headers={"api_key": api_key},
+        json={
+            "transactions": [
+                {
+                    "from_address": wallet_address1,
+                    "to_address": wallet_address2,
+                    "transaction_amount": 0.5,
+                },
+                {
+                    "from_address": wallet_address2,
+                    "to_address": wallet_address1,
+                    "transaction_amount": 0.25,
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {
+        "results": [
+            {
+                "status_code": 201,
+                "transaction": {
+                    "id": 1,
+                    "from_address": wallet_address1,
+                    "to_address": wallet_address2,
+                    "transaction_amount": 0.5,
+                    "transaction_fee": 0.0,
+                    "created_at": ANY,
+                },
+            },
+            {
+                "status_code": 201,
+                "transaction": {
+                    "id": 2,
+                    "from_address": wallet_address2,
+                    "to_address": wallet_address1,
+                    "transaction_amount": 0.25,
+                    "transaction_fee": 0.0,
+                    "created_at": ANY,
+                },
+            },
+        ]
+    }
+
+
+def test_should_roll_back_atomic_transactions_batch(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    transfer = {
+        "from_address": wallet_address1,
+        "to_address": wallet_address2,
+        "transaction_amount": 0.6,
+    }
+
+    response = client.post(
+        "/transactions/batch",
+        headers={"api_key": api_key},
+        json={"transactions": [transfer, transfer]},
+    )
+
+    assert response.status_code == 409
+    assert response.json() == {
+        "results": [
+            {
+                "status_code": 424,
+                "error": {
+                    "message": "Transaction was rolled back because another "
+                    "transaction in the batch failed."
+                },
+            },
+            {
+                "status_code": 409,
+                "error": {
+                    "message": f"Not enough bitcoin on the wallet with address"
+                    f"<{wallet_address1}>."
+                },
+            },
+        ]
+    }
+    response = client.get("/transactions", headers={"api_key": api_key})
+    assert response.json()["transactions"] == []
+
+
+def test_should_make_best_effort_transactions_batch(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    transfer = {
+        "from_address": wallet_address1,
+        "to_address": wallet_address2,
+        "transaction_amount": 0.6,
+    }
+
+    response = client.post(
+        "/transactions/batch",
+        headers={"api_key": api_key},
+        json={"transactions": [transfer, transfer], "atomic": False},
+    )
+
+    assert response.status_code == 201
+    assert [result["status_code"] for result in response.json()["results"]] == [
+        201,
+        409,
+    ]
+    response = client.get("/transactions", headers={"api_key": api_key})
+    assert len(response.json()["transactions"]) == 1
+
+
+def test_should_not_make_transactions_batch_without_api_key(
+    client: TestClient,
+) -> None:
+    unknown_api_key = generate_api_key()
+
+    response = client.post(
+        "/transactions/batch",
+        headers={"api_key": unknown_api_key},
+        json={
+            "transactions": [
+                {
+                    "from_address": str(uuid4()),
+                    "to_address": str(uuid4()),
+                    "transaction_amount": 0.5,
+                }
+            ]
+        },
+    )
+
+    assert response.status_code == 401
+    assert response.json() == {
+        "error": {"message": f"Invalid API key: {unknown_api_key}"}
+    }
+
+
+def test_should_not_make_empty_transactions_batch(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+
+    response = client.post(
+        "/transactions/batch",
+        headers={"api_key": api_key},
+        json={"transactions": []},
+    )
+
+    assert response.status_code == 422
@@ -1,4 +1,5 @@
-from unittest.mock import ANY
+import json
+from unittest.mock import ANY, AsyncMock, patch
 from uuid import uuid4
 
 import pytest
@@ -109,6 +110,102 @@ def test_should_not_read_others_wallet(client: TestClient) -> None:
     }
 
 
+def test_should_list_wallets(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    addresses = [create_wallet_and_get_address(client, api_key) for _ in range(2)]
+    create_wallet_and_get_address(
+        client, create_user_and_get_key(client, "1@gmail.com")
+    )
+
+    response = client.get("/wallets", headers={"api_key": api_key})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "wallets": [
+            {
+                "address": address,
+                "balance_btc": STARTING_BITCOIN_AMOUNT,
+                "balance_usd": STARTING_BITCOIN_AMOUNT * FAKE_RATE,
+            }
+            for address in addresses
+        ]
+    }
+
+
+def test_should_read_many_wallets(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    addresses = [create_wallet_and_get_address(client, api_key) for _ in range(3)]
+
+    response = client.get(
+        "/wallets",
+        headers={"api_key": api_key},
+        params={"address": [addresses[2], addresses[0]]},
+    )
+
+    assert response.status_code == 200
+    assert [wallet["address"] for wallet in response.json()["wallets"]] == [
+        addresses[2],
+        addresses[0],
+    ]
+
+
+def test_should_not_read_many_wallets_with_others_wallet(client: TestClient) -> None:
+    api_key1 = create_user_and_get_key(client)
+    api_key2 = create_user_and_get_key(client, "test1@gmail.com")
+    own_address = create_wallet_and_get_address(client, api_key1)
+    other_address = create_wallet_and_get_address(client, api_key2)
+
+    response = client.get(
+        "/wallets",
+        headers={"api_key": api_key1},
+        params={"address": [own_address, other_address]},
+    )
+
+    assert response.status_code == 403
+    assert response.json() == {
+        "error": {"message": f"User does not have wallet<{other_address}>."}
+    }
+
+
+def test_should_not_read_many_unknown_wallets(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    unknown_address = uuid4()
+
+    response = client.get(
+        "/wallets",
+        headers={"api_key": api_key},
+        params={"address": [str(unknown_address)]},
+    )
+
+    assert response.status_code == 404
+    assert response.json() == {
+        "error": {"message": f"Wallet with address<{unknown_address}> does not exist."}
+    }
+
+
+def test_should_not_list_wallets_with_invalid_key(client: TestClient) -> None:
+    unknown_api_key = generate_api_key()
+    response = client.get("/wallets", headers={"api_key": unknown_api_key})
+
+    assert response.status_code == 401
+    assert response.json() == {
+        "error": {"message": f"Invalid API key: {unknown_api_key}"}
+    }
+
+
+def test_should_list_wallets_with_one_rate_lookup(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    for _ in range(WALLETS_LIMIT):
+        create_wallet_and_get_address(client, api_key)
+    converter = client.app.state.converter  # type: ignore[attr-defined]
+
+    with patch.object(converter, "get_rate", AsyncMock(return_value=FAKE_RATE)):
+        response = client.get("/wallets", headers={"api_key": api_key})
+        converter.get_rate.assert_awaited_once()
+
+    assert len(response.json()["wallets"]) == WALLETS_LIMIT
+
+
 def test_should_get_wallet_transactions(client: TestClient) -> None:
     api_key = create_user_and_get_key(client)
     wallet_address1 = create_wallet_and_get_address(client, api_key)
@@ -132,12 +229,15 @@ def test_should_get_wallet_transactions(client: TestClient) -> None:
     assert response.json() == {
         "transactions": [
             {
+                "id": 1,
                 "from_address": wallet_address1,
                 "to_address": wallet_address2,
                 "transaction_amount": 0.5,
                 "transaction_fee": 0.0,
+                "created_at": ANY,
             }
-        ]
+        ],
+        "next_cursor": None,
     }
 
 
@@ -180,3 +280,81 @@ def test_should_not_get_invalid_wallet_transactions(client: TestClient) -> None:
     assert response.json() == {
         "error": {"message": f"Wallet with address<{wallet_address}> does not exist."}
     }
+
+
+def test_should_paginate_wallet_transactions(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    for _ in range(3):
+        client.post(
+            "/transactions",
+            headers={"api_key": api_key},
+            json={
+                "from_address": wallet_address1,
+                "to_address": wallet_address2,
+                "transaction_amount": 0.1,
+            },
+        )
+
+    response = client.get(
+        f"/wallets/{wallet_address1}/transactions",
+        headers={"api_key": api_key},
+        params={"limit": 1, "after": 1},
+    )
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["transactions"]] == [2]
+    assert response.json()["next_cursor"] == 2
+
+
+def test_should_stream_wallet_transactions(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+    wallet_address1 = create_wallet_and_get_address(client, api_key)
+    wallet_address2 = create_wallet_and_get_address(client, api_key)
+    for _ in range(2):
+        client.post(
+            "/transactions",
+            headers={"api_key": api_key},
+            json={
+                "from_address": wallet_address1,
+                "to_address": wallet_address2,
+                "transaction_amount": 0.1,
+            },
+        )
+
+    response = client.get(
+        f"/wallets/{wallet_address2}/transactions/stream",
+        headers={"api_key": api_key},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in response.iter_lines()] == [1, 2]
+
+
+def test_should_not_stream_another_users_wallet_transactions(
+    client: TestClient,
+) -> None:
+    api_key1 = create_user_and_get_key(client, "test1@gmail.com")
+    api_key2 = create_user_and_get_key(client, "test2@gmail.com")
+    wallet_address = create_wallet_and_get_address(client, api_key1)
+
+    response = client.get(
+        f"/wallets/{wallet_address}/transactions/stream",
+        headers={"api_key": api_key2},
+    )
+
+    assert response.status_code == 403
+
+
+def test_should_not_read_more_wallets_than_limit(client: TestClient) -> None:
+    api_key = create_user_and_get_key(client)
+
+    response = client.get(
+        "/wallets",
+        headers={"api_key": api_key},
+        params={"address": [str(uuid4()) for _ in range(WALLETS_LIMIT + 1)]},
+    )
+
+    assert response.status_code == 422
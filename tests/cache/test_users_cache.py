@@ -0,0 +1,97 @@
+from unittest.mock import patch
+
+import pytest
+
+from core.errors import InvalidApiKeyError
+from core.user import User, generate_api_key
+from infra.cache.users import CachedUsers
+from infra.in_memory.users import UsersInMemory
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cached_authorization_counts_hits_and_misses() -> None:
+    backing = UsersInMemory()
+    user = backing.create("test@gmail.com")
+    users = CachedUsers(backing)
+
+    assert users.try_authorization(user.api_key) == user
+    assert users.try_authorization(user.api_key) == user
+    assert (users.hits, users.misses) == (1, 1)
+
+
+def test_created_user_is_cached() -> None:
+    users = CachedUsers(UsersInMemory())
+    user = users.create("test@gmail.com")
+
+    assert users.try_authorization(user.api_key) == user
+    assert (users.hits, users.misses) == (1, 0)
+
+
+def test_cached_user_expires_after_ttl() -> None:
+    clock = FakeClock()
+    users = CachedUsers(UsersInMemory(), ttl_seconds=10, clock=clock)
+    user = users.create("test@gmail.com")
+
+    clock.now = 10
+    users.try_authorization(user.api_key)
+
+    assert (users.hits, users.misses) == (0, 1)
+
+
+def test_least_recently_used_user_is_evicted() -> None:
+    users = CachedUsers(UsersInMemory(), max_size=2)
+    user1 = users.create("test1@gmail.com")
+    user2 = users.create("test2@gmail.com")
+    users.try_authorization(user1.api_key)
+    user3 = users.create("test3@gmail.com")
+
+    assert list(users.entries) == [user1.api_key, user3.api_key]
+    assert user2.api_key not in users.entries
+
+
+def test_invalidate_cached_user() -> None:
+    users = CachedUsers(UsersInMemory())
+    user1 = users.create("test1@gmail.com")
+    user2 = users.create("test2@gmail.com")
+
+    users.invalidate(user1.api_key)
+    assert list(users.entries) == [user2.api_key]
+    users.clear()
+    assert len(users.entries) == 0
+
+
+def test_user_invalidated_during_fetch_is_not_cached() -> None:
+    backing = UsersInMemory()
+    user = backing.create("test@gmail.com")
+    users = CachedUsers(backing)
+    try_authorization = backing.try_authorization
+
+    def invalidate_during_fetch(api_key: str) -> User:
+        fetched = try_authorization(api_key)
+        users.invalidate(api_key)
+        return fetched
+
+    with patch.object(backing, "try_authorization", invalidate_during_fetch):
+        assert users.try_authorization(user.api_key) == user
+
+    assert user.api_key not in users.entries
+    assert users.try_authorization(user.api_key) == user
+    assert user.api_key in users.entries
+
+
+def test_invalid_api_key_is_not_cached() -> None:
+    users = CachedUsers(UsersInMemory())
+    api_key = generate_api_key()
+
+    for _ in range(2):
+        with pytest.raises(InvalidApiKeyError):
+            users.try_authorization(api_key)
+    assert (users.hits, users.misses) == (0, 2)
+    assert len(users.entries) == 0
@@ -0,0 +1,360 @@
+import asyncio
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Thread
+from typing import Iterator
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from core.btc_to_usd_converter import (
+    APICryptoExchangeRate,
+    AsyncAPICryptoExchangeRate,
+    CachedCryptoExchangeRate,
+    CircuitBreaker,
+    ExchangeRateProvider,
+    FakeCryptoExchangeRate,
+    HedgedCryptoExchangeRate,
+    ThreadedCryptoExchangeRate,
+)
+from core.errors import ExchangeRateUnavailableError
+
+
+class RateServer(ThreadingHTTPServer):
+    rate = 100.0
+    delay = 0.0
+    requests = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/convert/btc/usd"
+
+
+class RateHandler(BaseHTTPRequestHandler):
+    server: RateServer
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        body = json.dumps({"BTC": 1, "USD": self.server.rate}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[RateServer]:
+    server = RateServer(("127.0.0.1", 0), RateHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class BlockingExchangeRate:
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.release = Event()
+
+    def get_rate(self) -> float:
+        self.release.wait(5)
+        return self.rate
+
+
+class FlakyRateTransport(httpx.MockTransport):
+    def __init__(self) -> None:
+        super().__init__(self.respond)
+        self.healthy = True
+        self.requests = 0
+
+    def respond(self, _: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if not self.healthy:
+            raise httpx.ConnectTimeout("upstream is down")
+        return httpx.Response(200, json={"BTC": 1, "USD": 100.0})
+
+
+def async_converter(
+    transport: FlakyRateTransport, clock: FakeClock, ttl_seconds: float = 0
+) -> AsyncAPICryptoExchangeRate:
+    return AsyncAPICryptoExchangeRate(
+        "http://rates.test/convert/btc/usd",
+        httpx.AsyncClient(transport=transport),
+        CircuitBreaker(2, 30, clock),
+        ttl_seconds=ttl_seconds,
+        clock=clock,
+    )
+
+
+def test_api_exchange_rate(server: RateServer) -> None:
+    assert APICryptoExchangeRate(server.url).get_rate() == 100.0
+
+
+def test_cached_rate_is_fetched_once_within_ttl(server: RateServer) -> None:
+    converter = CachedCryptoExchangeRate(APICryptoExchangeRate(server.url))
+
+    assert [converter.get_rate() for _ in range(5)] == [100.0] * 5
+    assert server.requests == 1
+
+
+def test_concurrent_misses_share_one_fetch(server: RateServer) -> None:
+    server.delay = 0.1
+    converter = CachedCryptoExchangeRate(APICryptoExchangeRate(server.url))
+    rates: list[float] = []
+
+    threads = [
+        Thread(target=lambda: rates.append(converter.get_rate())) for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert rates == [100.0] * 10
+    assert server.requests == 1
+
+
+def test_stale_rate_is_served_while_refreshing() -> None:
+    clock = FakeClock()
+    upstream = BlockingExchangeRate(200.0)
+    converter = CachedCryptoExchangeRate(upstream, 10, clock, rate=100.0)
+
+    clock.now = 10
+    assert converter.get_rate() == 100.0
+    assert converter.refreshing
+
+    upstream.release.set()
+    while converter.refreshing:
+        time.sleep(0.01)
+    assert converter.get_rate() == 200.0
+
+
+def test_failed_refresh_keeps_stale_rate() -> None:
+    clock = FakeClock()
+    converter = CachedCryptoExchangeRate(
+        APICryptoExchangeRate("http://127.0.0.1:9"), 10, clock, rate=100.0
+    )
+
+    clock.now = 10
+    assert converter.get_rate() == 100.0
+    while converter.refreshing:
+        time.sleep(0.01)
+    assert converter.refresh_failures == 1
+    assert isinstance(converter.last_refresh_error, httpx.ConnectError)
+    assert converter.get_rate() == 100.0
+
+
+def test_fake_exchange_rate() -> None:
+    assert FakeCryptoExchangeRate(42.0).get_rate() == 42.0
+
+
+def test_async_exchange_rate() -> None:
+    converter = async_converter(FlakyRateTransport(), FakeClock())
+
+    assert asyncio.run(converter.get_rate()) == 100.0
+    assert converter.rate == 100.0
+
+
+def test_async_exchange_rate_falls_back_to_last_rate() -> None:
+    transport = FlakyRateTransport()
+    converter = async_converter(transport, FakeClock())
+    asyncio.run(converter.get_rate())
+
+    transport.healthy = False
+
+    assert asyncio.run(converter.get_rate()) == 100.0
+    assert converter.breaker.failures == 1
+
+
+def test_open_circuit_fails_fast_until_reset() -> None:
+    clock = FakeClock()
+    transport = FlakyRateTransport()
+    converter = async_converter(transport, clock)
+    asyncio.run(converter.get_rate())
+    transport.healthy = False
+    for _ in range(2):
+        asyncio.run(converter.get_rate())
+
+    assert asyncio.run(converter.get_rate()) == 100.0
+    assert transport.requests == 3
+
+    transport.healthy = True
+    clock.now = 30
+    asyncio.run(converter.get_rate())
+    assert transport.requests == 4
+    assert converter.breaker.opened_at is None
+
+
+def test_half_open_circuit_sends_a_single_probe() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(1, 30, clock)
+    breaker.record_failure()
+    clock.now = 30
+
+    assert [breaker.allows_request() for _ in range(3)] == [True, False, False]
+
+    breaker.record_failure()
+    assert breaker.opened_at == 30
+    assert not breaker.allows_request()
+
+    clock.now = 60
+    assert breaker.allows_request()
+    breaker.record_success()
+    assert [breaker.allows_request() for _ in range(3)] == [True, True, True]
+
+
+def test_async_exchange_rate_is_cached_for_ttl() -> None:
+    clock = FakeClock()
+    transport = FlakyRateTransport()
+    converter = async_converter(transport, clock, 10)
+
+    async def run() -> list[float]:
+        return await asyncio.gather(*(converter.get_rate() for _ in range(10)))
+
+    assert asyncio.run(run()) == [100.0] * 10
+    assert asyncio.run(converter.get_rate()) == 100.0
+    assert transport.requests == 1
+
+    clock.now = 10
+    assert asyncio.run(converter.get_rate()) == 100.0
+    assert transport.requests == 2
+
+
+def test_async_exchange_rate_unavailable_without_last_rate() -> None:
+    transport = FlakyRateTransport()
+    transport.healthy = False
+    converter = async_converter(transport, FakeClock())
+
+    with pytest.raises(ExchangeRateUnavailableError):
+        asyncio.run(converter.get_rate())
+
+
+def test_threaded_exchange_rate() -> None:
+    converter = ThreadedCryptoExchangeRate(FakeCryptoExchangeRate(42.0))
+
+    with patch.object(asyncio, "to_thread") as to_thread:
+        assert asyncio.run(converter.get_rate()) == 42.0
+    to_thread.assert_not_called()
+
+
+def test_threaded_exchange_rate_uses_any_caching_converter() -> None:
+    class PinnedExchangeRate:
+        def get_rate(self) -> float:
+            raise AssertionError("get_rate should not be called")
+
+        def cached_rate(self) -> float | None:
+            return 7.0
+
+    converter = ThreadedCryptoExchangeRate(PinnedExchangeRate())
+
+    assert asyncio.run(converter.get_rate()) == 7.0
+
+
+def test_threaded_exchange_rate_reads_fresh_cache_on_loop() -> None:
+    clock = FakeClock()
+    cached = CachedCryptoExchangeRate(FakeCryptoExchangeRate(42.0), 10, clock)
+    converter = ThreadedCryptoExchangeRate(cached)
+
+    assert cached.cached_rate() is None
+    assert asyncio.run(converter.get_rate()) == 42.0
+
+    with patch.object(asyncio, "to_thread") as to_thread:
+        assert asyncio.run(converter.get_rate()) == 42.0
+    to_thread.assert_not_called()
+
+    clock.now = 10
+    assert cached.cached_rate() is None
+
+
+class HedgedRateTransport(httpx.AsyncBaseTransport):
+    def __init__(self, delays: dict[str, float], failing: set[str]) -> None:
+        self.delays = delays
+        self.failing = failing
+        self.hosts: list[str] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.hosts.append(host)
+        await asyncio.sleep(self.delays.get(host, 0))
+        if host in self.failing:
+            return httpx.Response(500)
+        return httpx.Response(200, json={"data": {"amount": f"{len(host)}.5"}})
+
+
+def hedged_converter(transport: HedgedRateTransport) -> HedgedCryptoExchangeRate:
+    return HedgedCryptoExchangeRate(
+        [
+            ExchangeRateProvider("http://slow.test/", "data.amount"),
+            ExchangeRateProvider("http://fast.test/", "data.amount"),
+        ],
+        httpx.AsyncClient(transport=transport),
+        default_hedge_delay_seconds=0.05,
+    )
+
+
+def test_hedged_rate_from_first_provider() -> None:
+    transport = HedgedRateTransport({}, set())
+
+    assert asyncio.run(hedged_converter(transport).get_rate()) == 9.5
+    assert transport.hosts == ["slow.test"]
+
+
+def test_hedged_request_is_sent_after_delay() -> None:
+    transport = HedgedRateTransport({"slow.test": 1}, set())
+    converter = hedged_converter(transport)
+
+    assert asyncio.run(converter.get_rate()) == 9.5
+    assert transport.hosts == ["slow.test", "fast.test"]
+    slow, fast = converter.provider_statistics()
+    assert (slow.requests, slow.failures) == (1, 0)
+    assert fast.requests == 1
+    assert slow.p50_seconds is not None and fast.p50_seconds is not None
+    assert slow.p50_seconds > fast.p50_seconds
+
+
+def test_failed_provider_is_hedged_immediately() -> None:
+    transport = HedgedRateTransport({"fast.test": 0.01}, {"slow.test"})
+    converter = hedged_converter(transport)
+
+    assert asyncio.run(converter.get_rate()) == 9.5
+    assert converter.provider_statistics()[0].failures == 1
+
+
+def test_hedged_rate_unavailable_when_all_providers_fail() -> None:
+    transport = HedgedRateTransport({}, {"slow.test", "fast.test"})
+
+    with pytest.raises(ExchangeRateUnavailableError):
+        asyncio.run(hedged_converter(transport).get_rate())
+
+
+def test_hedge_delay_follows_latency_percentile() -> None:
+    converter = hedged_converter(HedgedRateTransport({}, set()))
+    provider = converter.providers[0]
+    for seconds in [0.01, 0.02, 0.03, 0.04]:
+        provider.latency.record(seconds)
+
+    assert converter._hedge_delay(provider) == 0.04
+    assert converter._hedge_delay(converter.providers[1]) == 0.05
+    assert converter.provider_statistics()[0].p50_seconds == 0.02
+
+
+def test_provider_rejects_invalid_rate() -> None:
+    provider = ExchangeRateProvider("http://rates.test/", "data.amount")
+
+    with pytest.raises(ValueError):
+        provider.parse_rate({"data": {"amount": "-1"}})
@@ -2,6 +2,7 @@ from uuid import uuid4
 
 from core.errors import (
     EmailAlreadyExistError,
+    ExchangeRateUnavailableError,
     InvalidApiKeyError,
     NotEnoughBitcoinError,
     TransactionBetweenSameWalletError,
@@ -88,3 +89,12 @@ def test_wallets_limit_error() -> None:
         + str(WALLETS_LIMIT)
         + ')."}}'
     )
+
+
+def test_exchange_rate_unavailable_error() -> None:
+    json = ExchangeRateUnavailableError().get_error_json_response()
+    assert json.status_code == 503
+    assert (
+        bytes(json.body).decode("utf-8")
+        == '{"error":{"message":"BTC to USD exchange rate is unavailable."}}'
+    )
@@ -0,0 +1,15 @@
+from core.transaction import get_transaction_fee
+
+
+def test_transaction_fee() -> None:
+    assert get_transaction_fee(100_000_000) == 1_500_000
+    assert get_transaction_fee(0) == 0
+
+
+def test_transaction_fee_rounds_up_to_whole_satoshi() -> None:
+    assert get_transaction_fee(1) == 1
+    assert get_transaction_fee(99_999_998) == 1_500_000
+
+
+def test_transaction_fee_is_exact_for_large_amounts() -> None:
+    assert get_transaction_fee(2_100_000_000_000_000) == 31_500_000_000_000
@@ -0,0 +1,26 @@
+import pytest
+
+from core.wallet import to_btc, to_satoshis
+
+
+def test_to_satoshis() -> None:
+    assert to_satoshis(1) == 100_000_000
+    assert to_satoshis(0.1) == 10_000_000
+    assert to_satoshis(0.29) == 29_000_000
+
+
+def test_to_satoshis_rounds_up_fractions_of_satoshi() -> None:
+    assert to_satoshis(0.000000005) == 1
+    assert to_satoshis(0.000000015) == 2
+
+
+@pytest.mark.parametrize("btc", [0, -0.5, 21_000_000.00000001, 1e12, float("nan")])
+def test_to_satoshis_rejects_invalid_amount(btc: float) -> None:
+    with pytest.raises(ValueError):
+        to_satoshis(btc)
+
+
+def test_to_btc() -> None:
+    assert to_btc(100_000_000) == 1
+    assert to_btc(750_000) == 0.0075
+    assert to_btc(1) == 0.00000001
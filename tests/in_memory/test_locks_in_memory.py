@@ -0,0 +1,34 @@
+from threading import Thread
+from uuid import UUID
+
+from infra.in_memory.locks import StripedLocks
+
+
+def test_striped_locks_acquire_shared_stripe_once() -> None:
+    locks = StripedLocks(1)
+
+    with locks.acquire(UUID(int=1), UUID(int=2)):
+        assert locks.locks[0].locked()
+
+    assert not locks.locks[0].locked()
+
+
+def test_striped_locks_acquire_in_stripe_order() -> None:
+    locks = StripedLocks(4)
+    acquired: list[int] = []
+
+    def transfer(from_address: UUID, to_address: UUID) -> None:
+        for _ in range(1_000):
+            with locks.acquire(from_address, to_address):
+                acquired.append(1)
+
+    threads = [
+        Thread(target=transfer, args=(UUID(int=1), UUID(int=2)), daemon=True),
+        Thread(target=transfer, args=(UUID(int=2), UUID(int=1)), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(acquired) == 2_000
@@ -1,7 +1,13 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
 from core.errors import InvalidApiKeyError
-from core.statistic import Statistic
+from core.statistic import Granularity, Statistic, StatisticBucket, bucket_start
+from core.transaction import Transaction
 from core.user import generate_api_key
 from infra.constants import ADMIN_API_KEY
 from infra.in_memory.statistics import StatisticsInMemory
@@ -11,12 +17,11 @@ from infra.in_memory.wallets import WalletsInMemory
 
 
 def test_get_empty_statistics_in_memory() -> None:
-    users = UsersInMemory()
-    wallets = WalletsInMemory(users)
-    transactions = TransactionsInMemory(users, wallets)
+    wallets = WalletsInMemory()
+    transactions = TransactionsInMemory(wallets)
     statistics = StatisticsInMemory(transactions)
 
-    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(0, 0.0)
+    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(0, 0)
 
 
 def test_get_statistics_in_memory() -> None:
@@ -24,24 +29,221 @@ def test_get_statistics_in_memory() -> None:
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet1 = wallets.create(user1.api_key)
-    wallet2 = wallets.create(user2.api_key)
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
 
-    transactions = TransactionsInMemory(users, wallets)
-    transactions.make_transaction(user1.api_key, wallet1.address, wallet2.address, 1)
-    transactions.make_transaction(user2.api_key, wallet2.address, wallet1.address, 1)
+    transactions = TransactionsInMemory(wallets)
+    transactions.make_transaction(user1, wallet1.address, wallet2.address, 100_000_000)
+    transactions.make_transaction(user2, wallet2.address, wallet1.address, 100_000_000)
 
     statistics = StatisticsInMemory(transactions)
 
-    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(2, 0.03)
+    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(2, 3_000_000)
 
 
 def test_get_statistics_unknown_api_key_in_memory() -> None:
-    users = UsersInMemory()
-    wallets = WalletsInMemory(users)
-    transactions = TransactionsInMemory(users, wallets)
+    wallets = WalletsInMemory()
+    transactions = TransactionsInMemory(wallets)
     statistics = StatisticsInMemory(transactions)
 
     with pytest.raises(InvalidApiKeyError):
         statistics.get_statistic(generate_api_key())
+
+
+def test_recompute_statistics_repairs_counters_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsInMemory(wallets)
+    transactions.make_transaction(user1, wallet1.address, wallet2.address, 100_000_000)
+
+    statistics = StatisticsInMemory(transactions)
+    transactions.total_transactions = 7
+
+    assert statistics.recompute_statistic(ADMIN_API_KEY) == Statistic(1, 1_500_000)
+    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(1, 1_500_000)
+
+
+def test_get_statistic_buckets_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsInMemory(wallets)
+    transaction = transactions.make_transaction(
+        user1, wallet1.address, wallet2.address, 100_000_000
+    )
+    statistics = StatisticsInMemory(transactions)
+
+    assert statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.HOUR) == [
+        StatisticBucket(
+            bucket_start(transaction.created_at, Granularity.HOUR), 1, 1_500_000
+        )
+    ]
+
+    transactions.transactions = [
+        Transaction(wallet1.address, wallet2.address, 1, fee, i + 1, created_at)
+        for i, (created_at, fee) in enumerate(
+            [
+                (datetime(2026, 1, 31, 23, 30, tzinfo=timezone.utc), 1),
+                (datetime(2026, 2, 1, 0, 10, tzinfo=timezone.utc), 2),
+                (datetime(2026, 2, 1, 0, 50, tzinfo=timezone.utc), 3),
+            ]
+        )
+    ]
+    statistics.recompute_statistic(ADMIN_API_KEY)
+
+    assert statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.HOUR) == [
+        StatisticBucket(datetime(2026, 1, 31, 23, tzinfo=timezone.utc), 1, 1),
+        StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 2, 5),
+    ]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY, Granularity.MONTH, datetime(2026, 2, 1)
+    ) == [StatisticBucket(datetime(2026, 2, 1, tzinfo=timezone.utc), 2, 5)]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY, Granularity.DAY, end=datetime(2026, 2, 1)
+    ) == [StatisticBucket(datetime(2026, 1, 31, tzinfo=timezone.utc), 1, 1)]
+
+
+def test_get_statistic_buckets_with_unaligned_bounds_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsInMemory(wallets)
+    transactions.transactions = [
+        Transaction(wallet1.address, wallet2.address, 1, fee, i + 1, created_at)
+        for i, (created_at, fee) in enumerate(
+            [
+                (datetime(2026, 1, 31, 23, 30, tzinfo=timezone.utc), 1),
+                (datetime(2026, 2, 1, 0, 10, tzinfo=timezone.utc), 2),
+                (datetime(2026, 2, 1, 0, 50, tzinfo=timezone.utc), 3),
+            ]
+        )
+    ]
+    statistics = StatisticsInMemory(transactions)
+    statistics.recompute_statistic(ADMIN_API_KEY)
+
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY, Granularity.HOUR, datetime(2026, 2, 1, 0, 30)
+    ) == [StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 1, 3)]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY,
+        Granularity.HOUR,
+        datetime(2026, 1, 31, 23),
+        datetime(2026, 2, 1, 0, 30),
+    ) == [
+        StatisticBucket(datetime(2026, 1, 31, 23, tzinfo=timezone.utc), 1, 1),
+        StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 1, 2),
+    ]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY,
+        Granularity.HOUR,
+        datetime(2026, 2, 1, 0, 5),
+        datetime(2026, 2, 1, 0, 20),
+    ) == [StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 1, 2)]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY,
+        Granularity.MONTH,
+        datetime(2026, 1, 31, 23, 45),
+        datetime(2026, 2, 1, 0, 45),
+    ) == [StatisticBucket(datetime(2026, 2, 1, tzinfo=timezone.utc), 1, 2)]
+
+
+def test_statistic_buckets_are_copies_in_memory() -> None:
+    users = UsersInMemory()
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+
+    transactions = TransactionsInMemory(wallets)
+    statistics = StatisticsInMemory(transactions)
+    transactions.make_transaction(user, wallet1.address, wallet2.address, 1_000)
+    [bucket] = statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.DAY)
+
+    bucket.total_transactions = 100
+    transactions.make_transaction(user, wallet1.address, wallet2.address, 1_000)
+
+    assert bucket.total_transactions == 100
+    assert statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.DAY) == [
+        StatisticBucket(bucket.start, 2, 0)
+    ]
+
+
+def test_statistic_readers_wait_for_ledger_lock_in_memory() -> None:
+    transactions = TransactionsInMemory(WalletsInMemory())
+    statistics = StatisticsInMemory(transactions)
+
+    with ThreadPoolExecutor(2) as executor:
+        with transactions.ledger_lock:
+            statistic = executor.submit(statistics.get_statistic, ADMIN_API_KEY)
+            buckets = executor.submit(
+                statistics.get_statistic_buckets, ADMIN_API_KEY, Granularity.DAY
+            )
+            time.sleep(0.05)
+            assert not statistic.done()
+            assert not buckets.done()
+
+        assert statistic.result() == Statistic(0, 0)
+        assert buckets.result() == []
+
+
+def test_unaligned_statistic_buckets_match_ledger_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    rng = random.Random(0)
+    origin = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    transactions = TransactionsInMemory(wallets)
+    transactions.transactions = [
+        Transaction(
+            wallet1.address,
+            wallet2.address,
+            1,
+            rng.randrange(1, 100),
+            i + 1,
+            origin + timedelta(minutes=rng.randrange(90 * 24 * 60)),
+        )
+        for i in range(2_000)
+    ]
+    statistics = StatisticsInMemory(transactions)
+    statistics.recompute_statistic(ADMIN_API_KEY)
+
+    for _ in range(50):
+        start = origin + timedelta(minutes=rng.randrange(90 * 24 * 60))
+        end = start + timedelta(minutes=rng.randrange(60 * 24 * 60))
+        for granularity in Granularity:
+            expected: dict[datetime, StatisticBucket] = {}
+            for transaction in transactions.transactions:
+                if start <= transaction.created_at < end:
+                    bucket_time = bucket_start(transaction.created_at, granularity)
+                    bucket = expected.setdefault(
+                        bucket_time, StatisticBucket(bucket_time, 0, 0)
+                    )
+                    bucket.total_transactions += 1
+                    bucket.profit += transaction.transaction_fee
+
+            assert statistics.get_statistic_buckets(
+                ADMIN_API_KEY, granularity, start, end
+            ) == sorted(expected.values(), key=lambda bucket: bucket.start)
@@ -1,16 +1,18 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
 from uuid import uuid4
 
 import pytest
 
 from core.errors import (
-    InvalidApiKeyError,
+    BatchRolledBackError,
     NotEnoughBitcoinError,
     TransactionBetweenSameWalletError,
     WalletDoesNotExistError,
     WalletPermissionError,
 )
-from core.user import generate_api_key
-from infra.constants import MINIMUM_AMOUNT_OF_BITCOIN
+from core.transaction import Transfer
 from infra.in_memory.transactions import TransactionsInMemory
 from infra.in_memory.users import UsersInMemory
 from infra.in_memory.wallets import WalletsInMemory
@@ -20,21 +22,21 @@ def test_make_transaction_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    from_wallet = wallets.create(user.api_key)
-    to_wallet = wallets.create(user.api_key)
+    wallets = WalletsInMemory()
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
     transaction = transactions.make_transaction(
-        user.api_key, from_wallet.address, to_wallet.address, 0.5
+        user, from_wallet.address, to_wallet.address, 50_000_000
     )
 
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    assert transaction.transaction_amount == 0.5
+    assert transaction.transaction_amount == 50_000_000
     assert transaction.transaction_fee == 0
-    assert from_wallet.get_balance() == 0.5
-    assert to_wallet.get_balance() == 1.5
+    assert from_wallet.balance == 50_000_000
+    assert to_wallet.balance == 150_000_000
 
 
 def test_make_transaction_between_two_users_in_memory() -> None:
@@ -42,21 +44,21 @@ def test_make_transaction_between_two_users_in_memory() -> None:
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    from_wallet = wallets.create(user1.api_key)
-    to_wallet = wallets.create(user2.api_key)
+    wallets = WalletsInMemory()
+    from_wallet = wallets.create(user1)
+    to_wallet = wallets.create(user2)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
     transaction = transactions.make_transaction(
-        user1.api_key, from_wallet.address, to_wallet.address, 1
+        user1, from_wallet.address, to_wallet.address, 100_000_000
     )
 
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    assert transaction.transaction_amount == 1
-    assert transaction.transaction_fee == 0.015
-    assert from_wallet.get_balance() == 0
-    assert to_wallet.get_balance() == 1.985
+    assert transaction.transaction_amount == 100_000_000
+    assert transaction.transaction_fee == 1_500_000
+    assert from_wallet.balance == 0
+    assert to_wallet.balance == 198_500_000
 
 
 def test_transaction_less_then_one_satishi() -> None:
@@ -64,21 +66,21 @@ def test_transaction_less_then_one_satishi() -> None:
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    from_wallet = wallets.create(user1.api_key)
-    to_wallet = wallets.create(user2.api_key)
+    wallets = WalletsInMemory()
+    from_wallet = wallets.create(user1)
+    to_wallet = wallets.create(user2)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
     transaction = transactions.make_transaction(
-        user1.api_key,
+        user1,
         from_wallet.address,
         to_wallet.address,
-        0.5 * MINIMUM_AMOUNT_OF_BITCOIN,
+        1,
     )
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    assert from_wallet.get_balance() == 1 - MINIMUM_AMOUNT_OF_BITCOIN
-    assert to_wallet.get_balance() == 1
+    assert from_wallet.balance == 99_999_999
+    assert to_wallet.balance == 100_000_000
 
 
 def test_double_transaction_with_less_then_one_satoshi_fee() -> None:
@@ -86,47 +88,47 @@ def test_double_transaction_with_less_then_one_satoshi_fee() -> None:
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    from_wallet = wallets.create(user1.api_key)
-    to_wallet = wallets.create(user2.api_key)
+    wallets = WalletsInMemory()
+    from_wallet = wallets.create(user1)
+    to_wallet = wallets.create(user2)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
     transaction = transactions.make_transaction(
-        user1.api_key,
+        user1,
         from_wallet.address,
         to_wallet.address,
-        1 - 2 * MINIMUM_AMOUNT_OF_BITCOIN,
+        99_999_998,
     )
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    assert from_wallet.get_balance() == 2 * MINIMUM_AMOUNT_OF_BITCOIN
-    assert to_wallet.get_balance() == 1.98499998
+    assert from_wallet.balance == 2
+    assert to_wallet.balance == 198_499_998
 
     transaction2 = transactions.make_transaction(
-        user1.api_key,
+        user1,
         from_wallet.address,
         to_wallet.address,
-        1.5 * MINIMUM_AMOUNT_OF_BITCOIN,
+        2,
     )
 
     assert transaction2.from_address == from_wallet.address
     assert transaction2.to_address == to_wallet.address
-    assert to_wallet.get_balance() == 1.98499999
-    assert from_wallet.get_balance() == 0
+    assert to_wallet.balance == 198_499_999
+    assert from_wallet.balance == 0
 
 
 def test_make_transaction_without_enough_balance_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    from_wallet = wallets.create(user.api_key)
-    to_wallet = wallets.create(user.api_key)
+    wallets = WalletsInMemory()
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
     with pytest.raises(NotEnoughBitcoinError):
         transactions.make_transaction(
-            user.api_key, from_wallet.address, to_wallet.address, 1.5
+            user, from_wallet.address, to_wallet.address, 150_000_000
         )
 
 
@@ -134,12 +136,12 @@ def test_make_transaction_between_same_wallet_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsInMemory()
+    wallet = wallets.create(user)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
     with pytest.raises(TransactionBetweenSameWalletError):
-        transactions.make_transaction(user.api_key, wallet.address, wallet.address, 0.5)
+        transactions.make_transaction(user, wallet.address, wallet.address, 50_000_000)
 
 
 def test_make_transaction_other_api_key_in_memory() -> None:
@@ -147,136 +149,328 @@ def test_make_transaction_other_api_key_in_memory() -> None:
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    transactions = TransactionsInMemory(users, wallets)
+    wallets = WalletsInMemory()
+    transactions = TransactionsInMemory(wallets)
 
     with pytest.raises(WalletPermissionError):
         transactions.make_transaction(
-            user2.api_key,
-            wallets.create(user1.api_key).address,
-            wallets.create(user2.api_key).address,
-            0.5,
+            user2,
+            wallets.create(user1).address,
+            wallets.create(user2).address,
+            50_000_000,
         )
 
 
 def test_make_transaction_unknown_wallet_address_in_memory() -> None:
     users = UsersInMemory()
-    wallets = WalletsInMemory(users)
+    wallets = WalletsInMemory()
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
 
     with pytest.raises(WalletDoesNotExistError):
         transactions.make_transaction(
-            users.create("test@gmail.com").api_key, uuid4(), uuid4(), 0.5
+            users.create("test@gmail.com"), uuid4(), uuid4(), 50_000_000
         )
 
 
-def test_make_transaction_unknown_api_key_in_memory() -> None:
+def test_read_all_transactions_empty_in_memory() -> None:
     users = UsersInMemory()
+    user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
+    wallets = WalletsInMemory()
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
 
-    with pytest.raises(InvalidApiKeyError):
-        transactions.make_transaction(generate_api_key(), uuid4(), uuid4(), 0.5)
+    assert transactions.read_all(user) == []
 
 
-def test_read_all_transactions_empty_in_memory() -> None:
+def test_read_all_transactions_in_memory() -> None:
     users = UsersInMemory()
-    user = users.create("test@gmail.com")
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
+    transaction1 = transactions.make_transaction(
+        user1, wallet1.address, wallet2.address, 50_000_000
+    )
+    transaction2 = transactions.make_transaction(
+        user2, wallet2.address, wallet1.address, 50_000_000
+    )
 
-    assert transactions.read_all(user.api_key) == []
+    assert transactions.read_all(user1) == [transaction1, transaction2]
 
 
-def test_read_all_transactions_in_memory() -> None:
+def test_get_wallet_transactions_unknown_wallet_address_in_memory() -> None:
+    users = UsersInMemory()
+    wallets = WalletsInMemory()
+
+    transactions = TransactionsInMemory(wallets)
+
+    with pytest.raises(WalletDoesNotExistError):
+        transactions.get_wallet_transactions(users.create("test@gmail.com"), uuid4())
+
+
+def test_get_wallet_transactions_other_api_key_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    transactions = TransactionsInMemory(wallets)
+
+    with pytest.raises(WalletPermissionError):
+        transactions.get_wallet_transactions(user2, wallets.create(user1).address)
+
+
+def test_get_wallet_transactions_in_memory() -> None:
     users = UsersInMemory()
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet1 = wallets.create(user1.api_key)
-    wallet2 = wallets.create(user2.api_key)
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
     transaction1 = transactions.make_transaction(
-        user1.api_key, wallet1.address, wallet2.address, 0.5
+        user1, wallet1.address, wallet2.address, 50_000_000
     )
     transaction2 = transactions.make_transaction(
-        user2.api_key, wallet2.address, wallet1.address, 0.5
+        user2, wallet2.address, wallet1.address, 50_000_000
     )
 
-    assert transactions.read_all(user1.api_key) == [transaction1, transaction2]
+    assert transactions.get_wallet_transactions(user1, wallet1.address) == [
+        transaction1,
+        transaction2,
+    ]
 
 
-def test_read_all_transactions_unknown_api_key_in_memory() -> None:
+def test_read_all_transactions_between_own_wallets_once_in_memory() -> None:
     users = UsersInMemory()
-    wallets = WalletsInMemory(users)
-    transactions = TransactionsInMemory(users, wallets)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
 
-    with pytest.raises(InvalidApiKeyError):
-        transactions.read_all(generate_api_key())
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user1)
+    wallet3 = wallets.create(user2)
 
+    transactions = TransactionsInMemory(wallets)
+    transaction1 = transactions.make_transaction(
+        user1, wallet1.address, wallet2.address, 50_000_000
+    )
+    transaction2 = transactions.make_transaction(
+        user2, wallet3.address, wallet2.address, 50_000_000
+    )
 
-def test_get_wallet_transactions_unknown_api_key_in_memory() -> None:
+    assert transactions.read_all(user1) == [transaction1, transaction2]
+
+
+def test_transactions_are_indexed_by_address_and_user_in_memory() -> None:
     users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user1)
+    wallet3 = wallets.create(user2)
 
-    transactions = TransactionsInMemory(users, wallets)
+    transactions = TransactionsInMemory(wallets)
+    transactions.make_transaction(user1, wallet1.address, wallet2.address, 50_000_000)
+    transactions.make_transaction(user1, wallet2.address, wallet3.address, 50_000_000)
 
-    with pytest.raises(InvalidApiKeyError):
-        transactions.get_wallet_transactions(generate_api_key(), uuid4())
+    assert transactions.positions_by_address == {
+        wallet1.address: [0],
+        wallet2.address: [0, 1],
+        wallet3.address: [1],
+    }
+    assert transactions.positions_by_user == {user1.id: [0, 1], user2.id: [1]}
 
 
-def test_get_wallet_transactions_unknown_wallet_address_in_memory() -> None:
+def test_read_transactions_after_cursor_in_memory() -> None:
     users = UsersInMemory()
-    wallets = WalletsInMemory(users)
+    user = users.create("test@gmail.com")
 
-    transactions = TransactionsInMemory(users, wallets)
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
 
-    with pytest.raises(WalletDoesNotExistError):
-        transactions.get_wallet_transactions(
-            users.create("test@gmail.com").api_key, uuid4()
+    transactions = TransactionsInMemory(wallets)
+    made = [
+        transactions.make_transaction(
+            user, wallet1.address, wallet2.address, 10_000_000
         )
+        for _ in range(3)
+    ]
 
+    assert [transaction.id for transaction in made] == [1, 2, 3]
+    assert transactions.read_all(user, 1, 1) == [made[1]]
+    assert transactions.get_wallet_transactions(user, wallet2.address, 1) == made[1:]
 
-def test_get_wallet_transactions_other_api_key_in_memory() -> None:
+
+def test_iter_transactions_in_memory() -> None:
     users = UsersInMemory()
-    user1 = users.create("test@gmail.com")
-    user2 = users.create("test1@gmail.com")
+    user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    transactions = TransactionsInMemory(users, wallets)
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
 
-    with pytest.raises(WalletPermissionError):
-        transactions.get_wallet_transactions(
-            user2.api_key, wallets.create(user1.api_key).address
+    transactions = TransactionsInMemory(wallets)
+    made = [
+        transactions.make_transaction(
+            user, wallet1.address, wallet2.address, 10_000_000
         )
+        for _ in range(3)
+    ]
 
+    assert list(transactions.iter_all(user)) == made
+    assert list(transactions.iter_wallet_transactions(user, wallet1.address)) == made
 
-def test_get_wallet_transactions_in_memory() -> None:
+
+def test_make_transactions_atomic_in_memory() -> None:
     users = UsersInMemory()
-    user1 = users.create("test@gmail.com")
-    user2 = users.create("test1@gmail.com")
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+
+    transactions = TransactionsInMemory(wallets)
+    results = transactions.make_transactions(
+        user,
+        [
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+            Transfer(wallet2.address, wallet1.address, 150_000_000),
+        ],
+    )
 
-    wallets = WalletsInMemory(users)
-    wallet1 = wallets.create(user1.api_key)
-    wallet2 = wallets.create(user2.api_key)
+    assert transactions.read_all(user) == results
+    assert [transaction.id for transaction in transactions.read_all(user)] == [1, 2]
+    assert transactions.total_transactions == 2
+    assert wallet1.balance == 190_000_000
+    assert wallet2.balance == 10_000_000
 
-    transactions = TransactionsInMemory(users, wallets)
-    transaction1 = transactions.make_transaction(
-        user1.api_key, wallet1.address, wallet2.address, 0.5
+
+def test_make_transactions_atomic_rolls_back_batch_in_memory() -> None:
+    users = UsersInMemory()
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+
+    transactions = TransactionsInMemory(wallets)
+    results = transactions.make_transactions(
+        user,
+        [
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+        ],
     )
-    transaction2 = transactions.make_transaction(
-        user2.api_key, wallet2.address, wallet1.address, 0.5
+
+    assert results == [BatchRolledBackError(), NotEnoughBitcoinError(wallet1.address)]
+    assert transactions.read_all(user) == []
+    assert wallet1.balance == 100_000_000
+    assert wallet2.balance == 100_000_000
+
+
+def test_make_transactions_best_effort_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsInMemory(wallets)
+    results = transactions.make_transactions(
+        user1,
+        [
+            Transfer(wallet2.address, wallet1.address, 10_000_000),
+            Transfer(wallet1.address, wallet2.address, 100_000_000),
+        ],
+        atomic=False,
     )
 
-    assert transactions.get_wallet_transactions(user1.api_key, wallet1.address) == [
-        transaction1,
-        transaction2,
-    ]
+    assert results[0] == WalletPermissionError(wallet2.address)
+    assert transactions.read_all(user1) == [results[1]]
+    assert wallet1.balance == 0
+    assert wallet2.balance == 198_500_000
+
+
+def test_concurrent_transactions_do_not_double_spend_in_memory() -> None:
+    users = UsersInMemory()
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsInMemory()
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
+
+    transactions = TransactionsInMemory(wallets)
+
+    def transfer(_: int) -> bool:
+        try:
+            transactions.make_transaction(
+                user, from_wallet.address, to_wallet.address, 1_000_000
+            )
+            return True
+        except NotEnoughBitcoinError:
+            return False
+
+    with ThreadPoolExecutor(8) as executor:
+        made = sum(executor.map(transfer, range(200)))
+
+    assert made == 100
+    assert from_wallet.balance == 0
+    assert to_wallet.balance == 200_000_000
+    assert [t.id for t in transactions.read_all(user)] == list(range(1, 101))
+
+
+def test_read_transactions_while_writing_in_memory() -> None:
+    users = UsersInMemory()
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsInMemory()
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
+
+    transactions = TransactionsInMemory(wallets)
+    writing = Event()
+    writing.set()
+
+    def write() -> None:
+        try:
+            for _ in range(2_000):
+                transactions.make_transaction(
+                    user, from_wallet.address, to_wallet.address, 1
+                )
+        finally:
+            writing.clear()
+
+    def read() -> int:
+        reads = 0
+        while writing.is_set():
+            transactions.read_all(user)
+            transactions.get_wallet_transactions(user, from_wallet.address)
+            list(transactions.iter_all(user))
+            reads += 1
+        return reads
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(3) as executor:
+            readers = [executor.submit(read) for _ in range(2)]
+            executor.submit(write).result()
+            assert all(reader.result() > 0 for reader in readers)
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert len(transactions.read_all(user)) == 2_000
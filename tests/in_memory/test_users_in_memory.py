@@ -38,3 +38,13 @@ def test_invalid_api_key_in_memory() -> None:
 
     with pytest.raises(InvalidApiKeyError):
         users.try_authorization(generate_api_key())
+
+
+def test_authorization_among_many_users_in_memory() -> None:
+    users = UsersInMemory()
+    created = [users.create(f"test{i}@gmail.com") for i in range(100)]
+
+    for user in created:
+        assert users.try_authorization(user.api_key) == user
+    with pytest.raises(EmailAlreadyExistError):
+        users.create("test42@gmail.com")
@@ -4,13 +4,11 @@ from uuid import uuid4
 import pytest
 
 from core.errors import (
-    InvalidApiKeyError,
     WalletDoesNotExistError,
     WalletPermissionError,
     WalletsLimitError,
 )
-from core.user import generate_api_key
-from infra.constants import STARTING_BITCOIN_AMOUNT, WALLETS_LIMIT
+from infra.constants import STARTING_SATOSHI_AMOUNT, WALLETS_LIMIT
 from infra.in_memory.users import UsersInMemory
 from infra.in_memory.wallets import WalletsInMemory
 
@@ -19,64 +17,46 @@ def test_create_wallet_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsInMemory()
+    wallet = wallets.create(user)
 
     assert wallet.user_id == user.id
     assert wallet.address == ANY
-    assert wallet.balance == STARTING_BITCOIN_AMOUNT
+    assert wallet.balance == STARTING_SATOSHI_AMOUNT
 
 
 def test_create_wallet_reach_limit_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
+    wallets = WalletsInMemory()
     for i in range(WALLETS_LIMIT):
-        wallets.create(user.api_key)
+        wallets.create(user)
 
     with pytest.raises(WalletsLimitError):
-        wallets.create(user.api_key)
-
-
-def test_create_wallet_with_unknown_key_in_memory() -> None:
-    wallets = WalletsInMemory(UsersInMemory())
-
-    with pytest.raises(InvalidApiKeyError):
-        wallets.create(generate_api_key())
+        wallets.create(user)
 
 
 def test_read_wallet_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsInMemory()
+    wallet = wallets.create(user)
 
-    result_wallet = wallets.read(wallet.address, user.api_key)
+    result_wallet = wallets.read(wallet.address, user)
 
     assert result_wallet == wallet
 
 
-def test_read_wallet_with_wrong_key_in_memory() -> None:
-    users = UsersInMemory()
-    user = users.create("test@gmail.com")
-
-    wallets = WalletsInMemory(users)
-    wallet = wallets.create(user.api_key)
-
-    with pytest.raises(InvalidApiKeyError):
-        wallets.read(wallet.address, generate_api_key())
-
-
 def test_read_unknown_wallet_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
+    wallets = WalletsInMemory()
 
     with pytest.raises(WalletDoesNotExistError):
-        wallets.read(uuid4(), user.api_key)
+        wallets.read(uuid4(), user)
 
 
 def test_read_others_wallet_in_memory() -> None:
@@ -84,11 +64,11 @@ def test_read_others_wallet_in_memory() -> None:
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet = wallets.create(user1.api_key)
+    wallets = WalletsInMemory()
+    wallet = wallets.create(user1)
 
     with pytest.raises(WalletPermissionError):
-        wallets.read(wallet.address, user2.api_key)
+        wallets.read(wallet.address, user2)
 
 
 def test_read_wallet_ignore_permission_in_memory() -> None:
@@ -96,38 +76,73 @@ def test_read_wallet_ignore_permission_in_memory() -> None:
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet = wallets.create(user1.api_key)
+    wallets = WalletsInMemory()
+    wallet = wallets.create(user1)
 
-    result_wallet = wallets.read(wallet.address, user2.api_key, False)
+    result_wallet = wallets.read(wallet.address, user2, False)
     assert result_wallet == wallet
 
 
 def test_update_balance_in_memory() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
-    wallets = WalletsInMemory(users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsInMemory()
+    wallet = wallets.create(user)
     wallets.update_balance(wallet.address, 100)
 
-    assert wallets.read(wallet.address, user.api_key).get_balance() == 100
+    assert wallets.read(wallet.address, user).balance == 100
 
 
 def test_read_all() -> None:
     users = UsersInMemory()
     user = users.create("test@gmail.com")
 
-    wallets = WalletsInMemory(users)
-    wallet1 = wallets.create(user.api_key)
-    wallet2 = wallets.create(user.api_key)
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
 
     wallets.update_balance(wallet1.address, 100)
     wallets.update_balance(wallet2.address, 200)
 
-    all_wallets = wallets.read_all(user.api_key)
+    all_wallets = wallets.read_all(user)
 
     assert len(all_wallets) == 2
-    assert all_wallets[0].get_balance() == 100
-    assert all_wallets[1].get_balance() == 200
+    assert all_wallets[0].balance == 100
+    assert all_wallets[1].balance == 200
     assert all_wallets[1] == wallet2
     assert all_wallets[0] == wallet1
+
+
+def test_wallets_are_indexed_by_user_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+    wallet3 = wallets.create(user1)
+
+    assert wallets.addresses_by_user == {
+        user1.id: [wallet1.address, wallet3.address],
+        user2.id: [wallet2.address],
+    }
+
+
+def test_read_many_wallets_in_memory() -> None:
+    users = UsersInMemory()
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user1)
+    wallet3 = wallets.create(user2)
+
+    assert wallets.read_many(
+        [wallet2.address, wallet1.address, wallet2.address], user1
+    ) == [wallet2, wallet1]
+    with pytest.raises(WalletPermissionError):
+        wallets.read_many([wallet1.address, wallet3.address], user1)
+    with pytest.raises(WalletDoesNotExistError):
+        wallets.read_many([wallet1.address, uuid4()], user1)
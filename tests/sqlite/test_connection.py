@@ -1,10 +1,151 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sqlite3 import Connection, ProgrammingError, connect
 
-from infra.constants import SQL_FILE_TEST
-from infra.sqlite.database_connect import Database
+import pytest
+
+from infra.constants import DATABASE_NAME, SQL_FILE, SQL_FILE_TEST
+from infra.sqlite.database_connect import SQLITE_PROFILES, Database
+from infra.sqlite.users import UsersDatabase
 
 
 def test_database_initial_and_close_successful() -> None:
     db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
     db.initial()
     db.close_database()
+
+
+def test_committed_database_matches_start_up_sql() -> None:
+    schema_sql = "SELECT TYPE, NAME, SQL FROM SQLITE_MASTER ORDER BY TYPE, NAME"
+    db = Database(":memory:", os.path.abspath(SQL_FILE))
+    db.initial()
+    committed = connect(f"file:{os.path.abspath(DATABASE_NAME)}?mode=ro", uri=True)
+
+    try:
+        assert committed.execute(schema_sql).fetchall() == (
+            db.get_cursor().execute(schema_sql).fetchall()
+        )
+    finally:
+        committed.close()
+        db.close_database()
+
+
+def test_each_thread_gets_own_connection() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+
+    with ThreadPoolExecutor(1) as executor:
+        other_connection = executor.submit(db.get_connection).result()
+
+    assert db.get_connection() is db.get_connection()
+    assert db.get_connection() is not other_connection
+    assert db.get_cursor().connection is db.get_connection()
+    db.close_database()
+
+
+def test_memory_database_is_shared_between_threads() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(users.try_authorization, [user.api_key] * 8))
+
+    assert results == [user] * 8
+    db.close_database()
+
+
+def test_close_database_closes_every_connection() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    with ThreadPoolExecutor(1) as executor:
+        other_connection: Connection = executor.submit(db.get_connection).result()
+
+    db.close_database()
+
+    with pytest.raises(ProgrammingError):
+        other_connection.execute("SELECT 1")
+
+
+def test_performance_profile_is_applied(tmp_path: Path) -> None:
+    db = Database(
+        str(tmp_path / "main.db"),
+        os.path.abspath(SQL_FILE_TEST),
+        SQLITE_PROFILES["performance"],
+    )
+    cur = db.get_cursor()
+
+    assert cur.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert cur.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert cur.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    assert cur.execute("PRAGMA temp_store").fetchone()[0] == 2
+    assert cur.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    assert cur.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    db.close_database()
+
+
+def test_default_profile_keeps_rollback_journal(tmp_path: Path) -> None:
+    db = Database(str(tmp_path / "main.db"), os.path.abspath(SQL_FILE_TEST))
+    cur = db.get_cursor()
+
+    assert cur.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert cur.execute("PRAGMA synchronous").fetchone()[0] == 2
+    db.close_database()
+
+
+def test_transaction_commits_on_success() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+
+    with db.transaction() as cur:
+        cur.execute("INSERT INTO USERS VALUES ('id', 'test@gmail.com', 'key')")
+        assert db.get_connection().in_transaction
+
+    assert not db.get_connection().in_transaction
+    assert db.get_cursor().execute("SELECT COUNT() FROM USERS").fetchone()[0] == 1
+    db.close_database()
+
+
+def test_transaction_rolls_back_on_error() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+
+    with pytest.raises(RuntimeError):
+        with db.transaction() as cur:
+            cur.execute("INSERT INTO USERS VALUES ('id', 'test@gmail.com', 'key')")
+            raise RuntimeError()
+
+    assert not db.get_connection().in_transaction
+    assert db.get_cursor().execute("SELECT COUNT() FROM USERS").fetchone()[0] == 0
+    db.close_database()
+
+
+def test_nested_transaction_commits_with_outer_transaction() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.transaction() as cur:
+                cur.execute("INSERT INTO USERS VALUES ('id', 'test@gmail.com', 'key')")
+            assert db.get_connection().in_transaction
+            raise RuntimeError()
+
+    assert db.get_cursor().execute("SELECT COUNT() FROM USERS").fetchone()[0] == 0
+    db.close_database()
+
+
+def test_nested_transaction_rolls_back_to_savepoint() -> None:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+
+    with db.transaction() as cur:
+        cur.execute("INSERT INTO USERS VALUES ('id', 'test@gmail.com', 'key')")
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                cur.execute("INSERT INTO USERS VALUES ('id1', 'test1@gmail.com', 'k')")
+                raise RuntimeError()
+        assert db.get_connection().in_transaction
+
+    assert db.get_cursor().execute("SELECT ID FROM USERS").fetchall() == [("id",)]
+    db.close_database()
@@ -0,0 +1,111 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.errors import NotEnoughBitcoinError
+from core.transaction import Transfer
+from infra.constants import SQL_FILE_TEST
+from infra.sqlite.database_connect import Database
+from infra.sqlite.group_commit import GroupCommitTransactions
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+
+@pytest.fixture
+def db() -> Database:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+    return db
+
+
+def test_group_commit_makes_transactions_in_shared_commits(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
+
+    transactions = GroupCommitTransactions(TransactionsDataBase(db, wallets), 0.05)
+    with ThreadPoolExecutor(8) as executor:
+        made = list(
+            executor.map(
+                lambda _: transactions.make_transaction(
+                    user, from_wallet.address, to_wallet.address, 1_000_000
+                ),
+                range(16),
+            )
+        )
+    transactions.close()
+
+    assert sorted(transaction.id for transaction in made) == list(range(1, 17))
+    assert transactions.commits < 16
+    assert transactions.read_all(user) == sorted(made, key=lambda t: t.id)
+    assert wallets.read(from_wallet.address, user).balance == 84_000_000
+    assert wallets.read(to_wallet.address, user).balance == 116_000_000
+
+
+def test_group_commit_failed_write_does_not_affect_batch(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
+
+    transactions = GroupCommitTransactions(TransactionsDataBase(db, wallets), 0.05)
+    with ThreadPoolExecutor(2) as executor:
+        failed = executor.submit(
+            transactions.make_transaction,
+            user,
+            from_wallet.address,
+            to_wallet.address,
+            150_000_000,
+        )
+        made = executor.submit(
+            transactions.make_transactions,
+            user,
+            [Transfer(from_wallet.address, to_wallet.address, 10_000_000)],
+        )
+
+        with pytest.raises(NotEnoughBitcoinError):
+            failed.result()
+        assert len(made.result()) == 1
+    transactions.close()
+
+    assert wallets.read(from_wallet.address, user).balance == 90_000_000
+    assert wallets.read(to_wallet.address, user).balance == 110_000_000
+
+
+def test_group_commit_close_flushes_pending_writes(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
+
+    transactions = GroupCommitTransactions(TransactionsDataBase(db, wallets), 10.0)
+    with ThreadPoolExecutor(1) as executor:
+        pending = executor.submit(
+            transactions.make_transaction,
+            user,
+            from_wallet.address,
+            to_wallet.address,
+            10_000_000,
+        )
+        time.sleep(0.1)
+        transactions.close()
+
+        assert pending.result().id == 1
+        assert transactions.commits == 1
+
+    transaction = transactions.make_transaction(
+        user, from_wallet.address, to_wallet.address, 10_000_000
+    )
+
+    assert transaction.id == 2
+    assert wallets.read(from_wallet.address, user).balance == 80_000_000
@@ -0,0 +1,106 @@
+import os
+from datetime import datetime
+from typing import Iterator
+
+import pytest
+
+from core.statistic import Granularity
+from infra.constants import ADMIN_API_KEY, SQL_FILE_TEST
+from infra.sqlite.database_connect import Database
+from infra.sqlite.statistics import StatisticsDatabase
+from infra.sqlite.transactions import TransactionsDataBase
+from infra.sqlite.users import UsersDatabase
+from infra.sqlite.wallets import WalletsDatabase
+
+
+@pytest.fixture
+def db() -> Iterator[Database]:
+    db = Database(":memory:", os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+    yield db
+    db.close_database()
+
+
+def record_queries(db: Database) -> list[str]:
+    queries: list[str] = []
+    db.get_connection().set_trace_callback(queries.append)
+    return queries
+
+
+def full_scans(db: Database, queries: list[str]) -> list[str]:
+    db.get_connection().set_trace_callback(None)
+    scans: list[str] = []
+    for query in queries:
+        if not query.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+        plan = db.get_cursor().execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+        scans.extend(f"{detail}: {query}" for *_, detail in plan if "SCAN" in detail)
+    return scans
+
+
+def test_users_queries_use_indexes(db: Database) -> None:
+    users = UsersDatabase(db)
+    queries = record_queries(db)
+
+    users.try_authorization(users.create("test@gmail.com").api_key)
+
+    assert queries
+    assert full_scans(db, queries) == []
+
+
+def test_wallets_queries_use_indexes(db: Database) -> None:
+    user = UsersDatabase(db).create("test@gmail.com")
+    wallets = WalletsDatabase(db)
+    queries = record_queries(db)
+
+    wallet = wallets.create(user)
+    wallets.read(wallet.address, user)
+    wallets.update_balance(wallet.address, 50_000_000)
+    wallets.read_all(user)
+    wallets.read_many([wallet.address], user)
+
+    assert queries
+    assert full_scans(db, queries) == []
+
+
+def test_transactions_queries_use_indexes(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+    transactions = TransactionsDataBase(db, wallets)
+    queries = record_queries(db)
+
+    transactions.make_transaction(user1, wallet1.address, wallet2.address, 50_000_000)
+    transactions.read_all(user1)
+    transactions.get_wallet_transactions(user1, wallet1.address)
+
+    assert queries
+    assert full_scans(db, queries) == []
+
+
+def test_statistics_queries_use_indexes(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+    transactions = TransactionsDataBase(db, wallets)
+    transactions.make_transaction(user1, wallet1.address, wallet2.address, 50_000_000)
+    statistics = StatisticsDatabase(db, transactions)
+    queries = record_queries(db)
+
+    statistics.get_statistic(ADMIN_API_KEY)
+    statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.DAY)
+    statistics.get_statistic_buckets(
+        ADMIN_API_KEY,
+        Granularity.HOUR,
+        datetime(2026, 1, 31, 23, 30),
+        datetime(2026, 2, 1, 0, 30),
+    )
+
+    assert queries
+    assert full_scans(db, queries) == []
@@ -1,9 +1,10 @@
 import os
+from datetime import datetime, timezone
 
 import pytest
 
 from core.errors import InvalidApiKeyError
-from core.statistic import Statistic
+from core.statistic import Granularity, Statistic, StatisticBucket
 from core.user import generate_api_key
 from infra.constants import ADMIN_API_KEY, SQL_FILE_TEST
 from infra.sqlite.database_connect import Database
@@ -21,43 +22,162 @@ def db() -> Database:
 
 
 def test_get_empty_statistics_in_memory(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
-    statistics = StatisticsDatabase(db.get_connection(), db.get_cursor(), transactions)
+    wallets = WalletsDatabase(db)
+    transactions = TransactionsDataBase(db, wallets)
+    statistics = StatisticsDatabase(db, transactions)
 
-    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(0, 0.0)
+    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(0, 0)
 
 
 def test_get_statistics_in_memory(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet1 = wallets.create(user1.api_key)
-    wallet2 = wallets.create(user2.api_key)
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
-    transactions.make_transaction(user1.api_key, wallet1.address, wallet2.address, 1)
-    transactions.make_transaction(user2.api_key, wallet2.address, wallet1.address, 1)
+    transactions = TransactionsDataBase(db, wallets)
+    transactions.make_transaction(user1, wallet1.address, wallet2.address, 100_000_000)
+    transactions.make_transaction(user2, wallet2.address, wallet1.address, 100_000_000)
 
-    statistics = StatisticsDatabase(db.get_connection(), db.get_cursor(), transactions)
+    statistics = StatisticsDatabase(db, transactions)
 
-    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(2, 0.03)
+    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(2, 3_000_000)
 
 
 def test_get_statistics_unknown_api_key_in_memory(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
-    statistics = StatisticsDatabase(db.get_connection(), db.get_cursor(), transactions)
+    wallets = WalletsDatabase(db)
+    transactions = TransactionsDataBase(db, wallets)
+    statistics = StatisticsDatabase(db, transactions)
 
     with pytest.raises(InvalidApiKeyError):
         statistics.get_statistic(generate_api_key())
+
+
+def test_recompute_statistics_repairs_counters(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsDataBase(db, wallets)
+    transactions.make_transaction(user1, wallet1.address, wallet2.address, 100_000_000)
+
+    statistics = StatisticsDatabase(db, transactions)
+    db.get_cursor().execute("UPDATE STATISTICS SET TOTAL_TRANSACTIONS = 7")
+
+    assert statistics.recompute_statistic(ADMIN_API_KEY) == Statistic(1, 1_500_000)
+    assert statistics.get_statistic(ADMIN_API_KEY) == Statistic(1, 1_500_000)
+
+
+def test_recompute_statistics_unknown_api_key(db: Database) -> None:
+    wallets = WalletsDatabase(db)
+    transactions = TransactionsDataBase(db, wallets)
+    statistics = StatisticsDatabase(db, transactions)
+
+    with pytest.raises(InvalidApiKeyError):
+        statistics.recompute_statistic(generate_api_key())
+
+
+def test_get_statistic_buckets(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsDataBase(db, wallets)
+    statistics = StatisticsDatabase(db, transactions)
+    for created_at, fee in [
+        (datetime(2026, 1, 31, 23, 30, tzinfo=timezone.utc), 1),
+        (datetime(2026, 2, 1, 0, 10, tzinfo=timezone.utc), 2),
+        (datetime(2026, 2, 1, 0, 50, tzinfo=timezone.utc), 3),
+    ]:
+        db.get_cursor().execute(
+            "INSERT INTO TRANSACTIONS (FROM_ADDRESS, TO_ADDRESS, AMOUNT, FEE, "
+            "CREATED_AT) VALUES (?, ?, 1, ?, ?)",
+            (str(wallet1.address), str(wallet2.address), fee, created_at.timestamp()),
+        )
+
+    assert statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.HOUR) == [
+        StatisticBucket(datetime(2026, 1, 31, 23, tzinfo=timezone.utc), 1, 1),
+        StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 2, 5),
+    ]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY, Granularity.MONTH, datetime(2026, 2, 1)
+    ) == [StatisticBucket(datetime(2026, 2, 1, tzinfo=timezone.utc), 2, 5)]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY, Granularity.DAY, end=datetime(2026, 2, 1)
+    ) == [StatisticBucket(datetime(2026, 1, 31, tzinfo=timezone.utc), 1, 1)]
+
+    db.get_cursor().execute("DELETE FROM STATISTICS_ROLLUPS")
+    statistics.recompute_statistic(ADMIN_API_KEY)
+
+    assert statistics.get_statistic_buckets(ADMIN_API_KEY, Granularity.DAY) == [
+        StatisticBucket(datetime(2026, 1, 31, tzinfo=timezone.utc), 1, 1),
+        StatisticBucket(datetime(2026, 2, 1, tzinfo=timezone.utc), 2, 5),
+    ]
+
+
+def test_get_statistic_buckets_with_unaligned_bounds(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsDataBase(db, wallets)
+    statistics = StatisticsDatabase(db, transactions)
+    for created_at, fee in [
+        (datetime(2026, 1, 31, 23, 30, tzinfo=timezone.utc), 1),
+        (datetime(2026, 2, 1, 0, 10, tzinfo=timezone.utc), 2),
+        (datetime(2026, 2, 1, 0, 50, tzinfo=timezone.utc), 3),
+    ]:
+        db.get_cursor().execute(
+            "INSERT INTO TRANSACTIONS (FROM_ADDRESS, TO_ADDRESS, AMOUNT, FEE, "
+            "CREATED_AT) VALUES (?, ?, 1, ?, ?)",
+            (str(wallet1.address), str(wallet2.address), fee, created_at.timestamp()),
+        )
+
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY, Granularity.HOUR, datetime(2026, 2, 1, 0, 30)
+    ) == [StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 1, 3)]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY,
+        Granularity.HOUR,
+        datetime(2026, 1, 31, 23),
+        datetime(2026, 2, 1, 0, 30),
+    ) == [
+        StatisticBucket(datetime(2026, 1, 31, 23, tzinfo=timezone.utc), 1, 1),
+        StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 1, 2),
+    ]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY,
+        Granularity.HOUR,
+        datetime(2026, 2, 1, 0, 5),
+        datetime(2026, 2, 1, 0, 20),
+    ) == [StatisticBucket(datetime(2026, 2, 1, 0, tzinfo=timezone.utc), 1, 2)]
+    assert statistics.get_statistic_buckets(
+        ADMIN_API_KEY,
+        Granularity.MONTH,
+        datetime(2026, 1, 31, 23, 45),
+        datetime(2026, 2, 1, 0, 45),
+    ) == [StatisticBucket(datetime(2026, 2, 1, tzinfo=timezone.utc), 1, 2)]
+
+
+def test_get_statistic_buckets_unknown_api_key(db: Database) -> None:
+    wallets = WalletsDatabase(db)
+    transactions = TransactionsDataBase(db, wallets)
+    statistics = StatisticsDatabase(db, transactions)
+
+    with pytest.raises(InvalidApiKeyError):
+        statistics.get_statistic_buckets(generate_api_key(), Granularity.DAY)
@@ -1,17 +1,21 @@
 import os
-from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import ANY, patch
+from uuid import UUID, uuid4
 
 import pytest
 
 from core.errors import (
-    InvalidApiKeyError,
+    BatchRolledBackError,
     NotEnoughBitcoinError,
     TransactionBetweenSameWalletError,
     WalletDoesNotExistError,
     WalletPermissionError,
 )
-from core.user import generate_api_key
-from infra.constants import MINIMUM_AMOUNT_OF_BITCOIN, SQL_FILE_TEST
+from core.transaction import Transaction, Transfer
+from core.user import User
+from infra.constants import SQL_FILE_TEST
 from infra.sqlite.database_connect import Database
 from infra.sqlite.transactions import TransactionsDataBase
 from infra.sqlite.users import UsersDatabase
@@ -26,322 +30,561 @@ def db() -> Database:
 
 
 def test_make_transaction(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    from_wallet = wallets.create(user.api_key)
-    to_wallet = wallets.create(user.api_key)
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
     transaction = transactions.make_transaction(
-        user.api_key, from_wallet.address, to_wallet.address, 0.5
+        user, from_wallet.address, to_wallet.address, 50_000_000
     )
-    from_wallet = wallets.read(from_wallet.address, user.api_key, False)
-    to_wallet = wallets.read(to_wallet.address, user.api_key, False)
+    from_wallet = wallets.read(from_wallet.address, user, False)
+    to_wallet = wallets.read(to_wallet.address, user, False)
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    assert transaction.transaction_amount == 0.5
+    assert transaction.transaction_amount == 50_000_000
     assert transaction.transaction_fee == 0
 
-    assert from_wallet.get_balance() == 0.5
-    assert to_wallet.get_balance() == 1.5
+    assert from_wallet.balance == 50_000_000
+    assert to_wallet.balance == 150_000_000
     db.close_database()
 
 
 def test_make_transaction_between_two_users(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    from_wallet = wallets.create(user1.api_key)
-    to_wallet = wallets.create(user2.api_key)
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user1)
+    to_wallet = wallets.create(user2)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
     transaction = transactions.make_transaction(
-        user1.api_key, from_wallet.address, to_wallet.address, 1
+        user1, from_wallet.address, to_wallet.address, 100_000_000
     )
-    from_wallet = wallets.read(from_wallet.address, user1.api_key, False)
-    to_wallet = wallets.read(to_wallet.address, user2.api_key, False)
+    from_wallet = wallets.read(from_wallet.address, user1, False)
+    to_wallet = wallets.read(to_wallet.address, user2, False)
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    assert transaction.transaction_amount == 1
-    assert transaction.transaction_fee == 0.015
-    assert from_wallet.get_balance() == 0
-    assert to_wallet.get_balance() == 1.985
+    assert transaction.transaction_amount == 100_000_000
+    assert transaction.transaction_fee == 1_500_000
+    assert from_wallet.balance == 0
+    assert to_wallet.balance == 198_500_000
     db.close_database()
 
 
 def test_transaction_less_then_one_satoshi(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    from_wallet = wallets.create(user1.api_key)
-    to_wallet = wallets.create(user2.api_key)
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user1)
+    to_wallet = wallets.create(user2)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
     transaction = transactions.make_transaction(
-        user1.api_key,
+        user1,
         from_wallet.address,
         to_wallet.address,
-        0.5 * MINIMUM_AMOUNT_OF_BITCOIN,
+        1,
     )
-    from_wallet = wallets.read(from_wallet.address, user1.api_key, False)
-    to_wallet = wallets.read(to_wallet.address, user2.api_key, False)
+    from_wallet = wallets.read(from_wallet.address, user1, False)
+    to_wallet = wallets.read(to_wallet.address, user2, False)
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    assert from_wallet.get_balance() == 1 - MINIMUM_AMOUNT_OF_BITCOIN
-    assert to_wallet.get_balance() == 1
+    assert from_wallet.balance == 99_999_999
+    assert to_wallet.balance == 100_000_000
 
 
 def test_double_transaction_with_less_then_one_satoshi_fee(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    from_wallet = wallets.create(user1.api_key)
-    to_wallet = wallets.create(user2.api_key)
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user1)
+    to_wallet = wallets.create(user2)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
     transaction = transactions.make_transaction(
-        user1.api_key,
+        user1,
         from_wallet.address,
         to_wallet.address,
-        1 - 2 * MINIMUM_AMOUNT_OF_BITCOIN,
+        99_999_998,
     )
-    from_wallet = wallets.read(from_wallet.address, user1.api_key, False)
-    to_wallet = wallets.read(to_wallet.address, user2.api_key, False)
+    from_wallet = wallets.read(from_wallet.address, user1, False)
+    to_wallet = wallets.read(to_wallet.address, user2, False)
     assert transaction.from_address == from_wallet.address
     assert transaction.to_address == to_wallet.address
-    from_wallet = wallets.read(from_wallet.address, user1.api_key, False)
-    to_wallet = wallets.read(to_wallet.address, user2.api_key, False)
-    assert from_wallet.get_balance() == 2 * MINIMUM_AMOUNT_OF_BITCOIN
-    assert to_wallet.get_balance() == 1.98499998
+    from_wallet = wallets.read(from_wallet.address, user1, False)
+    to_wallet = wallets.read(to_wallet.address, user2, False)
+    assert from_wallet.balance == 2
+    assert to_wallet.balance == 198_499_998
 
     transaction2 = transactions.make_transaction(
-        user1.api_key,
+        user1,
         from_wallet.address,
         to_wallet.address,
-        1.5 * MINIMUM_AMOUNT_OF_BITCOIN,
+        2,
     )
-    from_wallet = wallets.read(from_wallet.address, user1.api_key, False)
-    to_wallet = wallets.read(to_wallet.address, user2.api_key, False)
+    from_wallet = wallets.read(from_wallet.address, user1, False)
+    to_wallet = wallets.read(to_wallet.address, user2, False)
 
     assert transaction2.from_address == from_wallet.address
     assert transaction2.to_address == to_wallet.address
-    assert to_wallet.get_balance() == 1.98499999
-    assert from_wallet.get_balance() == 0
+    assert to_wallet.balance == 198_499_999
+    assert from_wallet.balance == 0
 
 
 def test_make_transaction_without_enough_balance(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    from_wallet = wallets.create(user.api_key)
-    to_wallet = wallets.create(user.api_key)
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
     with pytest.raises(NotEnoughBitcoinError):
         transactions.make_transaction(
-            user.api_key, from_wallet.address, to_wallet.address, 1.5
+            user, from_wallet.address, to_wallet.address, 150_000_000
         )
     db.close_database()
 
 
 def test_make_transaction_between_same_wallet(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsDatabase(db)
+    wallet = wallets.create(user)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
     with pytest.raises(TransactionBetweenSameWalletError):
-        transactions.make_transaction(user.api_key, wallet.address, wallet.address, 0.5)
+        transactions.make_transaction(user, wallet.address, wallet.address, 50_000_000)
     db.close_database()
 
 
 def test_make_transaction_other_api_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    wallets = WalletsDatabase(db)
+    transactions = TransactionsDataBase(db, wallets)
 
     with pytest.raises(WalletPermissionError):
         transactions.make_transaction(
-            user2.api_key,
-            wallets.create(user1.api_key).address,
-            wallets.create(user2.api_key).address,
-            0.5,
+            user2,
+            wallets.create(user1).address,
+            wallets.create(user2).address,
+            50_000_000,
         )
     db.close_database()
 
 
 def test_make_transaction_unknown_wallet_address(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    users = UsersDatabase(db)
+    wallets = WalletsDatabase(db)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
 
     with pytest.raises(WalletDoesNotExistError):
         transactions.make_transaction(
-            users.create("test@gmail.com").api_key, uuid4(), uuid4(), 0.5
+            users.create("test@gmail.com"), uuid4(), uuid4(), 50_000_000
         )
     db.close_database()
 
 
-def test_make_transaction_unknown_api_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+def test_read_all_transactions_empty(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    wallets = WalletsDatabase(db)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
 
-    with pytest.raises(InvalidApiKeyError):
-        transactions.make_transaction(generate_api_key(), uuid4(), uuid4(), 0.5)
+    assert transactions.read_all(user) == []
     db.close_database()
 
 
-def test_read_all_transactions_empty(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    user = users.create("test@gmail.com")
+def test_read_all_transactions(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
+    transactions = TransactionsDataBase(db, wallets)
+    transaction1 = transactions.make_transaction(
+        user1, wallet1.address, wallet2.address, 50_000_000
     )
+    transaction2 = transactions.make_transaction(
+        user2, wallet2.address, wallet1.address, 50_000_000
+    )
+    assert transactions.read_all(user1) == [transaction1, transaction2]
+    db.close_database()
+
 
-    assert transactions.read_all(user.api_key) == []
+def test_get_wallet_transactions_unknown_wallet_address(db: Database) -> None:
+    users = UsersDatabase(db)
+    wallets = WalletsDatabase(db)
+
+    transactions = TransactionsDataBase(db, wallets)
+
+    with pytest.raises(WalletDoesNotExistError):
+        transactions.get_wallet_transactions(users.create("test@gmail.com"), uuid4())
     db.close_database()
 
 
-def test_read_all_transactions(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+def test_get_wallet_transactions_other_api_key(db: Database) -> None:
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet1 = wallets.create(user1.api_key)
-    wallet2 = wallets.create(user2.api_key)
+    wallets = WalletsDatabase(db)
+    transactions = TransactionsDataBase(db, wallets)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    with pytest.raises(WalletPermissionError):
+        transactions.get_wallet_transactions(user2, wallets.create(user1).address)
+    db.close_database()
+
+
+def test_get_wallet_transactions(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user2)
+
+    transactions = TransactionsDataBase(db, wallets)
     transaction1 = transactions.make_transaction(
-        user1.api_key, wallet1.address, wallet2.address, 0.5
+        user1, wallet1.address, wallet2.address, 50_000_000
     )
     transaction2 = transactions.make_transaction(
-        user2.api_key, wallet2.address, wallet1.address, 0.5
+        user2, wallet2.address, wallet1.address, 50_000_000
     )
-    assert transactions.read_all(user1.api_key) == [transaction1, transaction2]
+
+    assert transactions.get_wallet_transactions(user1, wallet1.address) == [
+        transaction1,
+        transaction2,
+    ]
     db.close_database()
 
 
-def test_read_all_transactions_unknown_api_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
+def test_read_all_transactions_between_own_wallets_once(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user1)
+    wallet3 = wallets.create(user2)
+
+    transactions = TransactionsDataBase(db, wallets)
+    transaction1 = transactions.make_transaction(
+        user1, wallet1.address, wallet2.address, 50_000_000
+    )
+    transaction2 = transactions.make_transaction(
+        user2, wallet3.address, wallet2.address, 50_000_000
     )
 
-    with pytest.raises(InvalidApiKeyError):
-        transactions.read_all(generate_api_key())
+    assert transactions.read_all(user1) == [transaction1, transaction2]
     db.close_database()
 
 
-def test_get_wallet_transactions_unknown_api_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+def test_read_transactions_after_cursor(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    transactions = TransactionsDataBase(db, wallets)
+    made = [
+        transactions.make_transaction(
+            user, wallet1.address, wallet2.address, 10_000_000
+        )
+        for _ in range(3)
+    ]
 
-    with pytest.raises(InvalidApiKeyError):
-        transactions.get_wallet_transactions(generate_api_key(), uuid4())
-    db.close_database()
+    assert [transaction.id for transaction in made] == [1, 2, 3]
+    assert transactions.read_all(user, 1, 1) == [made[1]]
+    assert transactions.get_wallet_transactions(user, wallet2.address, 1) == made[1:]
 
 
-def test_get_wallet_transactions_unknown_wallet_address(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+def test_iter_transactions(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
 
-    with pytest.raises(WalletDoesNotExistError):
-        transactions.get_wallet_transactions(
-            users.create("test@gmail.com").api_key, uuid4()
+    transactions = TransactionsDataBase(db, wallets)
+    made = [
+        transactions.make_transaction(
+            user, wallet1.address, wallet2.address, 10_000_000
         )
+        for _ in range(3)
+    ]
+
+    assert list(transactions.iter_all(user)) == made
+    assert list(transactions.iter_wallet_transactions(user, wallet1.address)) == made
+
+
+def test_write_while_transactions_stream_is_open(tmp_path: Path) -> None:
+    db = Database(str(tmp_path / "main.db"), os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+    user = UsersDatabase(db).create("test@gmail.com")
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+
+    transactions = TransactionsDataBase(db, wallets)
+    made = [
+        transactions.make_transaction(user, wallet1.address, wallet2.address, 1_000)
+        for _ in range(3)
+    ]
+
+    def transfer() -> Transaction:
+        writer_db = Database(str(tmp_path / "main.db"), os.path.abspath(SQL_FILE_TEST))
+        try:
+            writer_wallets = WalletsDatabase(writer_db)
+            return TransactionsDataBase(writer_db, writer_wallets).make_transaction(
+                user, wallet1.address, wallet2.address, 1_000
+            )
+        finally:
+            writer_db.close_database()
+
+    with patch("infra.sqlite.transactions.TRANSACTIONS_STREAM_BATCH_SIZE", 2):
+        stream = transactions.iter_all(user)
+        assert next(stream) == made[0]
+        with ThreadPoolExecutor(1) as executor:
+            made.append(executor.submit(transfer).result(timeout=10))
+        assert [made[0], *stream] == made
     db.close_database()
 
 
-def test_get_wallet_transactions_other_api_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+def test_iter_wallet_transactions_checks_permission_eagerly(db: Database) -> None:
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
-    )
+    wallets = WalletsDatabase(db)
+    wallet = wallets.create(user1)
+
+    transactions = TransactionsDataBase(db, wallets)
 
     with pytest.raises(WalletPermissionError):
-        transactions.get_wallet_transactions(
-            user2.api_key, wallets.create(user1.api_key).address
-        )
-    db.close_database()
+        transactions.iter_wallet_transactions(user2, wallet.address)
 
 
-def test_get_wallet_transactions(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+def test_failed_transaction_leaves_balances_unchanged(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
+
+    transactions = TransactionsDataBase(db, wallets)
+    deposit = wallets.deposit
+
+    def deposit_then_fail(address: UUID, user: User, amount: int, fee: int) -> None:
+        deposit(address, user, amount, fee)
+        raise RuntimeError()
+
+    with patch.object(wallets, "deposit", deposit_then_fail):
+        with pytest.raises(RuntimeError):
+            transactions.make_transaction(
+                user, from_wallet.address, to_wallet.address, 50_000_000
+            )
+
+    assert wallets.read(from_wallet.address, user).balance == 100_000_000
+    assert wallets.read(to_wallet.address, user).balance == 100_000_000
+    assert transactions.read_all(user) == []
+
+
+def test_make_transactions_atomic(db: Database) -> None:
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet1 = wallets.create(user1.api_key)
-    wallet2 = wallets.create(user2.api_key)
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user1)
+    wallet3 = wallets.create(user2)
+
+    transactions = TransactionsDataBase(db, wallets)
+    results = transactions.make_transactions(
+        user1,
+        [
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+            Transfer(wallet2.address, wallet3.address, 150_000_000),
+        ],
+    )
+
+    assert results == [
+        Transaction(wallet1.address, wallet2.address, 60_000_000, 0, 1, ANY),
+        Transaction(wallet2.address, wallet3.address, 150_000_000, 2_250_000, 2, ANY),
+    ]
+    assert transactions.read_all(user1) == results
+    assert wallets.read(wallet1.address, user1).balance == 40_000_000
+    assert wallets.read(wallet2.address, user1).balance == 10_000_000
+    assert wallets.read(wallet3.address, user2).balance == 247_750_000
+
 
-    transactions = TransactionsDataBase(
-        db.get_connection(), db.get_cursor(), wallets, users
+def test_make_transactions_atomic_rolls_back_batch(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+
+    transactions = TransactionsDataBase(db, wallets)
+    results = transactions.make_transactions(
+        user,
+        [
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+        ],
     )
-    transaction1 = transactions.make_transaction(
-        user1.api_key, wallet1.address, wallet2.address, 0.5
+
+    assert results == [BatchRolledBackError(), NotEnoughBitcoinError(wallet1.address)]
+    assert transactions.read_all(user) == []
+    assert wallets.read(wallet1.address, user).balance == 100_000_000
+    assert wallets.read(wallet2.address, user).balance == 100_000_000
+
+
+def test_make_transactions_best_effort(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+
+    transactions = TransactionsDataBase(db, wallets)
+    unknown_address = uuid4()
+    results = transactions.make_transactions(
+        user,
+        [
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+            Transfer(wallet1.address, wallet1.address, 10_000_000),
+            Transfer(wallet1.address, unknown_address, 10_000_000),
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+            Transfer(wallet2.address, wallet1.address, 10_000_000),
+        ],
+        atomic=False,
     )
-    transaction2 = transactions.make_transaction(
-        user2.api_key, wallet2.address, wallet1.address, 0.5
+
+    assert results == [
+        Transaction(wallet1.address, wallet2.address, 60_000_000, 0, 1, ANY),
+        TransactionBetweenSameWalletError(),
+        WalletDoesNotExistError(unknown_address),
+        NotEnoughBitcoinError(wallet1.address),
+        Transaction(wallet2.address, wallet1.address, 10_000_000, 0, 2, ANY),
+    ]
+    assert transactions.read_all(user) == [results[0], results[4]]
+    assert wallets.read(wallet1.address, user).balance == 50_000_000
+    assert wallets.read(wallet2.address, user).balance == 150_000_000
+
+
+def test_make_transactions_updates_balances_relatively(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+
+    transactions = TransactionsDataBase(db, wallets)
+    queries: list[str] = []
+    db.get_connection().set_trace_callback(queries.append)
+    transactions.make_transactions(
+        user,
+        [
+            Transfer(wallet1.address, wallet2.address, 60_000_000),
+            Transfer(wallet2.address, wallet1.address, 10_000_000),
+        ],
+    )
+    db.get_connection().set_trace_callback(None)
+
+    updates = [query for query in queries if query.startswith("UPDATE WALLETS")]
+    assert sorted(updates) == sorted(
+        [
+            f"UPDATE WALLETS SET BALANCE = BALANCE + -50000000 "
+            f"WHERE ADDRESS = '{wallet1.address}'",
+            f"UPDATE WALLETS SET BALANCE = BALANCE + 50000000 "
+            f"WHERE ADDRESS = '{wallet2.address}'",
+        ]
     )
+    assert wallets.read(wallet1.address, user).balance == 50_000_000
+    assert wallets.read(wallet2.address, user).balance == 150_000_000
 
-    assert transactions.get_wallet_transactions(user1.api_key, wallet1.address) == [
-        transaction1,
-        transaction2,
+
+def test_make_transaction_does_not_read_wallets(db: Database) -> None:
+    users = UsersDatabase(db)
+    user = users.create("test@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    from_wallet = wallets.create(user)
+    to_wallet = wallets.create(user)
+
+    transactions = TransactionsDataBase(db, wallets)
+    queries: list[str] = []
+    db.get_connection().set_trace_callback(queries.append)
+    transactions.make_transaction(
+        user, from_wallet.address, to_wallet.address, 50_000_000
+    )
+    db.get_connection().set_trace_callback(None)
+
+    assert [query.split()[0] for query in queries if "WALLETS" in query] == [
+        "UPDATE",
+        "UPDATE",
     ]
+
+
+def test_transactions_from_separate_connections_do_not_double_spend(
+    tmp_path: Path,
+) -> None:
+    db = Database(str(tmp_path / "main.db"), os.path.abspath(SQL_FILE_TEST))
+    db.initial()
+    user = UsersDatabase(db).create("test@gmail.com")
+    from_wallet = WalletsDatabase(db).create(user)
+    to_wallet = WalletsDatabase(db).create(user)
+
+    def transfer(_: int) -> bool:
+        worker_db = Database(str(tmp_path / "main.db"), os.path.abspath(SQL_FILE_TEST))
+        worker_wallets = WalletsDatabase(worker_db)
+        try:
+            TransactionsDataBase(worker_db, worker_wallets).make_transaction(
+                user, from_wallet.address, to_wallet.address, 30_000_000
+            )
+            return True
+        except NotEnoughBitcoinError:
+            return False
+        finally:
+            worker_db.close_database()
+
+    with ThreadPoolExecutor(4) as executor:
+        made = sum(executor.map(transfer, range(8)))
+
+    wallets = WalletsDatabase(db)
+    assert made == 3
+    assert wallets.read(from_wallet.address, user).balance == 10_000_000
+    assert wallets.read(to_wallet.address, user).balance == 190_000_000
     db.close_database()
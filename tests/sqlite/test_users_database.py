@@ -18,7 +18,7 @@ def db() -> Database:
 
 
 def test_insert_user(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
     assert user.api_key == ANY
@@ -27,7 +27,7 @@ def test_insert_user(db: Database) -> None:
 
 
 def test_create_same_user_twice(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     email = "test@gmail.com"
     users.create(("%s" % email))
 
@@ -37,7 +37,7 @@ def test_create_same_user_twice(db: Database) -> None:
 
 
 def test_read_correct_user(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
     result_user = users.try_authorization(user.api_key)
@@ -47,7 +47,7 @@ def test_read_correct_user(db: Database) -> None:
 
 
 def test_invalid_api_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
 
     with pytest.raises(InvalidApiKeyError):
         users.try_authorization(generate_api_key())
@@ -5,13 +5,11 @@ from uuid import uuid4
 import pytest
 
 from core.errors import (
-    InvalidApiKeyError,
     WalletDoesNotExistError,
     WalletPermissionError,
     WalletsLimitError,
 )
-from core.user import generate_api_key
-from infra.constants import SQL_FILE_TEST, STARTING_BITCOIN_AMOUNT, WALLETS_LIMIT
+from infra.constants import SQL_FILE_TEST, STARTING_SATOSHI_AMOUNT, WALLETS_LIMIT
 from infra.sqlite.database_connect import Database
 from infra.sqlite.users import UsersDatabase
 from infra.sqlite.wallets import WalletsDatabase
@@ -25,133 +23,168 @@ def db() -> Database:
 
 
 def test_create_wallet(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsDatabase(db)
+    wallet = wallets.create(user)
 
     assert wallet.user_id == user.id
     assert wallet.address == ANY
-    assert wallet.get_balance() == STARTING_BITCOIN_AMOUNT
+    assert wallet.balance == STARTING_SATOSHI_AMOUNT
 
     db.close_database()
 
 
 def test_create_wallet_reach_limit(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    wallets = WalletsDatabase(db)
     for i in range(WALLETS_LIMIT):
-        wallets.create(user.api_key)
+        wallets.create(user)
 
     with pytest.raises(WalletsLimitError):
-        wallets.create(user.api_key)
-    db.close_database()
-
-
-def test_create_wallet_with_unknown_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-
-    with pytest.raises(InvalidApiKeyError):
-        wallets.create(generate_api_key())
+        wallets.create(user)
     db.close_database()
 
 
 def test_read_wallet(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsDatabase(db)
+    wallet = wallets.create(user)
 
-    result_wallet = wallets.read(wallet.address, user.api_key)
+    result_wallet = wallets.read(wallet.address, user)
 
     assert result_wallet == wallet
     db.close_database()
 
 
-def test_read_wallet_with_wrong_key(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
-    user = users.create("test@gmail.com")
-
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet = wallets.create(user.api_key)
-
-    with pytest.raises(InvalidApiKeyError):
-        wallets.read(wallet.address, generate_api_key())
-    db.close_database()
-
-
 def test_read_unknown_wallet(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    wallets = WalletsDatabase(db)
 
     with pytest.raises(WalletDoesNotExistError):
-        wallets.read(uuid4(), user.api_key)
+        wallets.read(uuid4(), user)
     db.close_database()
 
 
 def test_read_others_wallet(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    wallets = WalletsDatabase(db)
 
-    wallet = wallets.create(user1.api_key)
+    wallet = wallets.create(user1)
 
     with pytest.raises(WalletPermissionError):
-        wallets.read(wallet.address, user2.api_key)
+        wallets.read(wallet.address, user2)
     db.close_database()
 
 
 def test_read_wallet_ignore_permission(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user1 = users.create("test@gmail.com")
     user2 = users.create("test1@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
+    wallets = WalletsDatabase(db)
 
-    wallet = wallets.create(user1.api_key)
+    wallet = wallets.create(user1)
 
-    result_wallet = wallets.read(wallet.address, user2.api_key, False)
+    result_wallet = wallets.read(wallet.address, user2, False)
     assert result_wallet == wallet
 
     db.close_database()
 
 
 def test_update_balance(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet = wallets.create(user.api_key)
+    wallets = WalletsDatabase(db)
+    wallet = wallets.create(user)
 
     wallets.update_balance(wallet.address, 100)
 
-    assert wallets.read(wallet.address, user.api_key).get_balance() == 100
+    assert wallets.read(wallet.address, user).balance == 100
+
+    db.close_database()
+
+
+def test_withdraw_guards_balance_and_owner(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet = wallets.create(user1)
+
+    assert wallets.withdraw(wallet.address, user1, 60_000_000)
+    assert not wallets.withdraw(wallet.address, user1, 60_000_000)
+    assert not wallets.withdraw(wallet.address, user2, 10_000_000)
+    assert not wallets.withdraw(uuid4(), user1, 10_000_000)
+    assert wallets.read(wallet.address, user1).balance == 40_000_000
+
+    db.close_database()
+
+
+def test_deposit_charges_fee_to_other_users_wallet(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    own_wallet = wallets.create(user1)
+    other_wallet = wallets.create(user2)
+
+    assert wallets.deposit(own_wallet.address, user1, 10_000_000, 150_000) == 0
+    assert wallets.deposit(other_wallet.address, user1, 10_000_000, 150_000) == 150_000
+    assert wallets.deposit(uuid4(), user1, 10_000_000, 150_000) is None
+    assert wallets.read(own_wallet.address, user1).balance == 110_000_000
+    assert wallets.read(other_wallet.address, user2).balance == 109_850_000
 
     db.close_database()
 
 
 def test_read_all(db: Database) -> None:
-    users = UsersDatabase(db.get_connection(), db.get_cursor())
+    users = UsersDatabase(db)
     user = users.create("test@gmail.com")
 
-    wallets = WalletsDatabase(db.get_connection(), db.get_cursor(), users)
-    wallet1 = wallets.create(user.api_key)
-    wallet2 = wallets.create(user.api_key)
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
 
     wallets.update_balance(wallet1.address, 100)
     wallets.update_balance(wallet2.address, 200)
 
-    all_wallets = wallets.read_all(user.api_key)
+    all_wallets = wallets.read_all(user)
 
     assert len(all_wallets) == 2
-    assert all_wallets[0].get_balance() == 100
-    assert all_wallets[1].get_balance() == 200
+    assert all_wallets[0].balance == 100
+    assert all_wallets[1].balance == 200
+
+
+def test_read_many_wallets(db: Database) -> None:
+    users = UsersDatabase(db)
+    user1 = users.create("test@gmail.com")
+    user2 = users.create("test1@gmail.com")
+
+    wallets = WalletsDatabase(db)
+    wallet1 = wallets.create(user1)
+    wallet2 = wallets.create(user1)
+    wallet3 = wallets.create(user2)
+
+    assert wallets.read_many(
+        [wallet2.address, wallet1.address, wallet2.address], user1
+    ) == [wallet2, wallet1]
+    with pytest.raises(WalletPermissionError):
+        wallets.read_many([wallet1.address, wallet3.address], user1)
+    with pytest.raises(WalletDoesNotExistError):
+        wallets.read_many([wallet1.address, uuid4()], user1)
+
+    db.close_database()
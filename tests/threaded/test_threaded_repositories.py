@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from core.errors import InvalidApiKeyError, WalletDoesNotExistError
+from core.statistic import Statistic
+from core.transaction import Transaction, Transfer
+from core.user import User
+from core.wallet import Wallet
+from infra.constants import ADMIN_API_KEY
+from infra.in_memory.statistics import StatisticsInMemory
+from infra.in_memory.transactions import TransactionsInMemory
+from infra.in_memory.users import UsersInMemory
+from infra.in_memory.wallets import WalletsInMemory
+from infra.threaded.statistics import ThreadedStatistics
+from infra.threaded.transactions import ThreadedTransactions
+from infra.threaded.users import ThreadedUsers
+from infra.threaded.wallets import ThreadedWallets
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    with ThreadPoolExecutor(2, thread_name_prefix="repository") as executor:
+        yield executor
+
+
+def test_threaded_users(executor: ThreadPoolExecutor) -> None:
+    users = ThreadedUsers(UsersInMemory(), executor)
+
+    async def run() -> User:
+        user = await users.create("test@gmail.com")
+        return await users.try_authorization(user.api_key)
+
+    assert asyncio.run(run()).email == "test@gmail.com"
+    with pytest.raises(InvalidApiKeyError):
+        asyncio.run(users.try_authorization("unknown"))
+
+
+def test_threaded_wallets_run_in_executor(executor: ThreadPoolExecutor) -> None:
+    user = User("test@gmail.com")
+    in_memory = WalletsInMemory()
+    wallets = ThreadedWallets(in_memory, executor)
+    read = in_memory.read
+    threads: list[str] = []
+
+    def record_thread(address: UUID, user: User, check_permission: bool) -> Wallet:
+        threads.append(threading.current_thread().name)
+        return read(address, user, check_permission)
+
+    wallet = asyncio.run(wallets.create(user))
+
+    with patch.object(in_memory, "read", record_thread):
+        assert asyncio.run(wallets.read(wallet.address, user)) == wallet
+    assert asyncio.run(wallets.read_all(user)) == [wallet]
+    assert [name.split("_")[0] for name in threads] == ["repository"]
+    with pytest.raises(WalletDoesNotExistError):
+        asyncio.run(wallets.read(uuid4(), user))
+
+
+def test_threaded_transactions_and_statistics(executor: ThreadPoolExecutor) -> None:
+    user = User("test@gmail.com")
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+    in_memory = TransactionsInMemory(wallets)
+    transactions = ThreadedTransactions(in_memory, executor)
+    statistics = ThreadedStatistics(StatisticsInMemory(in_memory), executor)
+
+    async def run() -> None:
+        transaction = await transactions.make_transaction(
+            user, wallet1.address, wallet2.address, 10_000_000
+        )
+        batch = await transactions.make_transactions(
+            user, [Transfer(wallet2.address, wallet1.address, 10_000_000)]
+        )
+
+        made = [transaction, *batch]
+        assert await transactions.read_all(user) == made
+        assert await transactions.get_wallet_transactions(user, wallet1.address, 1) == [
+            batch[0]
+        ]
+        assert [t async for t in await transactions.iter_all(user)] == made
+        assert [
+            t
+            async for t in await transactions.iter_wallet_transactions(
+                user, wallet2.address
+            )
+        ] == made
+        assert await statistics.get_statistic(ADMIN_API_KEY) == Statistic(2, 0)
+        assert await statistics.recompute_statistic(ADMIN_API_KEY) == Statistic(2, 0)
+
+    asyncio.run(run())
+
+
+def test_threaded_transactions_stream_batches_in_executor(
+    executor: ThreadPoolExecutor,
+) -> None:
+    user = User("test@gmail.com")
+    wallets = WalletsInMemory()
+    wallet1 = wallets.create(user)
+    wallet2 = wallets.create(user)
+    in_memory = TransactionsInMemory(wallets)
+    made = [
+        in_memory.make_transaction(user, wallet1.address, wallet2.address, 1_000)
+        for _ in range(5)
+    ]
+    transactions = ThreadedTransactions(in_memory, executor)
+    iter_all = in_memory.iter_all
+    threads: list[str] = []
+
+    def record_threads(user: User) -> Iterator[Transaction]:
+        for transaction in iter_all(user):
+            threads.append(threading.current_thread().name)
+            yield transaction
+
+    async def run() -> list[Transaction]:
+        return [t async for t in await transactions.iter_all(user)]
+
+    with (
+        patch.object(in_memory, "iter_all", record_threads),
+        patch("infra.threaded.transactions.TRANSACTIONS_STREAM_BATCH_SIZE", 2),
+    ):
+        assert asyncio.run(run()) == made
+    assert {name.split("_")[0] for name in threads} == {"repository"}